@@ -0,0 +1,35 @@
+import hashlib
+import os
+import threading
+
+from research_cache import MemoryBackend
+
+DEFAULT_MAX_ENTRIES = 1000
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def answer_key(provider, model, prompt_text, candidates=1):
+    """Identifies an answer by everything that shapes it: the model, the number
+    of candidates requested and the full prompt, which holds the question,
+    résumé, role, company context and limit."""
+    return hashlib.sha256(
+        f"{provider}\x00{model}\x00{candidates}\x00{prompt_text}".encode()
+    ).hexdigest()
+
+
+def get_answer_cache():
+    """Returns the process-wide cache of generated answers, keyed by answer_key.
+
+    ``HIREHELPER_ANSWER_CACHE_SIZE`` sets how many answers are kept.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MemoryBackend(
+                max_entries=int(
+                    os.getenv("HIREHELPER_ANSWER_CACHE_SIZE", DEFAULT_MAX_ENTRIES)
+                )
+            )
+        return _cache
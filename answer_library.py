@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from config import data_dir
+from research_cache import normalize_company
+from resume_index import terms
+
+# Cosine similarity of question TF-IDF vectors
+DEFAULT_REUSE_THRESHOLD = 0.9
+DEFAULT_ADAPT_THRESHOLD = 0.5
+OUTCOMES = ("reused", "adapted", "missed")
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def _features(text):
+    """Content words (see resume_index.terms) and their bigrams."""
+    words = terms(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def thresholds():
+    """Similarity needed to reuse a saved answer as is, and to adapt one, from
+    ``HIREHELPER_LIBRARY_REUSE`` and ``HIREHELPER_LIBRARY_ADAPT``."""
+    return (
+        float(os.getenv("HIREHELPER_LIBRARY_REUSE", DEFAULT_REUSE_THRESHOLD)),
+        float(os.getenv("HIREHELPER_LIBRARY_ADAPT", DEFAULT_ADAPT_THRESHOLD)),
+    )
+
+
+class AnswerLibrary:
+    """Saved answers in SQLite, searched by TF-IDF similarity of their questions.
+
+    The library is shared by every session in the process, so each answer is
+    stored with the hash of the résumé it was written from and only matched
+    for that résumé; another candidate never gets someone else's answer.
+    The vectors live in one L2-normalised NumPy matrix, rebuilt after answers
+    are added, so a lookup is a single matrix-vector product.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "answer_library.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, saved_at REAL NOT NULL, "
+                "question TEXT NOT NULL, answer TEXT NOT NULL, "
+                "role TEXT NOT NULL, company TEXT NOT NULL, "
+                "resume_hash TEXT NOT NULL DEFAULT '')"
+            )
+            columns = {
+                row[1]
+                for row in self._conn.execute("PRAGMA table_info(answers)").fetchall()
+            }
+            if "resume_hash" not in columns:
+                # Answers saved before scoping belong to no résumé and never match
+                self._conn.execute(
+                    "ALTER TABLE answers "
+                    "ADD COLUMN resume_hash TEXT NOT NULL DEFAULT ''"
+                )
+            lookup_columns = {
+                row[1]
+                for row in self._conn.execute("PRAGMA table_info(lookups)").fetchall()
+            }
+            if lookup_columns and "resume_hash" not in lookup_columns:
+                # Counts from before scoping can't be told apart by résumé
+                self._conn.execute("DROP TABLE lookups")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lookups ("
+                "resume_hash TEXT NOT NULL, outcome TEXT NOT NULL, "
+                "count INTEGER NOT NULL, PRIMARY KEY (resume_hash, outcome))"
+            )
+        self._entries = None
+        self._vocabulary = {}
+        self._idf = None
+        self._matrix = None
+        self._owners = None
+
+    def _build(self):
+        rows = self._conn.execute(
+            "SELECT id, question, answer, role, company, resume_hash FROM answers "
+            "ORDER BY id"
+        ).fetchall()
+        self._entries = [
+            dict(zip(("id", "question", "answer", "role", "company"), row))
+            for row in rows
+        ]
+        self._owners = np.array([row[5] for row in rows], dtype=object)
+        documents = [_features(entry["question"]) for entry in self._entries]
+        self._vocabulary = {}
+        for features in documents:
+            for feature in features:
+                self._vocabulary.setdefault(feature, len(self._vocabulary))
+        counts = np.zeros((len(documents), len(self._vocabulary)), dtype=np.float32)
+        for i, features in enumerate(documents):
+            for feature in features:
+                counts[i, self._vocabulary[feature]] += 1
+        document_frequency = (counts > 0).sum(axis=0)
+        self._idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        self._matrix = self._normalise(counts * self._idf)
+
+    @staticmethod
+    def _normalise(vectors):
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def add(self, question, answer, role, company, resume_hash):
+        """Saves an accepted answer written from the résumé with ``resume_hash``;
+        returns its id."""
+        with self._lock, self._conn:
+            entry_id = self._conn.execute(
+                "INSERT INTO answers "
+                "(saved_at, question, answer, role, company, resume_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    question.strip(),
+                    answer.strip(),
+                    role,
+                    company,
+                    resume_hash,
+                ),
+            ).lastrowid
+            self._entries = None
+        return entry_id
+
+    def search(self, question, resume_hash):
+        """Returns ``(similarity, entry)`` for the closest question saved for this
+        résumé, or None."""
+        with self._lock:
+            if self._entries is None:
+                self._build()
+            owned = self._owners == resume_hash
+            if not resume_hash or not owned.any():
+                return None
+            vector = np.zeros(len(self._vocabulary), dtype=np.float32)
+            unseen = 0
+            for feature in _features(question):
+                index = self._vocabulary.get(feature)
+                if index is not None:
+                    vector[index] += 1
+                else:
+                    unseen += 1
+            if not vector.any():
+                return None
+            # Words no saved question has still count towards the query's length,
+            # with the idf of a term seen in no document
+            vector *= self._idf
+            unseen_weight = np.log(1 + len(self._entries)) + 1
+            norm = np.sqrt(vector @ vector + unseen * unseen_weight**2)
+            scores = np.where(owned, self._matrix @ (vector / norm), -1.0)
+            best = int(scores.argmax())
+            return float(scores[best]), dict(self._entries[best])
+
+    def match(self, question, role, company, resume_hash):
+        """Decides how a question can use the answers saved for this résumé.
+
+        Returns ``("reused", entry)`` for a near-identical question saved for
+        the same role and company, ``("adapted", entry)`` when a similar answer
+        can be adapted, else ``("missed", None)``. Each outcome is counted.
+        """
+        reuse_at, adapt_at = thresholds()
+        found = self.search(question, resume_hash)
+        outcome, entry = "missed", None
+        if found is not None:
+            similarity, entry = found
+            entry["similarity"] = similarity
+            same_target = entry["role"].strip().lower() == role.strip().lower() and (
+                normalize_company(entry["company"]) == normalize_company(company)
+            )
+            if similarity >= reuse_at and same_target:
+                outcome = "reused"
+            elif similarity >= adapt_at:
+                outcome = "adapted"
+            else:
+                entry = None
+        self.record(outcome, resume_hash)
+        return outcome, entry
+
+    def record(self, outcome, resume_hash):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO lookups VALUES (?, ?, 1) "
+                "ON CONFLICT (resume_hash, outcome) DO UPDATE SET count = count + 1",
+                (resume_hash, outcome),
+            )
+
+    def stats(self, resume_hash):
+        """Answers saved for this résumé, its lookups per outcome and their hit
+        rate (reused or adapted)."""
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT outcome, count FROM lookups WHERE resume_hash = ?",
+                    (resume_hash,),
+                ).fetchall()
+            )
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM answers WHERE resume_hash = ?", (resume_hash,)
+            ).fetchone()[0]
+        stats = {outcome: counts.get(outcome, 0) for outcome in OUTCOMES}
+        lookups = sum(stats.values())
+        stats["answers"] = size
+        stats["lookups"] = lookups
+        stats["hit_rate"] = (
+            (stats["reused"] + stats["adapted"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+def get_answer_library():
+    """Returns the process-wide answer library in the data directory."""
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = AnswerLibrary()
+        return _library
@@ -0,0 +1,24 @@
+import os
+
+import streamlit.components.v1 as components
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+ICONS = ("brain", "sparkles", "upload", "check", "copy")
+
+# Served from static/ like any component build; the browser caches the files
+_assets = components.declare_component("hirehelper_assets", path=STATIC_DIR)
+
+# Icons are CSS masks over static/icons/*.svg, so markup only names them
+svg_icons = {
+    name: f'<span class="hh-icon hh-icon-{name}" aria-hidden="true"></span>'
+    for name in ICONS
+}
+
+
+def load_assets():
+    """Adds the app's stylesheet and copy-button script to the page.
+
+    Each rerun sends only a reference to the component; the frame loads
+    static/hirehelper.css and static/hirehelper.js into the page once.
+    """
+    _assets(key="hirehelper_assets", default=None)
@@ -0,0 +1,332 @@
+"""Generates a reproducible synthetic résumé corpus with ground-truth text.
+
+Usage:
+    python benchmarks/corpus.py OUT_DIR [--seed N] [--sizes 1,2,5,10,25,50]
+                                        [--formats txt,md,pdf,docx]
+
+Every size is generated in four layouts (plain, tables, two-column, unicode)
+for every format. Files land in ``OUT_DIR/<format>/`` next to a ``.txt`` with
+the text an ideal extractor should return, and ``OUT_DIR/manifest.json``
+lists them all. PDFs are written without extra dependencies and use the
+standard Helvetica font, so their unicode layout sticks to Latin-1 accents.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import textwrap
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+LAYOUTS = ["plain", "tables", "columns", "unicode"]
+LINES_PER_PAGE = 52
+
+FIRST_NAMES = ["Jane", "Omar", "Priya", "Lucas", "Mei", "Kwame", "Sofia", "Arjun"]
+LAST_NAMES = ["Doe", "Haddad", "Sharma", "Silva", "Chen", "Mensah", "Rossi", "Iyer"]
+UNICODE_NAMES = ["José Müller", "Zoë Ångström", "Łukasz Żółć", "Chloé Dubois"]
+UNICODE_EXTRA = [
+    "東京大学",
+    "Ünïcödé ✓",
+    "naïve café",
+    "Straße",
+    "Ελληνικά",
+    "🚀 launch",
+]
+LATIN1_EXTRA = ["naïve café", "Straße", "Señor Niño", "Crème brûlée", "Øresund"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Labs"]
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "SRE", "Analyst"]
+VERBS = ["Led", "Built", "Designed", "Shipped", "Automated", "Scaled", "Migrated"]
+OBJECTS = [
+    "a payments platform",
+    "the data pipeline",
+    "an onboarding flow",
+    "CI/CD for 40 services",
+    "a recommendation model",
+    "the observability stack",
+]
+OUTCOMES = [
+    "cutting latency by {n}%",
+    "saving ${n}K per year",
+    "growing revenue {n}%",
+    "serving {n}M users",
+    "reducing incidents by {n}%",
+]
+SKILLS = ["Python", "Go", "SQL", "AWS", "Docker", "Kubernetes", "React", "Spark"]
+
+
+def _blocks(rng, layout, pages):
+    """Returns résumé content as ("heading" | "line" | "table", value) blocks."""
+    unicode = layout == "unicode"
+    if unicode:
+        name = rng.choice(UNICODE_NAMES)
+    else:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.split()[0].lower()}@example.com"
+    phone = f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+    blocks = [
+        ("line", name),
+        ("line", f"{email} | {phone}"),
+        ("heading", "Summary"),
+        (
+            "line",
+            f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience.",
+        ),
+        ("heading", "Experience"),
+    ]
+    line_budget = pages * LINES_PER_PAGE - 20
+    year = 2024
+    while line_budget > 0:
+        start = year - rng.randint(1, 3)
+        blocks.append(
+            (
+                "line",
+                f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} | {start} - {year}",
+            )
+        )
+        for _ in range(rng.randint(3, 6)):
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+            bullet = f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, {outcome}."
+            if unicode and rng.random() < 0.3:
+                bullet += f" ({rng.choice(UNICODE_EXTRA)})"
+            blocks.append(("line", bullet))
+            line_budget -= 1
+        line_budget -= 1
+        year = start
+        if layout == "tables" and rng.random() < 0.3:
+            rows = [
+                [rng.choice(SKILLS), f"{rng.randint(1, 10)} yrs", rng.choice(COMPANIES)]
+                for _ in range(3)
+            ]
+            blocks.append(("table", [["Skill", "Experience", "Where"]] + rows))
+            line_budget -= 4
+    blocks.append(("heading", "Skills"))
+    if layout == "tables":
+        blocks.append(("table", [SKILLS[:4], SKILLS[4:]]))
+    else:
+        blocks.append(("line", ", ".join(SKILLS)))
+    blocks.append(("heading", "Education"))
+    blocks.append(("line", f"BSc Computer Science, State University, {year - 4}"))
+    return blocks
+
+
+def _latin1(text):
+    """Swaps characters Helvetica/WinAnsi can't show for ones it can."""
+    for extra in UNICODE_EXTRA:
+        if extra not in LATIN1_EXTRA:
+            text = text.replace(extra, LATIN1_EXTRA[len(extra) % len(LATIN1_EXTRA)])
+    return text.encode("cp1252", "replace").decode("cp1252")
+
+
+def _plain_truth(blocks):
+    lines = []
+    for kind, value in blocks:
+        if kind == "table":
+            lines.extend(" | ".join(row) for row in value)
+        else:
+            lines.append(value)
+    return "\n".join(lines) + "\n"
+
+
+def render_txt(blocks, layout):
+    text = _plain_truth(blocks)
+    return text.encode("utf-8"), text
+
+
+def render_md(blocks, layout):
+    lines = []
+    for kind, value in blocks:
+        if kind == "heading":
+            lines.extend(["", f"## {value}"])
+        elif kind == "table":
+            lines.append("| " + " | ".join(value[0]) + " |")
+            lines.append("|" + "---|" * len(value[0]))
+            lines.extend("| " + " | ".join(row) + " |" for row in value[1:])
+        else:
+            lines.append(value)
+    text = "\n".join(lines) + "\n"
+    return text.encode("utf-8"), text
+
+
+def render_docx(blocks, layout):
+    doc = Document()
+    if layout == "columns":
+        cols = doc.sections[0]._sectPr.find(qn("w:cols"))
+        if cols is None:
+            cols = OxmlElement("w:cols")
+            doc.sections[0]._sectPr.append(cols)
+        cols.set(qn("w:num"), "2")
+    for kind, value in blocks:
+        if kind == "heading":
+            doc.add_heading(value, level=2)
+        elif kind == "table":
+            table = doc.add_table(rows=len(value), cols=len(value[0]))
+            for row, cells in zip(table.rows, value):
+                for cell, text in zip(row.cells, cells):
+                    cell.text = text
+        else:
+            doc.add_paragraph(value)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue(), _plain_truth(blocks)
+
+
+def _pdf_escape(text):
+    raw = text.encode("cp1252", "replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def render_pdf(blocks, layout):
+    """Lays blocks out on Letter pages; two-column layouts fill left then right."""
+    blocks = [
+        (
+            (kind, [[_latin1(c) for c in row] for row in value])
+            if kind == "table"
+            else (kind, _latin1(value))
+        )
+        for kind, value in blocks
+    ]
+    columns = 2 if layout == "columns" else 1
+    width = 95 if columns == 1 else 45
+    column_x = [54] if columns == 1 else [54, 318]
+    lines = []  # (text, is_heading, table_cells)
+    truth = []
+    for kind, value in blocks:
+        if kind == "table":
+            for row in value:
+                lines.append(("", False, row))
+                truth.append(" ".join(row))
+        else:
+            wrapped = textwrap.wrap(value, width) or [""]
+            lines.extend((part, kind == "heading", None) for part in wrapped)
+            truth.append(" ".join(wrapped))
+
+    pages = []
+    per_column = LINES_PER_PAGE
+    step = per_column * columns
+    for offset in range(0, len(lines), step):
+        ops = [b"BT"]
+        for i, (text, heading, cells) in enumerate(lines[offset : offset + step]):
+            column, row = divmod(i, per_column)
+            x, y = column_x[column], 750 - row * 13
+            font = b"/F2 11 Tf" if heading else b"/F1 9 Tf"
+            if cells:
+                cell_width = (540 if columns == 1 else 250) // len(cells)
+                for c, cell in enumerate(cells):
+                    ops.append(
+                        font
+                        + b" 1 0 0 1 %d %d Tm (" % (x + c * cell_width, y)
+                        + _pdf_escape(cell)
+                        + b") Tj"
+                    )
+            else:
+                ops.append(
+                    font + b" 1 0 0 1 %d %d Tm (" % (x, y) + _pdf_escape(text) + b") Tj"
+                )
+        ops.append(b"ET")
+        pages.append(b"\n".join(ops))
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for content in pages:
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        len(kids),
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return out.getvalue(), "\n".join(truth) + "\n"
+
+
+RENDERERS = {"txt": render_txt, "md": render_md, "pdf": render_pdf, "docx": render_docx}
+
+
+def generate_corpus(out_dir, seed=0, sizes=(1, 2, 5, 10, 25, 50), formats=None):
+    """Writes the corpus and returns its manifest entries."""
+    formats = formats or list(RENDERERS)
+    entries = []
+    for pages in sizes:
+        for layout in LAYOUTS:
+            for file_format in formats:
+                # Seeded per document so subsets reproduce the same files
+                rng = random.Random(f"{seed}-{pages}-{layout}")
+                blocks = _blocks(rng, layout, pages)
+                data, truth = RENDERERS[file_format](blocks, layout)
+                stem = f"resume-{pages:02d}p-{layout}"
+                folder = os.path.join(out_dir, file_format)
+                os.makedirs(folder, exist_ok=True)
+                path = os.path.join(folder, f"{stem}.{file_format}")
+                with open(path, "wb") as f:
+                    f.write(data)
+                truth_path = os.path.join(folder, f"{stem}.txt")
+                if file_format != "txt":
+                    with open(truth_path, "w", encoding="utf-8") as f:
+                        f.write(truth)
+                entries.append(
+                    {
+                        "path": os.path.relpath(path, out_dir),
+                        "truth": os.path.relpath(truth_path, out_dir),
+                        "format": file_format,
+                        "layout": layout,
+                        "pages": (
+                            data.count(b"/Type /Page ")
+                            if file_format == "pdf"
+                            else pages
+                        ),
+                        "bytes": len(data),
+                    }
+                )
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump({"seed": seed, "files": entries}, f, indent=2)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sizes", default="1,2,5,10,25,50")
+    parser.add_argument("--formats", default=",".join(RENDERERS))
+    args = parser.parse_args()
+
+    entries = generate_corpus(
+        args.out_dir,
+        seed=args.seed,
+        sizes=[int(size) for size in args.sizes.split(",")],
+        formats=args.formats.split(","),
+    )
+    print(f"Wrote {len(entries)} files to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Measures extraction throughput and fidelity on a generated résumé corpus.
+
+Usage:
+    python benchmarks/corpus.py /tmp/corpus
+    python benchmarks/extraction_throughput.py /tmp/corpus [--repeat N]
+                                              [--backend NAME ...] [--json OUT]
+
+Reports files/sec, pages/sec, peak memory and character-level fidelity against
+the ground truth, per file type and backend. Each (type, backend) pair runs in
+a fresh process so peak RSS covers native libraries as well.
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import (  # noqa: E402
+    PDF_BACKENDS,
+    available_pdf_backends,
+    extract_docx_text,
+    extract_pdf_text,
+)
+from pdf_backends import text_fidelity  # noqa: E402
+
+
+def _decode(file_bytes):
+    return file_bytes.decode()
+
+
+def _python_docx(file_bytes):
+    from docx_extraction import python_docx_text
+
+    return python_docx_text(file_bytes)
+
+
+def extractors_for(file_format):
+    """Returns {backend: extract function} for one file type."""
+    if file_format in ("txt", "md"):
+        return {"decode": _decode}
+    if file_format == "docx":
+        return {"streaming": extract_docx_text, "python-docx": _python_docx}
+    if file_format == "pdf":
+        return {
+            name: (lambda b, name=name: extract_pdf_text(b, name))
+            for name in available_pdf_backends()
+        }
+    return {}
+
+
+def _run(file_format, backend, paths, repeat):
+    """Child process: extracts every file ``repeat`` times with one backend."""
+    extract = extractors_for(file_format)[backend]
+    blobs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+    # Warm up once so one-time library initialisation isn't timed
+    try:
+        extract(blobs[0])
+    except Exception:
+        pass
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    texts = [""] * len(blobs)
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i, blob in enumerate(blobs):
+            try:
+                texts[i] = extract(blob)
+            except Exception:
+                errors += 1
+    elapsed = (time.perf_counter() - start) / repeat
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    peak_mib = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return elapsed, peak_mib, texts, errors // repeat
+
+
+def benchmark(corpus_dir, repeat=1, backends=None):
+    with open(os.path.join(corpus_dir, "manifest.json")) as f:
+        entries = json.load(f)["files"]
+
+    by_format = {}
+    for entry in entries:
+        by_format.setdefault(entry["format"], []).append(entry)
+
+    rows = []
+    for file_format, group in sorted(by_format.items()):
+        paths = [os.path.join(corpus_dir, e["path"]) for e in group]
+        truths = []
+        for entry in group:
+            with open(os.path.join(corpus_dir, entry["truth"]), encoding="utf-8") as f:
+                truths.append(f.read())
+        pages = sum(e["pages"] for e in group)
+
+        for backend in extractors_for(file_format):
+            if backends and backend not in backends:
+                continue
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                elapsed, peak_mib, texts, errors = pool.submit(
+                    _run, file_format, backend, paths, repeat
+                ).result()
+            scores = [text_fidelity(t, x) for t, x in zip(truths, texts)]
+            by_layout = {}
+            for entry, score in zip(group, scores):
+                by_layout.setdefault(entry["layout"], []).append(score)
+            rows.append(
+                {
+                    "format": file_format,
+                    "backend": backend,
+                    "files": len(paths),
+                    "pages": pages,
+                    "files_per_sec": len(paths) / elapsed if elapsed else 0.0,
+                    "pages_per_sec": pages / elapsed if elapsed else 0.0,
+                    "peak_mib": peak_mib,
+                    "fidelity": sum(scores) / len(scores),
+                    "fidelity_min": min(scores),
+                    "fidelity_by_layout": {
+                        layout: sum(s) / len(s) for layout, s in by_layout.items()
+                    },
+                    "errors": errors,
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus_dir")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--backend",
+        action="append",
+        dest="backends",
+        help=f"limit to these backends (decode, streaming, python-docx, {', '.join(PDF_BACKENDS)})",
+    )
+    parser.add_argument("--json", help="also write the raw results here")
+    args = parser.parse_args()
+
+    rows = benchmark(args.corpus_dir, args.repeat, args.backends)
+    print(
+        f"{'type':<5} {'backend':<12} {'files/s':>9} {'pages/s':>9} "
+        f"{'peak MiB':>9} {'fidelity':>9} {'min':>6}  by layout"
+    )
+    for row in rows:
+        layouts = " ".join(
+            f"{layout}={score:.2f}"
+            for layout, score in sorted(row["fidelity_by_layout"].items())
+        )
+        print(
+            f"{row['format']:<5} {row['backend']:<12} {row['files_per_sec']:>9.1f} "
+            f"{row['pages_per_sec']:>9.1f} {row['peak_mib']:>9.1f} "
+            f"{row['fidelity']:>9.3f} {row['fidelity_min']:>6.2f}  {layouts}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
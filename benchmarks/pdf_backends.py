@@ -0,0 +1,214 @@
+"""Ranks the installed PDF extraction backends on a local corpus.
+
+Usage:
+    python benchmarks/pdf_backends.py CORPUS_DIR_OR_FILES... [--repeat N] [--save]
+
+A ``<name>.txt`` next to a PDF is used as its ground truth. ``--save`` stores
+the ranking so ``HIREHELPER_PDF_BACKEND=auto`` picks the winner.
+"""
+
+import argparse
+import difflib
+import glob
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import data_dir  # noqa: E402
+from extraction import (  # noqa: E402
+    PDF_BACKENDS,
+    PDF_RANKING_FILE,
+    available_pdf_backends,
+)
+
+
+def _matched_chars(expected_words, actual_words):
+    matcher = difflib.SequenceMatcher(None, expected_words, actual_words, False)
+    return sum(
+        len(word)
+        for block in matcher.get_matching_blocks()
+        for word in expected_words[block.a : block.a + block.size]
+    )
+
+
+def text_fidelity(expected, actual):
+    """Scores extracted text against ground truth from 0 to 1.
+
+    Texts are aligned word by word (whitespace and layout differences are
+    ignored) and matches are weighted by word length, so the score is the share
+    of ground-truth characters recovered in order. Lines are aligned first and
+    only the regions between matching lines are compared word by word, which
+    keeps long documents fast.
+    """
+    expected_lines = [tuple(line.split()) for line in expected.splitlines()]
+    actual_lines = [tuple(line.split()) for line in actual.splitlines()]
+    expected_lines = [line for line in expected_lines if line]
+    actual_lines = [line for line in actual_lines if line]
+    total = sum(len(word) for line in expected_lines for word in line)
+    actual_total = sum(len(word) for line in actual_lines for word in line)
+    if not total:
+        return 1.0 if not actual_total else 0.0
+
+    matched = 0
+    matcher = difflib.SequenceMatcher(None, expected_lines, actual_lines, False)
+    for tag, a1, a2, b1, b2 in matcher.get_opcodes():
+        if tag == "equal":
+            matched += sum(len(w) for line in expected_lines[a1:a2] for w in line)
+        elif tag == "replace":
+            matched += _matched_chars(
+                [w for line in expected_lines[a1:a2] for w in line],
+                [w for line in actual_lines[b1:b2] for w in line],
+            )
+    return matched / (total + max(actual_total - matched, 0))
+
+
+def text_quality(text):
+    """Heuristic quality score when no ground truth exists: the share of
+    characters that belong to plausible words rather than glued or broken runs."""
+    words = text.split()
+    if not words:
+        return 0.0
+    plausible = sum(
+        len(word)
+        for word in words
+        if len(word) <= 25 and re.fullmatch(r"[\W\d]*[^\W\d_]+[\W\d]*", word)
+    )
+    return plausible / sum(len(word) for word in words)
+
+
+def _benchmark_backend(name, paths, repeat):
+    """Runs in a fresh process so peak RSS reflects only this backend."""
+    import resource
+
+    _, extract = PDF_BACKENDS[name]
+    importlib.import_module(PDF_BACKENDS[name][0])
+    # Warm up once so one-time library initialisation isn't timed
+    if paths:
+        with open(paths[0], "rb") as f:
+            try:
+                extract(f.read())
+            except Exception:
+                pass
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    texts = {}
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            with open(path, "rb") as f:
+                file_bytes = f.read()
+            try:
+                texts[path] = extract(file_bytes)
+            except Exception:
+                texts[path] = ""
+                errors += 1
+    elapsed = (time.perf_counter() - start) / repeat
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak_mib = peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+    return elapsed, peak_mib, texts, errors // repeat
+
+
+def _pdf_page_count(path):
+    from PyPDF2 import PdfReader
+
+    try:
+        return len(PdfReader(path).pages)
+    except Exception:
+        return 0
+
+
+def benchmark_pdf_backends(paths, backends=None, repeat=1, save=False):
+    """Ranks PDF backends on local files by quality, then pages/sec and memory.
+
+    Quality is ``text_fidelity`` against a ``<name>.txt`` ground-truth file next
+    to each PDF when present, otherwise the ``text_quality`` heuristic. With
+    ``save=True`` the ranking is written to the data directory for "auto".
+    """
+    paths = list(paths)
+    backends = backends or available_pdf_backends()
+    pages = sum(_pdf_page_count(path) for path in paths)
+    truths = {}
+    for path in paths:
+        truth_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(truth_path):
+            with open(truth_path, encoding="utf-8") as f:
+                truths[path] = f.read()
+
+    rows = []
+    for name in backends:
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+            elapsed, peak_mib, texts, errors = pool.submit(
+                _benchmark_backend, name, paths, repeat
+            ).result()
+        scores = [
+            (
+                text_fidelity(truths[path], texts[path])
+                if path in truths
+                else text_quality(texts[path])
+            )
+            for path in paths
+        ]
+        rows.append(
+            {
+                "backend": name,
+                "files": len(paths),
+                "pages": pages,
+                "seconds": elapsed,
+                "pages_per_sec": pages / elapsed if elapsed else 0.0,
+                "peak_mib": peak_mib,
+                "quality": sum(scores) / len(scores) if scores else 0.0,
+                "errors": errors,
+            }
+        )
+
+    # Quality is compared in 0.05 steps so near-ties are decided by speed
+    rows.sort(
+        key=lambda r: (-round(r["quality"] * 20), -r["pages_per_sec"], r["peak_mib"])
+    )
+    if save:
+        with open(os.path.join(data_dir(), PDF_RANKING_FILE), "w") as f:
+            json.dump({"ranking": rows}, f, indent=2)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+")
+    parser.add_argument("--backend", action="append", dest="backends")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--save", action="store_true")
+    args = parser.parse_args()
+
+    paths = []
+    for item in args.inputs:
+        if os.path.isdir(item):
+            paths.extend(
+                sorted(glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True))
+            )
+        else:
+            paths.append(item)
+    if not paths:
+        parser.error("no PDF files found")
+
+    print(f"Installed backends: {', '.join(available_pdf_backends())}")
+    rows = benchmark_pdf_backends(paths, args.backends, args.repeat, args.save)
+    print(
+        f"{'rank':<5} {'backend':<10} {'pages/s':>9} {'peak MiB':>9} {'quality':>8} {'errors':>7}"
+    )
+    for rank, row in enumerate(rows, start=1):
+        print(
+            f"{rank:<5} {row['backend']:<10} {row['pages_per_sec']:>9.1f} "
+            f"{row['peak_mib']:>9.1f} {row['quality']:>8.3f} {row['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
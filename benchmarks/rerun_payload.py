@@ -0,0 +1,160 @@
+"""Measures the bytes sent to the browser and the time spent per rerun.
+
+Usage:
+    python benchmarks/rerun_payload.py [SCRIPT] [--runs N]
+
+Runs the Streamlit script headlessly (AppTest) with a placeholder API key and,
+for each interaction, sums the serialized size of every ForwardMsg it enqueues
+and times the rerun. Each session starts with two questions filled in. Widgets
+inside an ``st.fragment`` rerun only their fragment, as they do in the browser;
+everything else reruns the whole script.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit.runtime.fragment import MemoryFragmentStorage  # noqa: E402
+from streamlit.runtime.scriptrunner import RerunData  # noqa: E402
+from streamlit.runtime.scriptrunner_utils.script_run_context import (  # noqa: E402
+    ScriptRunContext,
+)
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+
+_messages = []
+_state = {"storage": None, "fragment_id": None}
+_enqueue = ScriptRunContext.enqueue
+_runner_init = local_script_runner.LocalScriptRunner.__init__
+_request_rerun = local_script_runner.LocalScriptRunner.request_rerun
+
+
+def _counting_enqueue(self, msg):
+    _messages.append(msg)
+    return _enqueue(self, msg)
+
+
+def _shared_storage_init(self, *args, **kwargs):
+    # AppTest makes a runner per run; share fragments between them like a session
+    _runner_init(self, *args, **kwargs)
+    self._fragment_storage = _state["storage"]
+
+
+def _fragment_rerun(self, rerun_data):
+    if _state["fragment_id"]:
+        rerun_data = RerunData(
+            widget_states=rerun_data.widget_states,
+            query_string=rerun_data.query_string,
+            page_script_hash=rerun_data.page_script_hash,
+            fragment_id_queue=[_state["fragment_id"]],
+            is_fragment_scoped_rerun=True,
+        )
+    return _request_rerun(self, rerun_data)
+
+
+ScriptRunContext.enqueue = _counting_enqueue
+local_script_runner.LocalScriptRunner.__init__ = _shared_storage_init
+local_script_runner.LocalScriptRunner.request_rerun = _fragment_rerun
+
+
+def _widget_fragments():
+    """Maps widget ids to the fragment that rendered them, from the last run."""
+    fragments = {}
+    for msg in _messages:
+        if msg.WhichOneof("type") != "delta":
+            continue
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        widget = getattr(element, kind) if kind else None
+        if widget is not None and getattr(widget, "id", ""):
+            fragments[widget.id] = msg.delta.fragment_id
+    return fragments
+
+
+QUESTIONS = ("Why do you want to work here?", "Tell me about a hard bug you fixed.")
+
+INTERACTIONS = {
+    "idle rerun": (None, lambda at, i: at.run()),
+    "edit question": (
+        lambda at: at.text_area(key="question_0"),
+        lambda at, i: at.text_area(key="question_0").input(f"Why us? {i}").run(),
+    ),
+    "add question": (
+        lambda at: next(b for b in at.button if b.label == "Add Question"),
+        lambda at, i: next(b for b in at.button if b.label == "Add Question")
+        .click()
+        .run(),
+    ),
+    "show estimate": (
+        lambda at: next(c for c in at.checkbox if c.label == "Show Cost Estimates"),
+        lambda at, i: next(c for c in at.checkbox if c.label == "Show Cost Estimates")
+        .check()
+        .run(),
+    ),
+    "enter API key": (
+        lambda at: at.text_input(key="override_openai"),
+        lambda at, i: at.text_input(key="override_openai").input(f"sk-test{i}").run(),
+    ),
+}
+
+
+def measure(script, runs=3):
+    """Returns ``{interaction: {"bytes", "messages", "seconds", "scope"}}``,
+    each the median over ``runs`` fresh sessions."""
+    os.environ.setdefault("GOOGLE_API_KEY", "AIza-placeholder")
+    os.environ.setdefault("HIREHELPER_DATA_DIR", tempfile.mkdtemp())
+    samples = {}
+    for name, (locate, act) in INTERACTIONS.items():
+        for i in range(runs):
+            _state["storage"] = MemoryFragmentStorage()
+            _state["fragment_id"] = None
+            _messages.clear()
+            at = AppTest.from_file(script, default_timeout=60)
+            at.session_state["questions"] = list(QUESTIONS)
+            at.run()
+            if locate is not None:
+                _state["fragment_id"] = _widget_fragments().get(locate(at).id) or None
+            _messages.clear()
+            start = time.perf_counter()
+            act(at, i)
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"{name}: {at.exception[0].message}")
+            samples.setdefault(name, []).append(
+                {
+                    "bytes": sum(msg.ByteSize() for msg in _messages),
+                    "messages": len(_messages),
+                    "seconds": elapsed,
+                    "scope": "fragment" if _state["fragment_id"] else "app",
+                }
+            )
+    return {
+        name: {
+            key: sorted(s[key] for s in rows)[len(rows) // 2]
+            for key in ("bytes", "messages", "seconds", "scope")
+        }
+        for name, rows in samples.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("script", nargs="?", default=os.path.join(ROOT, "main.py"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    print(f"{'interaction':<15} {'rerun':<9} {'bytes':>9} {'messages':>9} {'ms':>8}")
+    for name, row in measure(args.script, args.runs).items():
+        print(
+            f"{name:<15} {row['scope']:<9} {row['bytes']:>9,} {row['messages']:>9} "
+            f"{row['seconds'] * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
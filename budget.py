@@ -0,0 +1,145 @@
+import datetime
+import os
+import threading
+
+from estimator import OUTPUT_TOKENS_PER_WORD, token_cost
+import telemetry
+
+SCOPES = ("run", "session", "day")
+SCOPE_LABELS = {"run": "per-run", "session": "per-session", "day": "daily"}
+CAP_ENV = {
+    ("run", "cost"): "HIREHELPER_MAX_RUN_COST",
+    ("run", "tokens"): "HIREHELPER_MAX_RUN_TOKENS",
+    ("session", "cost"): "HIREHELPER_MAX_SESSION_COST",
+    ("session", "tokens"): "HIREHELPER_MAX_SESSION_TOKENS",
+    ("day", "cost"): "HIREHELPER_MAX_DAILY_COST",
+    ("day", "tokens"): "HIREHELPER_MAX_DAILY_TOKENS",
+}
+
+
+class BudgetExceeded(Exception):
+    """Raised instead of dispatching a call that would break a spend cap."""
+
+
+def caps_from_env():
+    """Reads the spend (USD) and token caps; unset or empty means no cap."""
+    caps = {scope: {"cost": None, "tokens": None} for scope in SCOPES}
+    for (scope, kind), name in CAP_ENV.items():
+        value = os.getenv(name, "").strip()
+        if value:
+            caps[scope][kind] = float(value) if kind == "cost" else int(value)
+    return caps
+
+
+def new_spend():
+    return {"cost": 0.0, "tokens": 0}
+
+
+def spent_today():
+    """Spend recorded in telemetry since local midnight, across all sessions."""
+    midnight = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    spend = new_spend()
+    if not telemetry.enabled():
+        return spend
+    for call in telemetry.usage_since(midnight.timestamp()):
+        input_tokens = call["input_tokens"] or call["estimated_input_tokens"]
+        output_tokens = call["output_tokens"]
+        if output_tokens is None:
+            output_tokens = int((call["word_limit"] or 0) * OUTPUT_TOKENS_PER_WORD)
+        spend["tokens"] += input_tokens + output_tokens
+        spend["cost"] += (
+            token_cost(call["provider"], call["model"], input_tokens, output_tokens)
+            or 0.0
+        )
+    return spend
+
+
+class Budget:
+    """Tracks spend against per-run, per-session and daily caps.
+
+    Each call reserves its estimated cost before it is dispatched and settles
+    with the reported usage afterwards, so concurrent calls can't overshoot a
+    cap together. ``session`` is a spend dict kept across runs by the caller
+    (e.g. in ``st.session_state``); daily spend comes from telemetry.
+    """
+
+    def __init__(self, provider, model, caps=None, session=None):
+        self.provider = provider
+        self.model = model
+        self.caps = caps_from_env() if caps is None else caps
+        self.spent = {
+            "run": new_spend(),
+            "session": session if session is not None else new_spend(),
+            "day": (
+                spent_today()
+                if any(v is not None for v in self.caps["day"].values())
+                else new_spend()
+            ),
+        }
+        self._reserved = new_spend()
+        self._lock = threading.Lock()
+
+    def cost(self, input_tokens, output_tokens, model=None):
+        # Unpriced models only count against the token caps
+        return (
+            token_cost(self.provider, model or self.model, input_tokens, output_tokens)
+            or 0.0
+        )
+
+    def check(self, cost, tokens):
+        """Returns why spending ``cost``/``tokens`` more would break a cap, or None."""
+        for scope in SCOPES:
+            for kind, amount in (("cost", cost), ("tokens", tokens)):
+                cap = self.caps[scope][kind]
+                if cap is None:
+                    continue
+                used = self.spent[scope][kind] + self._reserved[kind]
+                if used + amount > cap:
+                    if kind == "cost":
+                        return (
+                            f"the {SCOPE_LABELS[scope]} spend cap of ${cap:.2f} "
+                            f"(${used:.3f} used, ~${amount:.3f} more needed)"
+                        )
+                    return (
+                        f"the {SCOPE_LABELS[scope]} token cap of {cap:,} "
+                        f"({used:,.0f} used, ~{amount:,.0f} more needed)"
+                    )
+        return None
+
+    def preflight(self, estimates):
+        """How many of the estimated ``(input_tokens, output_tokens)`` calls fit,
+        in order, and the cap that stops the rest (None if all fit)."""
+        cost = tokens = 0
+        for i, (input_tokens, output_tokens) in enumerate(estimates):
+            cost += self.cost(input_tokens, output_tokens)
+            tokens += input_tokens + output_tokens
+            with self._lock:
+                reason = self.check(cost, tokens)
+            if reason:
+                return i, reason
+        return len(estimates), None
+
+    def reserve(self, input_tokens, output_tokens, model=None):
+        """Reserves a call's estimated spend or raises BudgetExceeded. ``model``
+        prices calls to another model of the same provider."""
+        reservation = {
+            "cost": self.cost(input_tokens, output_tokens, model),
+            "tokens": input_tokens + output_tokens,
+        }
+        with self._lock:
+            reason = self.check(reservation["cost"], reservation["tokens"])
+            if reason:
+                raise BudgetExceeded(reason)
+            for kind in reservation:
+                self._reserved[kind] += reservation[kind]
+        return reservation
+
+    def settle(self, reservation, input_tokens, output_tokens, model=None):
+        """Releases a reservation and books what the call actually used."""
+        cost = self.cost(input_tokens, output_tokens, model)
+        with self._lock:
+            for kind in reservation:
+                self._reserved[kind] -= reservation[kind]
+            for spend in self.spent.values():
+                spend["cost"] += cost
+                spend["tokens"] += input_tokens + output_tokens
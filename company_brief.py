@@ -0,0 +1,223 @@
+import functools
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from resume_index import count_tokens
+
+DEFAULT_TOKEN_BUDGET = 400
+MAX_CACHED_BRIEFS = 128
+MAX_CACHED_DOCUMENTS = 512
+# Share of the budget the user's own notes may take before being trimmed
+NOTES_SHARE = 0.5
+
+SECTION_KEYWORDS = {
+    "Products & services": {
+        "product",
+        "products",
+        "platform",
+        "service",
+        "services",
+        "solution",
+        "solutions",
+        "customers",
+        "api",
+        "software",
+        "tools",
+        "offers",
+        "build",
+        "builds",
+    },
+    "Mission, values & culture": {
+        "mission",
+        "values",
+        "culture",
+        "believe",
+        "vision",
+        "team",
+        "people",
+        "employees",
+        "diversity",
+        "inclusion",
+        "remote",
+        "principles",
+        "purpose",
+    },
+}
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"“])")
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def token_budget():
+    """Research token budget per prompt, from ``HIREHELPER_RESEARCH_TOKEN_BUDGET``."""
+    return int(os.getenv("HIREHELPER_RESEARCH_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+
+def _sentences(text):
+    for line in text.splitlines():
+        for sentence in SENTENCE_RE.split(line.strip()):
+            sentence = sentence.strip(" -•*")
+            if len(sentence.split()) >= 3:
+                yield sentence
+
+
+def _fit(sentences, budget):
+    """Takes sentences in order while they fit in ``budget`` tokens."""
+    kept = []
+    used = 0
+    for sentence in sentences:
+        tokens = count_tokens(sentence)
+        if used + tokens > budget:
+            break
+        kept.append(sentence)
+        used += tokens
+    return kept, used
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_DOCUMENTS)
+def _document_candidates(company, kind, text):
+    """Sorts one document's sentences into brief sections.
+
+    Returns ``(section, score, key, sentence)`` tuples. Cached on the document
+    text, so a refresh only re-summarises sources whose content changed.
+    """
+    if kind in ("news", "feed"):
+        # Feed items are one per line, newest first
+        return tuple(
+            (
+                "Recent news",
+                position,
+                re.sub(r"\W+", " ", line.lower()).strip(),
+                line.strip(),
+            )
+            for position, line in enumerate(text.splitlines())
+        )
+    company_words = set(company.lower().split())
+    candidates = []
+    for position, sentence in enumerate(_sentences(text)):
+        key = re.sub(r"\W+", " ", sentence.lower()).strip()
+        words = set(key.split())
+        best, hits = "Overview", 0
+        for name, keywords in SECTION_KEYWORDS.items():
+            if len(words & keywords) > hits:
+                best, hits = name, len(words & keywords)
+        # Earlier sentences, keyword hits and mentions of the company rank higher
+        score = position - 5 * hits - 3 * bool(words & company_words)
+        candidates.append((best, score, key, sentence))
+    return tuple(candidates)
+
+
+def _candidates(company, documents):
+    """Groups research sentences by brief section, best first and de-duplicated."""
+    sections = {"Overview": [], "Recent news": []}
+    sections.update({name: [] for name in SECTION_KEYWORDS})
+    seen = set()
+    for doc_rank, doc in enumerate(documents):
+        is_feed = doc["kind"] in ("news", "feed")
+        for section, score, key, sentence in _document_candidates(
+            company.lower(), doc["kind"], doc["text"]
+        ):
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            # Earlier documents rank higher; feed items keep their own order
+            sections[section].append(
+                (score if is_feed else doc_rank * 10 + score, sentence)
+            )
+    return {name: [s for _, s in sorted(items)] for name, items in sections.items()}
+
+
+def build_company_brief(company, documents, user_notes="", budget=None):
+    """Compacts research documents plus the user's notes into a sectioned brief.
+
+    ``documents`` are the full research documents (``kind`` and ``text``).
+    The result stays within ``budget`` tokens (``token_budget()`` by default).
+    The user's notes come first and may use up to half of it; research sections
+    then take one sentence each in turn until the budget is spent.
+    """
+    budget = token_budget() if budget is None else budget
+    lines = []
+    used = 0
+
+    notes = (user_notes or "").strip()
+    if notes:
+        if count_tokens(notes) <= budget * NOTES_SHARE:
+            kept = [notes]
+            used = count_tokens(notes)
+        else:
+            kept, used = _fit(_sentences(notes), int(budget * NOTES_SHARE))
+        if kept:
+            lines.append("Candidate's notes: " + " ".join(kept))
+
+    sections = _candidates(company, documents or ())
+    chosen = {name: [] for name in sections}
+    progress = True
+    while progress:
+        progress = False
+        for name, queue in sections.items():
+            while queue:
+                sentence = queue.pop(0)
+                tokens = count_tokens(sentence) + 1
+                if used + tokens <= budget:
+                    chosen[name].append(sentence)
+                    used += tokens
+                    progress = True
+                    break
+
+    brief = _render(lines, chosen)
+    # Section labels aren't counted above; trim until the whole brief fits
+    while count_tokens(brief) > budget and any(chosen.values()):
+        longest = max(chosen, key=lambda name: len(chosen[name]))
+        chosen[longest].pop()
+        brief = _render(lines, chosen)
+    return brief
+
+
+def _render(lines, chosen):
+    lines = list(lines)
+    for name, sentences in chosen.items():
+        if not sentences:
+            continue
+        if name == "Recent news":
+            lines.append(f"{name}:\n" + "\n".join(f"- {s}" for s in sentences))
+        else:
+            lines.append(f"{name}: " + " ".join(sentences))
+    return "\n".join(lines)
+
+
+def documents_hash(documents):
+    """Identifies a version of the research by its documents' kinds, URLs and text."""
+    digest = hashlib.sha256()
+    for doc in documents or ():
+        digest.update(f"{doc['kind']}\x00{doc['url']}\x00{doc['text']}\x00".encode())
+    return digest.hexdigest()
+
+
+def get_company_brief(company, documents, user_notes="", budget=None):
+    """Returns the cached brief for this company, research version and notes."""
+    budget = token_budget() if budget is None else budget
+    key = hashlib.sha256(
+        "\x00".join(
+            [
+                company.lower().strip(),
+                documents_hash(documents),
+                user_notes or "",
+                str(budget),
+            ]
+        ).encode()
+    ).hexdigest()
+    with _lock:
+        brief = _cache.get(key)
+        if brief is not None:
+            _cache.move_to_end(key)
+            return brief
+    brief = build_company_brief(company, documents, user_notes, budget)
+    with _lock:
+        _cache[key] = brief
+        while len(_cache) > MAX_CACHED_BRIEFS:
+            _cache.popitem(last=False)
+    return brief
@@ -0,0 +1,12 @@
+import os
+
+
+def data_dir():
+    """Returns the directory for local stores, creating it on first use.
+
+    Set ``HIREHELPER_DATA_DIR`` to move it; defaults to ``.hirehelper`` in the
+    working directory.
+    """
+    path = os.getenv("HIREHELPER_DATA_DIR", ".hirehelper")
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,173 @@
+import random
+import statistics
+
+from company_brief import token_budget
+from resume_index import count_tokens
+import telemetry
+
+# Pricing per 1M tokens (approximate, as of 2025)
+PRICING = {
+    "Google": {
+        "gemini-2.0-flash-exp": {"input": 0.075, "output": 0.30},
+        "gemini-1.5-pro-latest": {"input": 3.50, "output": 10.50},
+        "gemini-1.5-pro": {"input": 3.50, "output": 10.50},
+        "gemini-1.5-flash": {"input": 0.075, "output": 0.30},
+        "gemini-1.5-flash-8b": {"input": 0.0375, "output": 0.15},
+    },
+    "OpenAI": {
+        "gpt-4o": {"input": 2.50, "output": 10.00},
+        "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+        "gpt-4-turbo": {"input": 10.00, "output": 30.00},
+        "gpt-4": {"input": 30.00, "output": 60.00},
+        "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
+    },
+    "Claude": {
+        "claude-3-5-sonnet-20241022": {"input": 3.00, "output": 15.00},
+        "claude-3-5-haiku-20241022": {"input": 0.25, "output": 1.25},
+        "claude-3-opus-20240229": {"input": 15.00, "output": 75.00},
+        "claude-3-sonnet-20240229": {"input": 3.00, "output": 15.00},
+        "claude-3-haiku-20240307": {"input": 0.25, "output": 1.25},
+    },
+}
+
+# Priors used until a model has enough recorded calls
+PROMPT_OVERHEAD_TOKENS = 250  # instructions around the résumé and question
+OUTPUT_TOKENS_PER_WORD = 1.3  # 1 token ≈ 0.75 words
+DEFAULT_OVERHEAD_SECONDS = 1.0
+DEFAULT_OUTPUT_TOKENS_PER_SECOND = 50.0
+# Relative spread of call latency around the prior, for the p95 before any data
+PRIOR_SPREAD = (-0.2, -0.1, 0.0, 0.1, 0.3, 0.8)
+MIN_CALLS = 5
+SIMULATIONS = 400
+DEFAULT_CONCURRENCY = 4
+
+
+def _median_ratio(pairs, default):
+    ratios = [actual / estimated for estimated, actual in pairs if estimated and actual]
+    return statistics.median(ratios) if len(ratios) >= MIN_CALLS else default
+
+
+def _fit_latency(calls):
+    """Least-squares fit of ``latency = overhead + output_tokens / speed``.
+
+    Returns ``(overhead, seconds_per_token, residuals)``; residuals are resampled
+    to turn the fit into a latency distribution, and are None for the prior.
+    """
+    points = [(c["output_tokens"], c["latency"]) for c in calls if c["output_tokens"]]
+    if len(points) < MIN_CALLS:
+        return (
+            DEFAULT_OVERHEAD_SECONDS,
+            1 / DEFAULT_OUTPUT_TOKENS_PER_SECOND,
+            None,
+        )
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    slope = (
+        sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x if var_x else 0.0
+    )
+    if slope <= 0:
+        # Too little spread in answer length: treat latency as fixed per call
+        slope, overhead = 0.0, mean_y
+    else:
+        overhead = max(mean_y - slope * mean_x, 0.0)
+    residuals = [y - (overhead + slope * x) for x, y in points]
+    return overhead, slope, residuals
+
+
+def model_profile(provider, model):
+    """Learned token ratios and latency model for one provider/model."""
+    calls = telemetry.recent_calls(provider, model) if telemetry.enabled() else []
+    overhead, seconds_per_token, residuals = _fit_latency(calls)
+    return {
+        "calls": len(calls),
+        "input_ratio": _median_ratio(
+            [(c["estimated_input_tokens"], c["input_tokens"]) for c in calls], 1.0
+        ),
+        "output_tokens_per_word": _median_ratio(
+            [(c["word_limit"], c["output_tokens"]) for c in calls],
+            OUTPUT_TOKENS_PER_WORD,
+        ),
+        "overhead": overhead,
+        "seconds_per_token": seconds_per_token,
+        "residuals": residuals,
+    }
+
+
+def token_cost(provider, model, input_tokens, output_tokens):
+    """Dollar cost of a call, or None for models without a price."""
+    price = PRICING.get(provider, {}).get(model)
+    if not price:
+        return None
+    return (input_tokens * price["input"] + output_tokens * price["output"]) / 1e6
+
+
+def cheapest_model(provider):
+    """The provider's lowest-priced model, for light work like adapting answers."""
+    prices = PRICING.get(provider)
+    if not prices:
+        return None
+    return min(
+        prices, key=lambda model: prices[model]["input"] + prices[model]["output"]
+    )
+
+
+def estimate_run(
+    provider,
+    model,
+    resume_tokens,
+    questions,
+    word_limit,
+    concurrency=DEFAULT_CONCURRENCY,
+    context_tokens=None,
+):
+    """Predicts tokens, cost and p50/p95 duration of a generate_answers run.
+
+    Token counts are the résumé, question and context estimates scaled by the
+    ratios observed for this model; the duration is simulated by running the
+    questions in waves of ``concurrency`` calls with resampled latencies.
+    ``cost`` is None for models without a price.
+    """
+    profile = model_profile(provider, model)
+    context_tokens = token_budget() if context_tokens is None else context_tokens
+    output_per_call = word_limit * profile["output_tokens_per_word"]
+    input_tokens = sum(
+        (PROMPT_OVERHEAD_TOKENS + resume_tokens + context_tokens + count_tokens(q))
+        * profile["input_ratio"]
+        for q in questions
+    )
+    output_tokens = output_per_call * len(questions)
+
+    cost = token_cost(provider, model, input_tokens, output_tokens)
+
+    base = profile["overhead"] + output_per_call * profile["seconds_per_token"]
+    residuals = profile["residuals"] or [base * spread for spread in PRIOR_SPREAD]
+    concurrency = max(1, int(concurrency))
+    # Seeded so the sidebar doesn't flicker between reruns
+    rng = random.Random(len(questions) * 1000 + concurrency)
+    durations = []
+    for _ in range(SIMULATIONS if questions else 0):
+        total = 0.0
+        remaining = len(questions)
+        while remaining:
+            wave = min(concurrency, remaining)
+            total += max(max(base + rng.choice(residuals), 0.0) for _ in range(wave))
+            remaining -= wave
+        durations.append(total)
+    durations.sort()
+
+    def percentile(p):
+        return (
+            durations[min(int(p * len(durations)), len(durations) - 1)]
+            if durations
+            else 0.0
+        )
+
+    return {
+        "input_tokens": int(input_tokens),
+        "output_tokens": int(output_tokens),
+        "cost": cost,
+        "p50_seconds": percentile(0.5),
+        "p95_seconds": percentile(0.95),
+        "calibration_calls": profile["calls"],
+    }
@@ -0,0 +1,255 @@
+import importlib.util
+import io
+import json
+import os
+import posixpath
+import warnings
+import zipfile
+import xml.etree.ElementTree as ET
+
+from config import data_dir
+
+RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+DEFAULT_PDF_BACKEND = "pypdf2"
+# Order tried by "auto" when no benchmark ranking has been saved
+PDF_BACKEND_PREFERENCE = ["pymupdf", "pypdfium2", "pdfminer", "pypdf2"]
+PDF_RANKING_FILE = "pdf_backends.json"
+
+# name -> (module that must be importable, extract function)
+PDF_BACKENDS = {}
+
+
+def _local(tag):
+    return tag.rpartition("}")[2]
+
+
+def _part_targets(archive, rels_path, base_dir, kind):
+    """Returns the part names a relationships file points at for a relationship kind."""
+    try:
+        root = ET.fromstring(archive.read(rels_path))
+    except KeyError:
+        return []
+    targets = []
+    for rel in root.iter(f"{RELS_NS}Relationship"):
+        if rel.get("Type", "").rsplit("/", 1)[-1] == kind:
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                targets.append(target.lstrip("/"))
+            else:
+                targets.append(posixpath.normpath(posixpath.join(base_dir, target)))
+    return targets
+
+
+def _stream_part(stream):
+    """Yields the lines of one WordprocessingML part in reading order.
+
+    Paragraphs are emitted as they close, so text boxes anchored in a paragraph
+    come out just before it. Table rows whose cells each hold one line are joined
+    with `` | ``; rows with multi-line cells (column layouts) emit cell by cell.
+    """
+    paragraphs = []  # stack of run buffers, nested for text boxes
+    tables = []  # stack of {"row": [cells], "cell": [lines]}
+    fallback_depth = 0
+    in_tab_stops = False
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        name = _local(elem.tag)
+
+        if name == "Fallback":
+            # mc:Fallback repeats the mc:Choice content (e.g. VML text boxes)
+            fallback_depth += 1 if event == "start" else -1
+            if event == "end":
+                elem.clear()
+            continue
+        if fallback_depth:
+            if event == "end":
+                elem.clear()
+            continue
+
+        if name == "tabs":
+            # w:tabs holds tab stop definitions, not tab characters
+            in_tab_stops = event == "start"
+            continue
+
+        if event == "start":
+            if name == "p":
+                paragraphs.append([])
+            elif name == "tbl":
+                tables.append({"row": None, "cell": None})
+            elif name == "tr" and tables:
+                tables[-1]["row"] = []
+            elif name == "tc" and tables:
+                tables[-1]["cell"] = []
+            continue
+
+        if name == "t" and paragraphs:
+            paragraphs[-1].append(elem.text or "")
+        elif name == "tab" and paragraphs and not in_tab_stops:
+            paragraphs[-1].append("\t")
+        elif name in ("br", "cr") and paragraphs:
+            paragraphs[-1].append("\n")
+        elif name == "noBreakHyphen" and paragraphs:
+            paragraphs[-1].append("-")
+        elif name == "p" and paragraphs:
+            text = "".join(paragraphs.pop())
+            if tables and tables[-1]["cell"] is not None:
+                tables[-1]["cell"].append(text)
+            else:
+                yield text
+        elif name == "tc" and tables:
+            table = tables[-1]
+            if table["row"] is not None and table["cell"] is not None:
+                table["row"].append([line for line in table["cell"] if line.strip()])
+            table["cell"] = None
+        elif name == "tr" and tables:
+            row = tables[-1]["row"] or []
+            tables[-1]["row"] = None
+            lines = []
+            if all(len(cell) <= 1 for cell in row):
+                lines.append(" | ".join(cell[0] for cell in row if cell))
+            else:
+                for cell in row:
+                    lines.extend(cell)
+            if len(tables) > 1 and tables[-2]["cell"] is not None:
+                tables[-2]["cell"].extend(lines)
+            else:
+                yield from lines
+        elif name == "tbl" and tables:
+            tables.pop()
+
+        if name in ("p", "tbl", "tr", "tc", "r", "hyperlink", "sdt"):
+            elem.clear()
+
+
+def extract_docx_text(file_bytes):
+    """Extracts DOCX text by streaming the body, headers and footers.
+
+    Covers paragraphs, tables, text boxes and content controls without building
+    a full document model. Headers come first and footers last, each emitted
+    once even when several sections repeat them.
+    """
+    with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+        main_parts = _part_targets(archive, "_rels/.rels", "", "officeDocument")
+        document_part = main_parts[0] if main_parts else "word/document.xml"
+        base_dir, part_name = posixpath.split(document_part)
+        rels_path = posixpath.join(base_dir, "_rels", f"{part_name}.rels")
+        headers = _part_targets(archive, rels_path, base_dir, "header")
+        footers = _part_targets(archive, rels_path, base_dir, "footer")
+
+        lines = []
+        seen_parts = set()
+        for part in headers + [document_part] + footers:
+            try:
+                with archive.open(part) as stream:
+                    part_lines = list(_stream_part(stream))
+            except KeyError:
+                continue
+            key = "\n".join(part_lines).strip()
+            if part != document_part:
+                if not key or key in seen_parts:
+                    continue
+                seen_parts.add(key)
+            lines.extend(part_lines)
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def register_pdf_backend(name, module):
+    """Registers a PDF text extractor that needs ``module`` to be importable."""
+
+    def decorator(func):
+        PDF_BACKENDS[name] = (module, func)
+        return func
+
+    return decorator
+
+
+@register_pdf_backend("pypdf2", "PyPDF2")
+def _pypdf2_text(file_bytes):
+    from PyPDF2 import PdfReader
+
+    pdf_reader = PdfReader(io.BytesIO(file_bytes))
+    return "".join(page.extract_text() or "" for page in pdf_reader.pages)
+
+
+@register_pdf_backend("pymupdf", "pymupdf")
+def _pymupdf_text(file_bytes):
+    import pymupdf
+
+    with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+        return "".join(page.get_text("text", sort=True) for page in doc)
+
+
+@register_pdf_backend("pypdfium2", "pypdfium2")
+def _pypdfium2_text(file_bytes):
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(file_bytes)
+    try:
+        parts = []
+        for page in pdf:
+            text_page = page.get_textpage()
+            parts.append(text_page.get_text_range() + "\n")
+            text_page.close()
+            page.close()
+        return "".join(parts)
+    finally:
+        pdf.close()
+
+
+@register_pdf_backend("pdfminer", "pdfminer")
+def _pdfminer_text(file_bytes):
+    from pdfminer.high_level import extract_text
+
+    return extract_text(io.BytesIO(file_bytes))
+
+
+def available_pdf_backends():
+    """Returns the registered PDF backends whose library is installed."""
+    return [
+        name
+        for name, (module, _) in PDF_BACKENDS.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+
+
+def _saved_pdf_ranking():
+    path = os.path.join(data_dir(), PDF_RANKING_FILE)
+    try:
+        with open(path) as f:
+            return [row["backend"] for row in json.load(f)["ranking"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+
+
+def pdf_backend_name():
+    """Resolves the PDF backend from ``HIREHELPER_PDF_BACKEND`` (a name or "auto").
+
+    "auto" picks the best installed backend from the last saved benchmark
+    ranking, falling back to PDF_BACKEND_PREFERENCE.
+    """
+    configured = os.getenv("HIREHELPER_PDF_BACKEND", DEFAULT_PDF_BACKEND).lower()
+    available = available_pdf_backends()
+    if configured == "auto":
+        for name in _saved_pdf_ranking() + PDF_BACKEND_PREFERENCE:
+            if name in available:
+                return name
+        return DEFAULT_PDF_BACKEND
+    if configured not in PDF_BACKENDS:
+        raise ValueError(
+            f"Unknown PDF backend '{configured}'. "
+            f"Choose one of: auto, {', '.join(PDF_BACKENDS)}"
+        )
+    if configured not in available:
+        warnings.warn(
+            f"PDF backend '{configured}' is not installed, using {DEFAULT_PDF_BACKEND}"
+        )
+        return DEFAULT_PDF_BACKEND
+    return configured
+
+
+def extract_pdf_text(file_bytes, backend=None):
+    """Extracts PDF text with the given backend, or the configured one."""
+    _, extract = PDF_BACKENDS[backend or pdf_backend_name()]
+    return extract(file_bytes)
@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from config import data_dir
+
+DEFAULT_MAX_RUNS = 200
+
+_lock = threading.Lock()
+_conn = None
+
+
+def max_runs():
+    """How many runs are kept, from ``HIREHELPER_HISTORY_SIZE``; 0 turns history off."""
+    return int(os.getenv("HIREHELPER_HISTORY_SIZE", DEFAULT_MAX_RUNS))
+
+
+def _connection():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(
+            os.path.join(data_dir(), "history.sqlite3"), check_same_thread=False
+        )
+        with _conn:
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, "
+                "role TEXT NOT NULL, company TEXT NOT NULL, "
+                "provider TEXT NOT NULL, model TEXT NOT NULL, "
+                "questions INTEGER NOT NULL, resume_hash TEXT NOT NULL, "
+                "cost REAL NOT NULL, tokens INTEGER NOT NULL, "
+                "duration REAL NOT NULL, record BLOB NOT NULL)"
+            )
+            _conn.execute(
+                "CREATE INDEX IF NOT EXISTS run_history_resume "
+                "ON run_history (resume_hash, id)"
+            )
+    return _conn
+
+
+SUMMARY_KEYS = (
+    "id",
+    "created_at",
+    "role",
+    "company",
+    "provider",
+    "model",
+    "questions",
+    "resume_hash",
+    "cost",
+    "tokens",
+    "duration",
+)
+
+
+def _columns(record):
+    return (
+        record["role"],
+        record["company"],
+        record["provider"],
+        record["model"],
+        len(record["answers"]),
+        record["resume_hash"],
+        record["cost"],
+        record["tokens"],
+        record["duration"],
+        zlib.compress(json.dumps(record, separators=(",", ":")).encode(), 6),
+    )
+
+
+def save_run(record):
+    """Stores a finished run and prunes the oldest beyond the size limit.
+
+    ``record`` is a JSON-serialisable dict with at least role, company,
+    provider, model, resume_hash, answers, cost, tokens and duration; it is
+    kept zlib-compressed. Returns the run id, or None when history is off.
+    """
+    limit = max_runs()
+    if limit <= 0:
+        return None
+    with _lock, _connection() as conn:
+        run_id = conn.execute(
+            "INSERT INTO run_history (created_at, role, company, provider, model, "
+            "questions, resume_hash, cost, tokens, duration, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.time(), *_columns(record)),
+        ).lastrowid
+        conn.execute(
+            "DELETE FROM run_history WHERE id IN ("
+            "SELECT id FROM run_history ORDER BY id DESC LIMIT -1 OFFSET ?)",
+            (limit,),
+        )
+    return run_id
+
+
+def update_run(run_id, record):
+    """Replaces a stored run's record, e.g. after one of its answers was
+    regenerated; the run keeps its id and place in the history. Returns False
+    if the run was pruned or belongs to another résumé."""
+    with _lock, _connection() as conn:
+        updated = conn.execute(
+            "UPDATE run_history SET role = ?, company = ?, provider = ?, "
+            "model = ?, questions = ?, resume_hash = ?, cost = ?, tokens = ?, "
+            "duration = ?, record = ? WHERE id = ? AND resume_hash = ?",
+            (*_columns(record), run_id, record["resume_hash"]),
+        ).rowcount
+    return bool(updated)
+
+
+def list_runs(resume_hash, limit=50):
+    """Returns summaries of the latest runs for one résumé, newest first, without
+    their answers.
+
+    The store is shared by every session in the process; runs are only listed,
+    loaded or deleted for the résumé they were generated from, so one person's
+    history isn't shown to someone who uploaded another résumé.
+    """
+    with _lock:
+        rows = (
+            _connection()
+            .execute(
+                f"SELECT {', '.join(SUMMARY_KEYS)} FROM run_history "
+                "WHERE resume_hash = ? ORDER BY id DESC LIMIT ?",
+                (resume_hash, limit),
+            )
+            .fetchall()
+        )
+    return [dict(zip(SUMMARY_KEYS, row)) for row in rows]
+
+
+def load_run(run_id, resume_hash):
+    """Returns the full record of a stored run, or None if it was pruned or
+    belongs to another résumé."""
+    with _lock:
+        row = (
+            _connection()
+            .execute(
+                "SELECT record FROM run_history WHERE id = ? AND resume_hash = ?",
+                (run_id, resume_hash),
+            )
+            .fetchone()
+        )
+    return json.loads(zlib.decompress(row[0])) if row else None
+
+
+def delete_run(run_id, resume_hash):
+    with _lock, _connection() as conn:
+        conn.execute(
+            "DELETE FROM run_history WHERE id = ? AND resume_hash = ?",
+            (run_id, resume_hash),
+        )
@@ -1,901 +1,414 @@
+import datetime
+import hashlib
 import os
-import json
+import time
+import uuid
 import streamlit as st
 from dotenv import load_dotenv
 from streamlit.components.v1 import html
 
 # Import all business logic from utils
 from utils import (
-    svg_icons,
-    generate_answers,
+    MAX_VARIANTS,
+    generate_answers_async,
     process_document,
     format_resume_text_with_llm,
-    estimate_cost,
-    test_api_key,
+    format_cost,
     get_company_research,
     model_descriptions,
     model_options,
 )
+from research import format_research
+from pipeline import (
+    Stage,
+    run_pipeline,
+    summarize_timings,
+)
+from prefetch import (
+    prefetch_resume,
+    cancel_prefetch,
+    get_prefetch,
+)
+from resume_index import get_resume_index
+from assets import load_assets, svg_icons
+from budget import Budget, new_spend
+from providers import available_models, validate_keys
+import history
+from answer_library import get_answer_library
+from warmup import COMMON_QUESTIONS, canonical_question, cancel_warmup, warm_up
+from estimator import DEFAULT_CONCURRENCY, estimate_run
+
+
+def estimate_caption(resume_index, estimate):
+    basis = "your resume" if resume_index else "average resume size"
+    if estimate["calibration_calls"]:
+        return (
+            f"*Based on {basis}, current questions and "
+            f"{estimate['calibration_calls']} recorded calls to this model*"
+        )
+    return f"*Based on {basis} and current questions*"
 
 
-def main():
-    load_dotenv()
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-
-    st.set_page_config(
-        page_title="Hire Helper - AI Interview Prep",
-        page_icon="💼",
-        layout="wide",
-        initial_sidebar_state="auto",
-        menu_items={
-            "Get Help": "https://github.com/tashifkhan/hirehelper",
-            "Report a bug": "https://github.com/tashifkhan/hirehelper/issues",
-            "About": "# Hire Helper\\nYour AI-powered interview preparation companion!",
-        },
+def no_usable_models(provider):
+    return (
+        f"None of the {provider} models offered here are available to this API "
+        "key. Check the key's access, or choose another provider."
     )
 
-    if "file_uploader_key" not in st.session_state:
-        st.session_state.file_uploader_key = 0
-
-    if "questions" not in st.session_state:
-        st.session_state.questions = [""]
-
-    # Initialize API keys in session state
-    if "saved_api_keys" not in st.session_state:
-        st.session_state.saved_api_keys = {"Google": "", "OpenAI": "", "Claude": ""}
-
-    st.markdown(
-        """ 
-    <style>
-    /* Import modern fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=JetBrains+Mono:wght@400;500;600&display=swap');
-    
-    /* CSS Variables for consistent theming */
-    :root {
-        --primary-color: #6366F1;
-        --primary-dark: #4F46E5;
-        --primary-light: #818CF8;
-        --secondary-color: #8B5CF6;
-        --secondary-light: #A78BFA;
-        --accent-color: #06B6D4;
-        --accent-warm: #F59E0B;
-        --background-primary: #0F0F23;
-        --background-secondary: #1A1A40;
-        --background-tertiary: #262654;
-        --background-card: #2D2D5F;
-        --background-surface: #3A3A6B;
-        --text-primary: #F8FAFC;
-        --text-secondary: #CBD5E1;
-        --text-muted: #94A3B8;
-        --text-accent: #A5B4FC;
-        --border-color: #4B5563;
-        --border-light: #6B7280;
-        --success: #10B981;
-        --warning: #F59E0B;
-        --error: #EF4444;
-        --shadow: 0 4px 20px rgba(0, 0, 0, 0.25);
-        --shadow-hover: 0 12px 40px rgba(99, 102, 241, 0.25);
-        --shadow-glow: 0 0 40px rgba(99, 102, 241, 0.15);
-        --border-radius: 16px;
-        --border-radius-small: 12px;
-        --border-radius-large: 24px;
-        --gradient-primary: linear-gradient(135deg, #6366F1 0%, #8B5CF6 50%, #06B6D4 100%);
-        --gradient-secondary: linear-gradient(135deg, #8B5CF6 0%, #A78BFA 100%);
-        --gradient-accent: linear-gradient(135deg, #06B6D4 0%, #8B5CF6 100%);
-        --gradient-warm: linear-gradient(135deg, #F59E0B 0%, #EF4444 100%);
-        --gradient-bg: linear-gradient(135deg, #0F0F23 0%, #1A1A40 50%, #262654 100%);
-        --gradient-surface: linear-gradient(135deg, rgba(45, 45, 95, 0.8) 0%, rgba(58, 58, 107, 0.8) 100%);
-        --glass-bg: rgba(45, 45, 95, 0.1);
-        --glass-border: rgba(139, 92, 246, 0.2);
-        --backdrop-blur: blur(20px);
-        --transition-fast: all 0.2s cubic-bezier(0.4, 0, 0.2, 1);
-        --transition-smooth: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        --transition-bounce: all 0.4s cubic-bezier(0.68, -0.55, 0.265, 1.55);
-    }
-
-    /* Animated background patterns */
-    .stApp::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: 
-            radial-gradient(circle at 20% 80%, rgba(99, 102, 241, 0.1) 0%, transparent 50%),
-            radial-gradient(circle at 80% 20%, rgba(139, 92, 246, 0.1) 0%, transparent 50%),
-            radial-gradient(circle at 40% 40%, rgba(6, 182, 212, 0.05) 0%, transparent 50%);
-        animation: backgroundShift 20s ease-in-out infinite alternate;
-        pointer-events: none;
-        z-index: -1;
-    }
-
-    @keyframes backgroundShift {
-        0% { transform: translate(0, 0) rotate(0deg); }
-        100% { transform: translate(20px, -20px) rotate(1deg); }
-    }
-
-    /* Floating particles */
-    .stApp::after {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background-image: 
-            radial-gradient(2px 2px at 20px 30px, rgba(255, 255, 255, 0.1), transparent),
-            radial-gradient(2px 2px at 40px 70px, rgba(99, 102, 241, 0.2), transparent),
-            radial-gradient(1px 1px at 90px 40px, rgba(139, 92, 246, 0.15), transparent),
-            radial-gradient(1px 1px at 130px 80px, rgba(6, 182, 212, 0.1), transparent);
-        background-repeat: repeat;
-        background-size: 200px 150px;
-        animation: particleFloat 25s linear infinite;
-        pointer-events: none;
-        z-index: -1;
-        opacity: 0.6;
-    }
-
-    @keyframes particleFloat {
-        0% { transform: translateY(0px); }
-        100% { transform: translateY(-100vh); }
-    }
-
-    /* Main app styling */
-    .stApp {
-        background: var(--gradient-bg);
-        color: var(--text-primary);
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        min-height: 100vh;
-        padding: 0 !important;
-        position: relative;
-        overflow-x: hidden;
-    }
-
-    /* Main content container */
-    .main .block-container {
-        padding: 2rem 1rem !important;
-        max-width: 1400px !important;
-        margin: 0 auto !important;
-        width: 100% !important;
-        position: relative;
-        z-index: 1;
-    }
-
-    /* Center all main content */
-    .main {
-        display: flex !important;
-        flex-direction: column !important;
-        align-items: center !important;
-        width: 100% !important;
-    }
-
-    /* Ensure proper spacing for content */
-    .element-container {
-        width: 100% !important;
-        max-width: 1400px !important;
-        margin: 0 auto !important;
-    }
-
-    /* Center the title and subtitle */
-    .element-container h1,
-    .element-container .subtitle {
-        text-align: center !important;
-        margin-left: auto !important;
-        margin-right: auto !important;
-    }
-
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-
-    /* Advanced Sidebar styling with glassmorphism */
-    .css-1d391kg {
-        background: var(--glass-bg) !important;
-        backdrop-filter: var(--backdrop-blur) !important;
-        -webkit-backdrop-filter: var(--backdrop-blur) !important;
-        border-right: 3px solid var(--glass-border) !important;
-        box-shadow: 
-            var(--shadow),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
-        padding: 2rem 1.5rem !important;
-        position: relative;
-        overflow: hidden;
-    }
-
-    /* Sidebar glow effect */
-    .css-1d391kg::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: linear-gradient(
-            45deg,
-            rgba(99, 102, 241, 0.05) 0%,
-            rgba(139, 92, 246, 0.05) 50%,
-            rgba(6, 182, 212, 0.05) 100%
-        );
-        pointer-events: none;
-        z-index: -1;
-    }
-
-    .css-1d391kg .stMarkdown {
-        color: var(--text-secondary);
-    }
-
-    /* Modern sidebar section headers */
-    .css-1d391kg .stMarkdown h3 {
-        color: var(--primary-light) !important;
-        font-weight: 700 !important;
-        font-size: 1.4rem !important;
-        margin-top: 0 !important;
-        margin-bottom: 2rem !important;
-        padding-bottom: 0.75rem !important;
-        border-bottom: 2px solid var(--primary-color) !important;
-        position: relative;
-        background: var(--gradient-primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
 
-    .css-1d391kg .stMarkdown h3::after {
-        content: '';
-        position: absolute;
-        bottom: -2px;
-        left: 0;
-        width: 60px;
-        height: 2px;
-        background: var(--gradient-primary);
-        border-radius: 2px;
-    }
-
-    /* Sidebar form elements spacing */
-    .css-1d391kg .stTextInput,
-    .css-1d391kg .stTextArea,
-    .css-1d391kg .stNumberInput,
-    .css-1d391kg .stFileUploader,
-    .css-1d391kg .stSelectbox {
-        margin-bottom: 2rem !important;
-    }
-
-    /* Advanced button styling with 3D effects */
-    .stButton > button {
-        background: var(--gradient-primary);
-        color: white;
-        border: none;
-        border-radius: var(--border-radius-small);
-        font-weight: 600;
-        font-family: 'Inter', sans-serif;
-        font-size: 0.95rem;
-        padding: 1rem 2rem;
-        transition: var(--transition-smooth);
-        box-shadow: 
-            0 8px 25px rgba(99, 102, 241, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.2);
-        text-transform: none;
-        letter-spacing: 0.025em;
-        position: relative;
-        overflow: hidden;
-        cursor: pointer;
-        transform: translateY(0);
-    }
-
-    .stButton > button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.3), transparent);
-        transition: left 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-    }
-
-    .stButton > button:hover::before {
-        left: 100%;
-    }
-
-    .stButton > button:hover {
-        background: var(--gradient-secondary);
-        transform: translateY(-3px) scale(1.02);
-        box-shadow: 
-            var(--shadow-hover),
-            var(--shadow-glow),
-            inset 0 1px 0 rgba(255, 255, 255, 0.3);
-    }
-
-    .stButton > button:active {
-        transform: translateY(-1px) scale(1.01);
-        transition: var(--transition-fast);
-    }
-
-    /* Remove button styling */
-    div[data-testid="column"] button {
-        background: linear-gradient(135deg, var(--background-surface) 0%, var(--background-card) 100%) !important;
-        color: var(--text-secondary) !important;
-        border: 2px solid var(--border-color) !important;
-        border-radius: var(--border-radius-small) !important;
-        font-weight: 500 !important;
-        padding: 0.75rem !important;
-        transition: var(--transition-smooth) !important;
-        min-height: 3rem !important;
-        backdrop-filter: blur(10px) !important;
-    }
-
-    div[data-testid="column"] button:hover {
-        background: var(--gradient-warm) !important;
-        color: white !important;
-        border-color: var(--accent-warm) !important;
-        transform: translateY(-2px) scale(1.05) !important;
-        box-shadow: 0 8px 25px rgba(239, 68, 68, 0.3) !important;
-    }
-
-    /* Advanced input styling with floating labels effect */
-    .stTextInput input, 
-    .stTextArea textarea, 
-    .stNumberInput input,
-    .stSelectbox > div > div {
-        background: var(--glass-bg) !important;
-        border: 2px solid var(--border-color) !important;
-        border-radius: var(--border-radius-small) !important;
-        color: var(--text-primary) !important;
-        font-family: 'Inter', sans-serif !important;
-        font-size: 0.95rem !important;
-        padding: 1rem 1.25rem !important;
-        transition: var(--transition-smooth) !important;
-        box-shadow: 
-            inset 0 2px 4px rgba(0, 0, 0, 0.1),
-            0 0 0 0 rgba(99, 102, 241, 0) !important;
-        backdrop-filter: blur(10px) !important;
-        position: relative;
-    }
-
-    .stTextInput input:focus, 
-    .stTextArea textarea:focus, 
-    .stNumberInput input:focus,
-    .stSelectbox > div > div:focus-within {
-        border-color: var(--primary-color) !important;
-        box-shadow: 
-            0 0 0 4px rgba(99, 102, 241, 0.1),
-            inset 0 2px 4px rgba(0, 0, 0, 0.1),
-            var(--shadow-glow) !important;
-        outline: none !important;
-        background: var(--background-surface) !important;
-        transform: translateY(-2px);
-    }
-
-    .stTextArea textarea {
-        min-height: 100px !important;
-        resize: vertical !important;
-    }
-
-    /* Advanced File uploader with animated upload zone */
-    .stFileUploader {
-        border: 3px dashed var(--border-light) !important;
-        border-radius: var(--border-radius-large) !important;
-        background: var(--glass-bg) !important;
-        backdrop-filter: var(--backdrop-blur) !important;
-        padding: 3rem !important;
-        text-align: center !important;
-        transition: var(--transition-bounce) !important;
-        position: relative;
-        overflow: hidden;
-    }
-
-    .stFileUploader::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: var(--gradient-primary);
-        opacity: 0;
-        transition: var(--transition-smooth);
-        pointer-events: none;
-    }
-
-    .stFileUploader::after {
-        content: '⬆';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        transform: translate(-50%, -50%);
-        font-size: 4rem;
-        opacity: 0.1;
-        pointer-events: none;
-        transition: var(--transition-smooth);
-    }
-
-    .stFileUploader:hover::before {
-        opacity: 0.05;
-    }
-
-    .stFileUploader:hover::after {
-        opacity: 0.3;
-        transform: translate(-50%, -50%) scale(1.1);
-    }
-
-    .stFileUploader:hover {
-        border-color: var(--primary-color) !important;
-        transform: translateY(-4px) scale(1.02);
-        box-shadow: var(--shadow-hover);
-        background: var(--background-surface) !important;
-    }
-
-    /* Advanced typography with text effects */
-    h1 {
-        color: transparent !important;
-        font-weight: 800 !important;
-        font-size: 3.5rem !important;
-        margin-bottom: 1rem !important;
-        text-align: center;
-        background: var(--gradient-primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-        position: relative;
-        letter-spacing: -0.02em;
-        line-height: 1.1;
-    }
-
-    h1::after {
-        content: '';
-        position: absolute;
-        bottom: -10px;
-        left: 50%;
-        transform: translateX(-50%);
-        width: 120px;
-        height: 4px;
-        background: var(--gradient-primary);
-        border-radius: 2px;
-        animation: titleGlow 2s ease-in-out infinite alternate;
-    }
-
-    @keyframes titleGlow {
-        0% { box-shadow: 0 0 20px rgba(99, 102, 241, 0.5); }
-        100% { box-shadow: 0 0 40px rgba(139, 92, 246, 0.8); }
-    }
-
-    h2, h3 {
-        color: var(--primary-light) !important;
-        font-weight: 700 !important;
-        margin-top: 3rem !important;
-        margin-bottom: 2rem !important;
-        font-size: 1.8rem !important;
-        line-height: 1.2 !important;
-        position: relative;
-    }
-
-    .subtitle {
-        text-align: center;
-        color: var(--text-secondary);
-        font-size: 1.25rem;
-        margin-bottom: 3rem;
-        font-weight: 400;
-        line-height: 1.6;
-        max-width: 700px;
-        margin-left: auto;
-        margin-right: auto;
-        opacity: 0.9;
-    }
-
-    /* Advanced alert styling with icons */
-    .stSuccess {
-        background: linear-gradient(135deg, var(--success) 0%, #059669 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--border-radius) !important;
-        padding: 1.5rem !important;
-        box-shadow: 
-            var(--shadow),
-            0 0 30px rgba(16, 185, 129, 0.2) !important;
-        border-left: 5px solid #34D399 !important;
-        backdrop-filter: blur(10px) !important;
-        position: relative;
-        overflow: hidden;
-    }
-
-    .stWarning {
-        background: linear-gradient(135deg, var(--warning) 0%, #D97706 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--border-radius) !important;
-        padding: 1.5rem !important;
-        box-shadow: 
-            var(--shadow),
-            0 0 30px rgba(245, 158, 11, 0.2) !important;
-        border-left: 5px solid #FBBF24 !important;
-        backdrop-filter: blur(10px) !important;
-    }
-
-    .stError {
-        background: linear-gradient(135deg, var(--error) 0%, #DC2626 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--border-radius) !important;
-        padding: 1.5rem !important;
-        box-shadow: 
-            var(--shadow),
-            0 0 30px rgba(239, 68, 68, 0.2) !important;
-        border-left: 5px solid #F87171 !important;
-        backdrop-filter: blur(10px) !important;
-    }
-
-    .stInfo {
-        background: var(--gradient-secondary) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--border-radius) !important;
-        padding: 1.5rem !important;
-        box-shadow: 
-            var(--shadow),
-            0 0 30px rgba(139, 92, 246, 0.2) !important;
-        border-left: 5px solid var(--secondary-light) !important;
-        backdrop-filter: blur(10px) !important;
-    }
-
-    /* Advanced loading spinner */
-    .stSpinner > div {
-        border-top-color: var(--primary-color) !important;
-        border-right-color: var(--primary-light) !important;
-        animation: spin 1s cubic-bezier(0.68, -0.55, 0.265, 1.55) infinite !important;
-    }
-
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
-
-    /* Advanced answer cards with 3D effects */
-    .answer-card {
-        background: var(--glass-bg);
-        backdrop-filter: var(--backdrop-blur);
-        border: 2px solid var(--glass-border);
-        border-left: 6px solid var(--primary-color);
-        border-radius: var(--border-radius-large);
-        padding: 2.5rem;
-        margin: 2rem 0;
-        box-shadow: 
-            var(--shadow),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1);
-        transition: var(--transition-smooth);
-        position: relative;
-        overflow: hidden;
-    }
-
-    .answer-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: var(--gradient-primary);
-        opacity: 0;
-        transition: var(--transition-smooth);
-        pointer-events: none;
-    }
-
-    .answer-card:hover::before {
-        opacity: 0.03;
-    }
-
-    .answer-card:hover {
-        transform: translateY(-8px) scale(1.01);
-        box-shadow: 
-            var(--shadow-hover),
-            var(--shadow-glow),
-            inset 0 1px 0 rgba(255, 255, 255, 0.2);
-        border-left-color: var(--accent-color);
-        border-color: var(--primary-light);
-    }
-
-    .question-header {
-        color: var(--primary-light);
-        font-weight: 700;
-        font-size: 1.25rem;
-        margin-bottom: 1.5rem;
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-        position: relative;
-        z-index: 1;
-    }
-
-    .question-header::before {
-        content: '';
-        width: 8px;
-        height: 8px;
-        background: var(--gradient-primary);
-        border-radius: 50%;
-        box-shadow: 0 0 20px rgba(99, 102, 241, 0.5);
-        animation: pulse 2s ease-in-out infinite alternate;
-    }
-
-    @keyframes pulse {
-        0% { box-shadow: 0 0 20px rgba(99, 102, 241, 0.5); }
-        100% { box-shadow: 0 0 30px rgba(139, 92, 246, 0.8); }
-    }
-
-    .answer-text {
-        color: var(--text-primary);
-        line-height: 1.8;
-        font-size: 1.05rem;
-        margin-bottom: 1.5rem;
-        position: relative;
-        z-index: 1;
-    }
-
-    /* Advanced copy button with ripple effect */
-    .copy-button {
-        background: linear-gradient(135deg, var(--success) 0%, #059669 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--border-radius-small) !important;
-        font-weight: 600 !important;
-        font-family: 'Inter', sans-serif !important;
-        padding: 1rem 2rem !important;
-        transition: var(--transition-smooth) !important;
-        min-width: 150px !important;
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        gap: 0.75rem !important;
-        cursor: pointer;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 4px 20px rgba(16, 185, 129, 0.3);
-    }
-
-    .copy-button::before {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        width: 0;
-        height: 0;
-        background: rgba(255, 255, 255, 0.3);
-        border-radius: 50%;
-        transition: width 0.6s, height 0.6s, top 0.6s, left 0.6s;
-        transform: translate(-50%, -50%);
-    }
-
-    .copy-button:active::before {
-        width: 300px;
-        height: 300px;
-        top: 50%;
-        left: 50%;
-    }
-
-    .copy-button:hover {
-        background: linear-gradient(135deg, #047857 0%, #059669 100%) !important;
-        transform: translateY(-2px) scale(1.05) !important;
-        box-shadow: 
-            0 8px 30px rgba(16, 185, 129, 0.4),
-            0 0 40px rgba(16, 185, 129, 0.2) !important;
-    }
-
-    /* Progress bar with glow effect */
-    .stProgress > div > div {
-        background: var(--gradient-primary) !important;
-        border-radius: 10px !important;
-        box-shadow: 0 0 20px rgba(99, 102, 241, 0.5) !important;
-    }
-
-    .stProgress > div {
-        background: var(--background-surface) !important;
-        border-radius: 10px !important;
-    }
-
-    /* Advanced expander styling */
-    .streamlit-expander {
-        background: var(--glass-bg) !important;
-        backdrop-filter: var(--backdrop-blur) !important;
-        border: 2px solid var(--glass-border) !important;
-        border-radius: var(--border-radius) !important;
-        margin-bottom: 2rem !important;
-        overflow: hidden;
-        transition: var(--transition-smooth);
-    }
-
-    .streamlit-expander:hover {
-        border-color: var(--primary-color) !important;
-        box-shadow: var(--shadow-glow);
-        transform: translateY(-2px);
-    }
-
-    .streamlit-expanderHeader {
-        padding: 1.5rem 2rem !important;
-        font-weight: 700 !important;
-        font-size: 1.2rem !important;
-        color: var(--primary-light) !important;
-        background: var(--gradient-surface) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: var(--border-radius) var(--border-radius) 0 0 !important;
-        position: relative;
-    }
-
-    .streamlit-expanderContent {
-        padding: 2rem !important;
-        background: var(--glass-bg) !important;
-    }
-
-    /* Responsive design improvements */
-    @media (max-width: 768px) {
-        :root {
-            --border-radius: 12px;
-            --border-radius-small: 8px;
-            --border-radius-large: 16px;
-        }
-        
-        .stApp {
-            padding-top: 1rem !important;
-        }
-        
-        .main .block-container {
-            padding: 1rem 0.75rem !important;
-        }
-        
-        h1 {
-            font-size: 2.5rem !important;
-        }
-        
-        .subtitle {
-            font-size: 1.1rem !important;
-            margin-bottom: 2rem !important;
-        }
-        
-        .answer-card {
-            padding: 1.5rem !important;
-            margin: 1.5rem 0 !important;
-        }
-        
-        .stButton > button {
-            padding: 0.875rem 1.5rem !important;
-            font-size: 0.9rem !important;
-        }
-        
-        .stFileUploader {
-            padding: 2rem !important;
-        }
-    }
+RESULTS_PAGE_SIZE = 10
+# What a run was generated with; regenerating one of its answers reuses these
+RUN_INPUTS = (
+    "role",
+    "company",
+    "company_website",
+    "company_info",
+    "word_limit",
+    "provider",
+    "model",
+    "variants",
+    "resume_hash",
+)
 
-    /* Accessibility improvements with better focus indicators */
-    @media (prefers-reduced-motion: reduce) {
-        *, *::before, *::after {
-            animation-duration: 0.01ms !important;
-            animation-iteration-count: 1 !important;
-            transition-duration: 0.01ms !important;
-        }
-    }
 
-    button:focus-visible,
-    input:focus-visible,
-    textarea:focus-visible {
-        outline: 3px solid var(--primary-color) !important;
-        outline-offset: 3px !important;
-        box-shadow: 0 0 0 6px rgba(99, 102, 241, 0.2) !important;
-    }
+def answer_card(number, item, text=None):
+    text = item["answer"] if text is None else text
+    return f"""<div class="answer-card">
+                <div class="question-header">
+                    <span>Question {number}</span>
+                </div>
+                <div style="color: var(--text-accent); margin-bottom: 1.5rem; font-style: italic; 
+                     font-size: 1.1rem; line-height: 1.6; padding: 1rem; 
+                     background: rgba(99, 102, 241, 0.1); border-radius: var(--border-radius-small); 
+                     border-left: 4px solid var(--primary-color);">
+                    "{item['question']}"
+                </div>
+                <div class="answer-text">
+                    <strong style="color: var(--primary-light); font-size: 1.1rem;">Your Answer:</strong><br><br>
+                    <div class="answer-body">{text}</div>
+                </div>
+                <button class="copy-button">
+                    {svg_icons['copy']} Copy Answer
+                </button>
+            </div><br>"""
+
+
+@st.fragment
+def results_view():
+    """Answers from the last generation, kept in ``st.session_state.results`` so
+    they stay on screen across reruns and can update on their own."""
+    results = st.session_state.get("results")
+    if not results:
+        return
+    answers, role, company = results["answers"], results["role"], results["company"]
+    # Saved answers belong to the résumé they were written from
+    resume_hash = (results.get("inputs") or {}).get("resume_hash")
+    if results.get("cancelled"):
+        kept = sum(1 for item in answers if not item.get("cancelled"))
+        st.warning(
+            f"Generation was cancelled: {kept} of {len(answers)} answers arrived "
+            "and are kept. Generate again to finish; kept answers are reused."
+        )
 
-    /* Hide file uploader remove buttons */
-    .stFileUploader button[kind="secondary"],
-    .stFileUploader button[data-testid="stButton"]:not([type="button"]),
-    .stFileUploader .stButton:not([type="button"]),
-    .stFileUploader section button[title*="Remove"],
-    .stFileUploader section button[title*="remove"],
-    .stFileUploader section button[title*="Delete"],
-    .stFileUploader section button[title*="delete"],
-    .stFileUploader section button[title*="Clear"],
-    .stFileUploader section button[title*="clear"],
-    .stFileUploader section small + button,
-    .stFileUploader div[data-testid="stFileUploaderDeleteBtn"] {
-        display: none !important;
-        visibility: hidden !important;
-        opacity: 0 !important;
-        pointer-events: none !important;
-    }
+    st.markdown(
+        f"""
+    <div style="text-align: center; margin: 2rem 0; padding: 2rem; background: var(--glass-bg); 
+         backdrop-filter: var(--backdrop-blur); border-radius: var(--border-radius-large); 
+         border: 2px solid var(--success);">
+        <div style="font-size: 3rem; margin-bottom: 1rem;">{svg_icons['check']}</div>
+        <h2 style="color: var(--success); margin: 0;">Your personalized interview answers are ready!</h2>
+        <p style="color: var(--text-secondary); margin-top: 0.5rem;">
+            Tailored specifically for {role} at {company}
+        </p>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
 
-    /* File uploader button styling */
-    .stFileUploader button[type="button"] {
-        background: var(--gradient-primary) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--border-radius-small) !important;
-        font-weight: 600 !important;
-        font-family: 'Inter', sans-serif !important;
-        padding: 1rem 2rem !important;
-        transition: var(--transition-smooth) !important;
-        box-shadow: 0 8px 25px rgba(99, 102, 241, 0.3) !important;
-        text-transform: none !important;
-        letter-spacing: 0.025em !important;
-        margin: 1rem auto 0 auto !important;
-        position: relative !important;
-        overflow: hidden !important;
-        display: block !important;
-        width: auto !important;
-        min-width: 180px !important;
-    }
+    query = st.text_input(
+        "Search answers",
+        key="results_filter",
+        on_change=lambda: st.session_state.pop("results_page", None),
+        placeholder="Filter by words in the question or answer...",
+    ).strip()
+    # Keep each answer's original number so filtered cards still match the inputs
+    matches = [
+        (i, item)
+        for i, item in enumerate(answers, start=1)
+        if not query
+        or query.lower() in item["question"].lower()
+        or any(
+            query.lower() in text.lower()
+            for text in item.get("variants") or [item["answer"]]
+        )
+    ]
+    if not matches:
+        st.info(f'No answers match "{query}".')
+        return
+
+    pages = -(-len(matches) // RESULTS_PAGE_SIZE)
+    if st.session_state.get("results_page", 1) > pages:
+        st.session_state.results_page = 1
+    page = 1
+    if pages > 1:
+        page = st.selectbox(
+            "Page",
+            range(1, pages + 1),
+            key="results_page",
+            format_func=lambda p: f"Page {p} of {pages}",
+        )
+    shown = matches[(page - 1) * RESULTS_PAGE_SIZE : page * RESULTS_PAGE_SIZE]
+    first = (page - 1) * RESULTS_PAGE_SIZE + 1
+    st.caption(
+        f"Showing {first}–{first + len(shown) - 1} of {len(matches)} answers"
+        + (f' matching "{query}"' if query else "")
+    )
 
-    .stFileUploader button[type="button"]:hover {
-        background: var(--gradient-secondary) !important;
-        transform: translateY(-2px) scale(1.05) !important;
-        box-shadow: var(--shadow-hover) !important;
-    }
+    # Copy buttons read the card text in static/hirehelper.js, so each answer
+    # is sent once
+    for i, item in shown:
+        texts = item.get("variants") or [item["answer"]]
+        choice = 0
+        if len(texts) > 1:
+            choice = st.radio(
+                f"Variant for question {i}",
+                range(len(texts)),
+                format_func=lambda v: f"Variant {v + 1}",
+                # Per run, so a choice never points past a new run's variants
+                key=f"variant_{results.get('run_id')}_{i}",
+                horizontal=True,
+                label_visibility="collapsed",
+            )
+        st.markdown(answer_card(i, item, texts[choice]), unsafe_allow_html=True)
+        if item.get("library"):
+            st.caption(f"📚 {item['library'].capitalize()} from your answer library")
+        cols = st.columns(2)
+        if cols[0].button(
+            "Regenerate this answer",
+            key=f"regenerate_{i}",
+            use_container_width=True,
+            help="Ask the model again for this question only; other answers are kept",
+        ):
+            st.session_state.regenerate = i - 1
+            st.rerun()
+        if cols[1].button(
+            "Save to library",
+            key=f"save_answer_{i}",
+            use_container_width=True,
+            disabled=bool(
+                item.get("skipped") or item.get("cancelled") or not resume_hash
+            ),
+            help="Keep this answer to reuse or adapt for similar questions "
+            "from this resume later",
+        ):
+            get_answer_library().add(
+                item["question"],
+                texts[choice],
+                results["role"],
+                results["company"],
+                resume_hash,
+            )
+            st.toast("Saved to your answer library")
+
+
+@st.fragment
+def history_view(resume_hash):
+    """Past runs for the uploaded résumé from the local history store; restoring
+    one shows its answers again without calling a model."""
+    if not resume_hash or history.max_runs() <= 0:
+        return
+    runs = history.list_runs(resume_hash)
+    if not runs:
+        return
+
+    def describe(run):
+        started = datetime.datetime.fromtimestamp(run["created_at"])
+        return (
+            f"{started:%Y-%m-%d %H:%M} · {run['role']} at {run['company']} · "
+            f"{run['questions']} answers · {run['model']} · ${run['cost']:.3f}"
+        )
 
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
+    with st.expander(f"History ({len(runs)} recent runs)", expanded=False):
+        run = st.selectbox("Past run", runs, format_func=describe, key="history_run")
+        cols = st.columns(2)
+        if cols[0].button("Restore", key="history_restore", use_container_width=True):
+            record = history.load_run(run["id"], resume_hash)
+            if record is None:
+                st.warning("That run is no longer in the history.")
+                return
+            st.session_state.pop("results_page", None)
+            st.session_state.results = {
+                "answers": record["answers"],
+                "role": record["role"],
+                "company": record["company"],
+                "run_id": run["id"],
+                "inputs": {key: record.get(key) for key in RUN_INPUTS},
+            }
+            # Bring the questions back into the editor as well
+            st.session_state.questions = list(record["questions"])
+            for key in [k for k in st.session_state if k.startswith("question_")]:
+                del st.session_state[key]
+            st.rerun()
+        cols[1].button(
+            "Delete",
+            key="history_delete",
+            use_container_width=True,
+            on_click=history.delete_run,
+            args=(run["id"], resume_hash),
+        )
+        st.caption(
+            f"{run['tokens']:,} tokens, {run['duration']:.1f}s to generate. "
+            "Restoring shows these answers again without calling the model."
+        )
 
-    ::-webkit-scrollbar-track {
-        background: var(--background-secondary);
-        border-radius: 4px;
-    }
 
-    ::-webkit-scrollbar-thumb {
-        background: var(--gradient-primary);
-        border-radius: 4px;
-        box-shadow: 0 0 10px rgba(99, 102, 241, 0.3);
-    }
+@st.fragment
+def question_editor(mobile, model_provider, model_name, resume_index):
+    """Interview questions, answer length and parallelism, with the cost estimate
+    that depends on them. Edits rerun only this fragment; the generate flow reads
+    the values back from ``st.session_state``."""
 
-    ::-webkit-scrollbar-thumb:hover {
-        background: var(--gradient-secondary);
-    }
+    def add_question_field():
+        st.session_state.questions.append("")
 
-    /* Selection styling */
-    ::selection {
-        background: rgba(99, 102, 241, 0.3);
-        color: var(--text-primary);
-    }
+    def remove_question_field(index):
+        if len(st.session_state.questions) > 1:
+            st.session_state.questions.pop(index)
+        else:
+            st.session_state.questions[index] = ""
+
+    for i, q_text in enumerate(st.session_state.questions):
+        cols = st.columns([0.85, 0.15])
+        st.session_state.questions[i] = cols[0].text_area(
+            f"Question {i+1}",
+            value=q_text,
+            key=f"question_{i}",
+            height=80,
+            placeholder=f"Enter your interview question {i+1}...",
+        )
+        if len(st.session_state.questions) > 1:
+            cols[1].button(
+                "Remove" if mobile else "×",
+                key=f"remove_q_{i}",
+                on_click=remove_question_field,
+                args=(i,),
+                help="Remove this question",
+            )
 
-    ::-moz-selection {
-        background: rgba(99, 102, 241, 0.3);
-        color: var(--text-primary);
-    }
-    </style>
-    """,
-        unsafe_allow_html=True,
+    if mobile:
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.button(
+                "Add Question",
+                on_click=add_question_field,
+                use_container_width=True,
+            )
+        with col2:
+            st.number_input(
+                "Word limit",
+                min_value=20,
+                max_value=500,
+                value=100,
+                step=10,
+                key="word_limit",
+            )
+    else:
+        st.button("Add Question", on_click=add_question_field, use_container_width=True)
+        st.number_input(
+            "Word limit per answer",
+            min_value=20,
+            max_value=500,
+            value=100,
+            step=10,
+            key="word_limit",
+            help="Maximum words per generated answer",
+        )
+    st.number_input(
+        "Parallel requests",
+        min_value=1,
+        max_value=8,
+        value=DEFAULT_CONCURRENCY,
+        key="max_concurrency",
+        help="How many questions are sent to the model at once",
+    )
+    st.number_input(
+        "Answer variants",
+        min_value=1,
+        max_value=MAX_VARIANTS,
+        value=1,
+        key="variants",
+        help="Alternative phrasings per question, generated in the same request",
+    )
+    st.checkbox(
+        "Use my answer library",
+        value=True,
+        key="use_library",
+        help="Reuse or adapt answers you saved for similar questions before "
+        "asking the model",
+    )
+    st.checkbox(
+        "Pre-generate common questions",
+        value=False,
+        key="warmup",
+        help=f"Once your resume, role and company are in, answer the "
+        f"{len(COMMON_QUESTIONS)} most common interview questions in the "
+        "background (within a small spend cap) so they come back instantly",
     )
 
-    # Enhanced title with animated subtitle
-    st.markdown(
-        f"""
-    <div style="text-align: center; margin-bottom: 3rem;">
-        <h1 style="margin-bottom: 0.5rem;">
-            {svg_icons['brain']} Hire Helper
-        </h1>
-        <div class="subtitle" style="position: relative;">
-            Your AI-powered interview preparation companion
-            <div style="position: absolute; top: -20px; right: -20px; animation: float 3s ease-in-out infinite;">
-                {svg_icons['sparkles']}
-            </div>
-        </div>
-    </div>
-    
-    <style>
-    @keyframes float {{
-        0%, 100% {{ transform: translateY(0px) rotate(0deg); }}
-        50% {{ transform: translateY(-10px) rotate(180deg); }}
-    }}
-    </style>
-    """,
-        unsafe_allow_html=True,
+    cost_estimate(model_provider, model_name, resume_index)
+
+
+@st.fragment
+def cost_estimate(model_provider, model_name, resume_index):
+    """The "Show Cost Estimates" toggle and the estimate for the current inputs."""
+    if not st.checkbox(
+        "Show Cost Estimates",
+        help="Estimate costs for your current configuration",
+        key="show_cost_estimate",
+    ):
+        return
+
+    # Average resume is ~2000 characters until one is uploaded
+    current_questions = [q for q in st.session_state.questions if q.strip()]
+    if not current_questions:
+        return
+
+    estimate = estimate_run(
+        model_provider,
+        model_name,
+        resume_index["total_tokens"] if resume_index else 500,
+        current_questions,
+        # Variants multiply the output; the prompt is sent once per question
+        st.session_state.get("word_limit", 100) * st.session_state.get("variants", 1),
+        st.session_state.get("max_concurrency", DEFAULT_CONCURRENCY),
+    )
+    st.info(
+        f"**Estimated Cost:** {format_cost(estimate['cost'])}  \n"
+        f"**Estimated Time:** ~{estimate['p50_seconds']:.0f}s "
+        f"(p95 {estimate['p95_seconds']:.0f}s)"
     )
+    st.caption(estimate_caption(resume_index, estimate))
+    over_cap = Budget(
+        model_provider,
+        model_name,
+        session=st.session_state.get("spend"),
+    ).check(
+        estimate["cost"] or 0.0,
+        estimate["input_tokens"] + estimate["output_tokens"],
+    )
+    if over_cap:
+        st.warning(
+            f"This run would exceed {over_cap}; "
+            "questions past the cap will be skipped."
+        )
 
-    # Prepare API keys dictionary
-    api_keys_dict = {
-        "Google": GOOGLE_API_KEY,
-        "OpenAI": OPENAI_API_KEY,
-        "Claude": ANTHROPIC_API_KEY,
-    }
+
+@st.fragment
+def api_key_panel(env_keys):
+    """Key entry, overrides and status. Typing a key reruns only this panel; the
+    whole app reruns once the set of keys changes. Stores the effective keys in
+    ``st.session_state.api_keys``."""
+    api_keys_dict = dict(env_keys)
 
     # Check if at least one API key is available
     available_providers = [provider for provider, key in api_keys_dict.items() if key]
@@ -1092,43 +605,26 @@ def main():
                 }
                 st.rerun()
 
-            # Add API key testing
+            # Keys are checked automatically (see the sidebar); this forces a re-check
             with st.expander("Test API Keys (Optional)", expanded=False):
                 st.markdown("Test your API keys to make sure they work:")
-
-                for provider in available_providers:
-                    col1, col2 = st.columns([3, 1])
-
-                    with col1:
-                        st.write(f"**{provider}** API Key")
-
-                    with col2:
-                        test_button_key = f"test_{provider.lower()}_key"
-                        if st.button(
-                            f"Test {provider}",
-                            key=test_button_key,
-                            help=f"Test your {provider} API key",
-                        ):
-                            with st.spinner(f"Testing {provider} API key..."):
-                                # Get the first available model for testing
-                                test_models = {
-                                    "Google": "gemini-1.5-flash",
-                                    "OpenAI": "gpt-3.5-turbo",
-                                    "Claude": "claude-3-haiku-20240307",
-                                }
-                                test_model = test_models[provider]
-
-                                is_valid, message = test_api_key(
-                                    provider, api_keys_dict[provider], test_model
-                                )
-
-                                if is_valid:
-                                    st.success(f"{provider}: {message}")
-                                else:
-                                    st.error(f"{provider}: {message}")
+                if st.button(
+                    "Test all keys",
+                    key="test_all_keys",
+                    help="Check every key again with the providers",
+                ):
+                    with st.spinner("Testing API keys..."):
+                        key_results = validate_keys(
+                            {p: api_keys_dict[p] for p in available_providers},
+                            force=True,
+                        )
+                    for provider, result in key_results.items():
+                        if result["valid"]:
+                            st.success(f"{provider}: {result['message']}")
+                        else:
+                            st.error(f"{provider}: {result['message']}")
         else:
             st.error("Please enter at least one valid API key to continue.")
-            st.stop()
     else:
         # Show option to override environment keys
         with st.expander("Override API Keys (Optional)", expanded=False):
@@ -1210,7 +706,7 @@ def main():
             st.markdown("**Your Current Setup:**")
             st.markdown(f"• **Available Providers:** {', '.join(available_providers)}")
             st.markdown(
-                f"• **Environment Keys:** {len([k for k in [GOOGLE_API_KEY, OPENAI_API_KEY, ANTHROPIC_API_KEY] if k])} configured"
+                f"• **Environment Keys:** {len([k for k in env_keys.values() if k])} configured"
             )
             st.markdown(
                 f"• **Session Keys:** {len([k for k in st.session_state.saved_api_keys.values() if k])} entered"
@@ -1221,6 +717,88 @@ def main():
                 else "• **Ready to Process:** No"
             )
 
+    # Everything else depends on which keys are usable; rerun it all when they change
+    previous = st.session_state.get("api_keys")
+    st.session_state.api_keys = api_keys_dict
+    if previous is not None and previous != api_keys_dict:
+        st.rerun()
+
+
+def main():
+    load_dotenv()
+    env_keys = {
+        "Google": os.getenv("GOOGLE_API_KEY"),
+        "OpenAI": os.getenv("OPENAI_API_KEY"),
+        "Claude": os.getenv("ANTHROPIC_API_KEY"),
+    }
+
+    st.set_page_config(
+        page_title="Hire Helper - AI Interview Prep",
+        page_icon="💼",
+        layout="wide",
+        initial_sidebar_state="auto",
+        menu_items={
+            "Get Help": "https://github.com/tashifkhan/hirehelper",
+            "Report a bug": "https://github.com/tashifkhan/hirehelper/issues",
+            "About": "# Hire Helper\\nYour AI-powered interview preparation companion!",
+        },
+    )
+
+    if "file_uploader_key" not in st.session_state:
+        st.session_state.file_uploader_key = 0
+
+    if "questions" not in st.session_state:
+        st.session_state.questions = [""]
+
+    # Initialize API keys in session state
+    if "saved_api_keys" not in st.session_state:
+        st.session_state.saved_api_keys = {"Google": "", "OpenAI": "", "Claude": ""}
+
+    load_assets()
+
+    # Enhanced title with animated subtitle
+    st.markdown(
+        f"""
+    <div style="text-align: center; margin-bottom: 3rem;">
+        <h1 style="margin-bottom: 0.5rem;">
+            {svg_icons['brain']} Hire Helper
+        </h1>
+        <div class="subtitle" style="position: relative;">
+            Your AI-powered interview preparation companion
+            <div style="position: absolute; top: -20px; right: -20px; animation: float 3s ease-in-out infinite;">
+                {svg_icons['sparkles']}
+            </div>
+        </div>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    api_key_panel(env_keys)
+    api_keys_dict = st.session_state.api_keys
+    available_providers = [provider for provider, key in api_keys_dict.items() if key]
+    if not available_providers:
+        st.stop()
+
+    # Key health, from the per-key cache; only new or expired keys are probed
+    if available_providers:
+        key_results = validate_keys({p: api_keys_dict[p] for p in available_providers})
+        st.sidebar.markdown("### API Keys")
+        for provider in available_providers:
+            result = key_results[provider]
+            icon = {"valid": "✅", "rate_limited": "⏳", "invalid": "❌"}.get(
+                result["status"], "⚠️"
+            )
+            st.sidebar.caption(f"{icon} **{provider}:** {result['message']}")
+
+    # Reuse the structured index of an already processed upload for estimates
+    resume_index = None
+    prefetched = get_prefetch(st.session_state.get("prefetch_key"))
+    if prefetched is not None and prefetched.extract.done():
+        prefetched_text = prefetched.extracted_text()
+        if prefetched_text:
+            resume_index = get_resume_index(prefetched_text)
+
     is_mobile = st.checkbox(
         "Mobile view", value=False, help="Check this for better mobile experience"
     )
@@ -1255,8 +833,15 @@ def main():
                     help="Remove the uploaded resume file",
                 ):
                     # Clear the file uploader by incrementing the key
+                    cancel_prefetch(st.session_state.pop("prefetch_key", None))
                     st.session_state.file_uploader_key += 1
                     st.rerun()
+                st.checkbox(
+                    "Prepare resume with AI on upload",
+                    value=True,
+                    key="prefetch_format",
+                    help="Extract and format your resume in the background while you fill in the rest",
+                )
 
             # Model selection for mobile
             col1, col2 = st.columns(2)
@@ -1272,43 +857,22 @@ def main():
             with col2:
                 model_name = st.selectbox(
                     "Model",
-                    options=model_options.get(model_provider, []),
+                    options=available_models(
+                        model_provider,
+                        api_keys_dict.get(model_provider),
+                        model_options.get(model_provider, []),
+                    ),
                     index=0,
                     key="mobile_model",
                     help="Choose the specific model",
                 )
+                if model_name is None:
+                    st.error(no_usable_models(model_provider))
+                    st.stop()
 
                 if model_name in model_descriptions:
                     st.caption(model_descriptions[model_name])
 
-                # Show cost estimation in mobile
-                if st.checkbox(
-                    "Show Cost Estimates",
-                    help="Estimate costs for your current configuration",
-                    key="mobile_cost_check",
-                ):
-                    # Get rough estimates for cost calculation
-                    estimated_resume_length = (
-                        2000  # Average resume length in characters
-                    )
-                    num_questions = len(
-                        [q for q in st.session_state.questions if q.strip()]
-                    )
-
-                    if num_questions > 0:
-                        estimated_cost = estimate_cost(
-                            model_provider,
-                            model_name,
-                            estimated_resume_length,
-                            num_questions,
-                            word_limit if "word_limit" in locals() else 100,
-                        )
-
-                        st.info(f"**Estimated Cost:** {estimated_cost}")
-                        st.caption(
-                            "*Based on average resume size and current questions*"
-                        )
-
         col1, col2 = st.columns(2)
         with col1:
             role = st.text_input(
@@ -1319,6 +883,13 @@ def main():
                 "Target Company", placeholder="e.g., Innovatech Solutions"
             )
 
+        company_website_mobile = st.text_input(
+            "Company website (optional)",
+            placeholder="e.g., innovatech.com",
+            key="company_website_mobile",
+            help="Used for company research; guessed from the company name if empty",
+        )
+
         user_additional_company_info_mobile = st.text_area(
             "What else do you know about the company?",
             placeholder="e.g., Their recent projects, company culture, specific challenges...",
@@ -1327,47 +898,7 @@ def main():
         )
 
         with st.expander("Interview Questions", expanded=True):
-            if "questions" not in st.session_state:
-                st.session_state.questions = [""]
-
-            def add_question_field():
-                st.session_state.questions.append("")
-
-            def remove_question_field(index):
-                if len(st.session_state.questions) > 1:
-                    st.session_state.questions.pop(index)
-                else:
-                    st.session_state.questions[index] = ""
-
-            for i, q_text in enumerate(st.session_state.questions):
-                cols = st.columns([0.85, 0.15])
-                st.session_state.questions[i] = cols[0].text_area(
-                    f"Question {i+1}",
-                    value=q_text,
-                    key=f"question_{i}",
-                    height=80,
-                    placeholder=f"Enter your interview question {i+1}...",
-                )
-                if len(st.session_state.questions) > 1:
-                    cols[1].button(
-                        "Remove",
-                        key=f"remove_q_{i}",
-                        on_click=remove_question_field,
-                        args=(i,),
-                        help="Remove this question",
-                    )
-
-            col1, col2 = st.columns([1, 1])
-            with col1:
-                st.button(
-                    "Add Question",
-                    on_click=add_question_field,
-                    use_container_width=True,
-                )
-            with col2:
-                word_limit = st.number_input(
-                    "Word limit", min_value=20, max_value=500, value=100, step=10
-                )
+            question_editor(True, model_provider, model_name, resume_index)
 
             generate_clicked = st.button(
                 "Generate Answers", use_container_width=True, type="primary"
@@ -1402,8 +933,15 @@ def main():
                 help="Remove the uploaded resume file",
             ):
                 # Clear the file uploader by incrementing the key
+                cancel_prefetch(st.session_state.pop("prefetch_key", None))
                 st.session_state.file_uploader_key += 1
                 st.rerun()
+            st.sidebar.checkbox(
+                "Prepare resume with AI on upload",
+                value=True,
+                key="prefetch_format",
+                help="Extract and format your resume in the background while you fill in the rest",
+            )
 
         # Model selection for desktop
         model_provider = st.sidebar.selectbox(
@@ -1416,43 +954,34 @@ def main():
 
         model_name = st.sidebar.selectbox(
             "Model",
-            options=model_options.get(model_provider, []),
+            options=available_models(
+                model_provider,
+                api_keys_dict.get(model_provider),
+                model_options.get(model_provider, []),
+            ),
             index=0,
             key="desktop_model",
             help="Choose the specific model",
         )
+        if model_name is None:
+            st.sidebar.error(no_usable_models(model_provider))
+            st.stop()
 
         if model_name in model_descriptions:
             st.sidebar.caption(model_descriptions[model_name])
 
-        # Show cost estimation in sidebar
-        if st.sidebar.checkbox(
-            "Show Cost Estimates", help="Estimate costs for your current configuration"
-        ):
-            # Get rough estimates for cost calculation
-            estimated_resume_length = 2000  # Average resume length in characters
-            num_questions = len([q for q in st.session_state.questions if q.strip()])
-
-            if num_questions > 0:
-                estimated_cost = estimate_cost(
-                    model_provider,
-                    model_name,
-                    estimated_resume_length,
-                    num_questions,
-                    word_limit if "word_limit" in locals() else 100,
-                )
-
-                st.sidebar.info(f"**Estimated Cost:** {estimated_cost}")
-                st.sidebar.caption(
-                    "*Based on average resume size and current questions*"
-                )
-
         role = st.sidebar.text_input(
             "Target Role", placeholder="e.g., Senior Software Engineer"
         )
         company = st.sidebar.text_input(
             "Target Company", placeholder="e.g., Innovatech Solutions"
         )
+        company_website_desktop = st.sidebar.text_input(
+            "Company website (optional)",
+            placeholder="e.g., innovatech.com",
+            key="company_website_desktop",
+            help="Used for company research; guessed from the company name if empty",
+        )
         user_additional_company_info_desktop = st.sidebar.text_area(
             "What else do you know about the company?",
             placeholder="e.g., Their recent projects, company culture, specific challenges...",
@@ -1460,67 +989,120 @@ def main():
             key="user_info_desktop",
         )
 
-        st.sidebar.markdown("### Interview Questions")
-
-        if "questions" not in st.session_state:
-            st.session_state.questions = [""]
-
-        def add_question_field():
-            st.session_state.questions.append("")
-
-        def remove_question_field(index):
-            if len(st.session_state.questions) > 1:
-                st.session_state.questions.pop(index)
-            else:
-                st.session_state.questions[index] = ""
-
-        for i, q_text in enumerate(st.session_state.questions):
-            cols = st.sidebar.columns([0.85, 0.15])
-            st.session_state.questions[i] = cols[0].text_area(
-                f"Question {i+1}",
-                value=q_text,
-                key=f"question_{i}",
-                height=80,
-                placeholder=f"Enter your interview question {i+1}...",
-            )
-            if len(st.session_state.questions) > 1:
-                cols[1].button(
-                    "×",
-                    key=f"remove_q_{i}",
-                    on_click=remove_question_field,
-                    args=(i,),
-                    help="Remove this question",
-                )
-
-        st.sidebar.button(
-            "Add Question", on_click=add_question_field, use_container_width=True
-        )
-
-        word_limit = st.sidebar.number_input(
-            "Word limit per answer",
-            min_value=20,
-            max_value=500,
-            value=100,
-            step=10,
-            help="Maximum words per generated answer",
-        )
+        with st.sidebar:
+            st.markdown("### Interview Questions")
+            question_editor(False, model_provider, model_name, resume_index)
 
         generate_clicked = st.sidebar.button(
             "Generate Answers", use_container_width=True, type="primary"
         )
 
+    word_limit = st.session_state.word_limit
+    max_concurrency = st.session_state.max_concurrency
+    variants = st.session_state.variants
+    use_library = st.session_state.use_library
+    use_warmup = st.session_state.warmup
+
     if is_mobile:
         user_additional_company_info = user_additional_company_info_mobile
+        company_website = company_website_mobile
         model_provider = st.session_state.mobile_provider
         model_name = st.session_state.mobile_model
     else:
         user_additional_company_info = user_additional_company_info_desktop
+        company_website = company_website_desktop
         model_provider = st.session_state.desktop_provider
         model_name = st.session_state.desktop_model
 
-    if generate_clicked:
+    # Start processing the resume as soon as it is uploaded, keyed by content hash
+    prefetch_job = None
+    if uploaded_resume:
+        prefetch_job = prefetch_resume(
+            uploaded_resume.getvalue(),
+            uploaded_resume.name,
+            format_with=(
+                (model_provider, model_name, api_keys_dict)
+                if st.session_state.get("prefetch_format", True)
+                else None
+            ),
+        )
+        if st.session_state.get("prefetch_key") != prefetch_job.key:
+            cancel_prefetch(st.session_state.get("prefetch_key"))
+            st.session_state.prefetch_key = prefetch_job.key
+    elif "prefetch_key" in st.session_state:
+        cancel_prefetch(st.session_state.pop("prefetch_key"))
+
+    # Opt-in warm-up of common questions into the answer cache, once the
+    # inputs that shape the answers are known
+    if (
+        use_warmup
+        and prefetch_job is not None
+        and role.strip()
+        and company.strip()
+        and not generate_clicked
+    ):
+        warmup_job = warm_up(
+            prefetch_job,
+            st.session_state.setdefault("session_id", uuid.uuid4().hex),
+            session=st.session_state.setdefault("spend", new_spend()),
+            role=role,
+            company=company,
+            company_website=company_website,
+            company_info=user_additional_company_info,
+            word_limit=word_limit,
+            model_provider=model_provider,
+            model_name=model_name,
+            api_keys_dict=api_keys_dict,
+        )
+        if st.session_state.get("warmup_key") != warmup_job.key:
+            cancel_warmup(st.session_state.get("warmup_key"))
+            st.session_state.warmup_key = warmup_job.key
+        status = f"Common questions ready: {warmup_job.done} of {len(COMMON_QUESTIONS)}"
+        if warmup_job.resume == "preparing":
+            status += " (preparing your resume first)"
+        elif warmup_job.resume == "missing":
+            status = (
+                "Common questions not pre-generated: warm-up needs your resume "
+                "text, prepared with AI for PDF and DOCX, and it couldn't be "
+                "read or prepared"
+            )
+        elif warmup_job.stopped_by:
+            status += " (warm-up stopped at its spend cap)"
+        (st if is_mobile else st.sidebar).caption(status)
+    elif "warmup_key" in st.session_state:
+        # Inputs incomplete, warm-up switched off or the user's own run starting
+        cancel_warmup(st.session_state.pop("warmup_key"))
+
+    # A card's Regenerate button asks for a fresh answer to just that question
+    regenerate = st.session_state.pop("regenerate", None)
+    previous_answers = st.session_state.get("results", {}).get("answers", [])
+    if regenerate is not None and regenerate >= len(previous_answers):
+        regenerate = None
+    # Regenerating uses the inputs of the run the answer belongs to, not the
+    # sidebar's current ones
+    run_inputs = (
+        st.session_state.results.get("inputs") if regenerate is not None else None
+    )
+    if run_inputs:
+        role, company = run_inputs["role"], run_inputs["company"]
+        company_website = run_inputs["company_website"]
+        user_additional_company_info = run_inputs["company_info"]
+        word_limit = run_inputs["word_limit"]
+        model_provider, model_name = run_inputs["provider"], run_inputs["model"]
+        variants = run_inputs.get("variants") or 1
+
+    if generate_clicked or regenerate is not None:
         if not uploaded_resume:
             st.warning("Please upload your resume to proceed.")
+        elif (
+            run_inputs
+            and hashlib.sha256(uploaded_resume.getvalue()).hexdigest()
+            != run_inputs["resume_hash"]
+        ):
+            st.warning(
+                "These answers were generated from a different resume. Upload "
+                "that resume again to regenerate one of them."
+            )
         elif not role.strip():
             st.warning("Please specify the target role.")
         elif not company.strip():
@@ -1546,95 +1128,296 @@ def main():
                     </div>
                     <p style="margin-top: 1rem; color: var(--text-secondary);">AI is working on your personalized responses...</p>
                 </div>
-                <style>
-                @keyframes spin {
-                    0% { transform: rotate(0deg); }
-                    100% { transform: rotate(360deg); }
-                }
-                </style>
                 """,
                     unsafe_allow_html=True,
                 )
+                run_clock = st.empty()
+                # Any rerun stops the run; this button is just the explicit way
+                st.button(
+                    "Cancel",
+                    key="cancel_generation",
+                    help="Stop generating; answers that already arrived are kept",
+                )
 
             try:
 
-                status_text.markdown("**Step 1:** Processing your resume...")
-                progress_bar.progress(20)
+                status_text.markdown(
+                    f"**Step 1–3:** Processing your resume and researching {company}..."
+                )
+                progress_bar.progress(10)
 
                 resume_bytes = uploaded_resume.read()
-                raw_resume_text = process_document(resume_bytes, uploaded_resume.name)
-
-                if not raw_resume_text:
+                file_extension = os.path.splitext(uploaded_resume.name)[1].lower()
+                inputs_used = {
+                    "role": role,
+                    "company": company,
+                    "company_website": company_website,
+                    "company_info": user_additional_company_info,
+                    "word_limit": word_limit,
+                    "provider": model_provider,
+                    "model": model_name,
+                    "variants": variants,
+                    "resume_hash": hashlib.sha256(resume_bytes).hexdigest(),
+                }
+                valid_questions = (
+                    [previous_answers[regenerate]["question"]]
+                    if regenerate is not None
+                    else [
+                        canonical_question(q.strip()) if use_warmup else q.strip()
+                        for q in st.session_state.questions
+                        if q.strip()
+                    ]
+                )
+                if not valid_questions:
+                    st.warning("Please ensure at least one question is filled out.")
                     st.stop()
 
-                progress_bar.progress(40)
-                resume_text = raw_resume_text
-                file_extension = os.path.splitext(uploaded_resume.name)[1].lower()
+                def extract_stage(inputs):
+                    if prefetch_job is not None:
+                        raw_resume_text = prefetch_job.extracted_text()
+                        if raw_resume_text is not None:
+                            return raw_resume_text
+                    return process_document(resume_bytes, uploaded_resume.name)
+
+                def format_stage(inputs):
+                    raw_resume_text = inputs["extract"]
+                    if not raw_resume_text or not raw_resume_text.strip():
+                        return raw_resume_text
+                    if file_extension not in [".pdf", ".docx"]:
+                        return raw_resume_text
+                    if prefetch_job is not None:
+                        resume_text = prefetch_job.formatted_text(
+                            model_provider, model_name
+                        )
+                        # Formatting falls back to the raw text on errors; redo it
+                        # here so the error is reported to the user.
+                        if resume_text and resume_text != raw_resume_text:
+                            return resume_text
+                    resume_text = format_resume_text_with_llm(
+                        raw_resume_text, model_provider, model_name, api_keys_dict
+                    )
+                    return resume_text if resume_text.strip() else None
+
+                research_errors = []
+
+                def research_stage(inputs):
+                    if not company.strip():
+                        return []
+                    return get_company_research(
+                        company,
+                        api_keys_dict,
+                        website=company_website.strip(),
+                        on_error=research_errors.append,
+                    )
+
+                # Session spend is kept across runs for the per-session caps
+                run_budget = Budget(
+                    model_provider,
+                    model_name,
+                    session=st.session_state.setdefault("spend", new_spend()),
+                )
+
+                # Filled as answers arrive, so a cancelled run keeps them
+                arrived = {}
+                run_started = time.perf_counter()
+
+                async def answers_stage(inputs):
+                    resume_text = inputs["format"] or inputs["extract"]
+                    if not resume_text or not resume_text.strip():
+                        return None
+                    return await generate_answers_async(
+                        resume_text,
+                        role,
+                        company,
+                        valid_questions,
+                        word_limit,
+                        model_provider,
+                        model_name,
+                        api_keys_dict,
+                        user_additional_company_info,
+                        inputs["research"],
+                        max_concurrency=max_concurrency,
+                        budget=run_budget,
+                        reuse=regenerate is None,
+                        variants=variants,
+                        library=get_answer_library() if use_library else None,
+                        resume_hash=inputs_used["resume_hash"],
+                        on_answer=arrived.__setitem__,
+                    )
 
-                if file_extension in [".pdf", ".docx"]:
-                    if raw_resume_text.strip():
+                stage_labels = {
+                    "extract": "Resume processed",
+                    "format": "Resume formatted",
+                    "research": f"{company} researched",
+                    "answers": "Answers crafted",
+                }
+                completed_stages = []
+
+                def on_stage_done(name, result):
+                    completed_stages.append(name)
+                    progress_bar.progress(min(10 + 22 * len(completed_stages), 100))
+                    if (
+                        name in ("format", "research")
+                        and "answers" not in completed_stages
+                    ):
                         status_text.markdown(
-                            "**Step 2:** AI is formatting your resume..."
-                        )
-                        progress_bar.progress(60)
-                        resume_text = format_resume_text_with_llm(
-                            raw_resume_text, model_provider, model_name, api_keys_dict
+                            f"**{stage_labels[name]}** — "
+                            "AI is crafting your personalized answers..."
                         )
-                        if not resume_text.strip():
-                            st.warning(
-                                "⚠️ Formatting resulted in empty resume text, using raw extracted text."
-                            )
-                            resume_text = raw_resume_text
-                    else:
+
+                def show_progress():
+                    # Drawing here is also what lets Streamlit interrupt the wait
+                    run_clock.caption(
+                        f"{len(arrived)} of {len(valid_questions)} answers ready · "
+                        f"{time.perf_counter() - run_started:.1f}s"
+                    )
+
+                try:
+                    stage_results, stage_timings = run_pipeline(
+                        [
+                            Stage("extract", extract_stage),
+                            Stage("format", format_stage, deps=["extract"]),
+                            Stage("research", research_stage),
+                            Stage(
+                                "answers", answers_stage, deps=["format", "research"]
+                            ),
+                        ],
+                        on_stage_done=on_stage_done,
+                        poll=show_progress,
+                    )
+                except Exception:
+                    raise
+                except BaseException:
+                    # Cancel, changed inputs or a closed session stopped the run
+                    # (the requests in flight were aborted); keep what arrived
+                    if arrived and regenerate is None:
+                        st.session_state.pop("results_page", None)
+                        st.session_state.results = {
+                            "answers": [
+                                arrived.get(i)
+                                or {
+                                    "question": q,
+                                    "answer": "Cancelled before an answer arrived.",
+                                    "cancelled": True,
+                                }
+                                for i, q in enumerate(valid_questions)
+                            ],
+                            "role": role,
+                            "company": company,
+                            "run_id": None,
+                            "inputs": inputs_used,
+                            "cancelled": True,
+                        }
+                    raise
+
+                raw_resume_text = stage_results["extract"]
+                if not raw_resume_text:
+                    progress_container.empty()
+                    if raw_resume_text is not None:
                         st.warning(
                             f"⚠️ No text could be extracted from {uploaded_resume.name}."
                         )
-                        st.stop()
-
-                if not resume_text.strip():
-                    st.error(
-                        "After processing, the resume text is empty. Cannot proceed."
-                    )
                     st.stop()
+                if stage_results["format"] is None:
+                    st.warning(
+                        "⚠️ Formatting resulted in empty resume text, using raw extracted text."
+                    )
 
-                status_text.markdown(f"**Step 3:** Researching {company}...")
-                progress_bar.progress(70)
-                company_research_data = ""
-                if company.strip():
-                    company_research_data = get_company_research(company, api_keys_dict)
-
+                for error in research_errors:
+                    st.warning(
+                        f"⚠️ {error}. Answers were written without company research."
+                    )
+                company_research_data = stage_results["research"]
                 if company_research_data and company.strip():
                     with st.expander(
                         f"Initial Research Findings for {company}",
                         expanded=False,
                     ):
-                        st.markdown(company_research_data)
+                        st.markdown(format_research(company_research_data))
 
-                status_text.markdown(
-                    "**Step 4:** AI is crafting your personalized answers..."
-                )
-                progress_bar.progress(90)
-
-                valid_questions = [
-                    q.strip() for q in st.session_state.questions if q.strip()
-                ]
-                if not valid_questions:
-                    st.warning("Please ensure at least one question is filled out.")
+                answers = stage_results["answers"]
+                if answers is None:
+                    progress_container.empty()
+                    st.error(
+                        "After processing, the resume text is empty. Cannot proceed."
+                    )
                     st.stop()
+                if regenerate is not None:
+                    answers = (
+                        previous_answers[:regenerate]
+                        + answers
+                        + previous_answers[regenerate + 1 :]
+                    )
+                else:
+                    from_library = [a for a in answers if a.get("library")]
+                    if from_library:
+                        library_stats = get_answer_library().stats(
+                            inputs_used["resume_hash"]
+                        )
+                        st.info(
+                            f"📚 {len(from_library)} answer"
+                            f"{'s' if len(from_library) != 1 else ''} came from "
+                            "your answer library. Library hit rate: "
+                            f"{library_stats['hit_rate']:.0%} of "
+                            f"{library_stats['lookups']} lookups "
+                            f"({library_stats['answers']} saved answers)."
+                        )
+                    reused = sum(1 for a in answers if a.get("reused"))
+                    if reused:
+                        st.info(
+                            f"♻️ Reused {reused} unchanged answer"
+                            f"{'s' if reused != 1 else ''} from earlier runs; "
+                            f"{len(answers) - reused} sent to the model."
+                        )
 
-                answers = generate_answers(
-                    resume_text,
-                    role,
-                    company,
-                    valid_questions,
-                    word_limit,
-                    model_provider,
-                    model_name,
-                    api_keys_dict,
-                    user_additional_company_info,
-                    company_research_data,
-                )
+                skipped = [a for a in answers if a.get("skipped")]
+                if skipped:
+                    st.warning(
+                        f"⚠️ Spend cap reached: {len(skipped)} of {len(answers)} "
+                        "questions were skipped and not sent to the model. "
+                        f"{skipped[0]['answer']} Answers generated before the cap "
+                        "are shown below."
+                    )
 
+                context_rows = [a for a in answers if "context_tokens" in a]
+                if context_rows:
+                    with st.expander("Research context per question", expanded=False):
+                        st.table(
+                            {
+                                "Question": [a["question"][:60] for a in context_rows],
+                                "Context tokens": [
+                                    a["context_tokens"] for a in context_rows
+                                ],
+                                "Tokens saved": [
+                                    a["context_tokens_saved"] for a in context_rows
+                                ],
+                            }
+                        )
+                        st.caption(
+                            f"Sent {sum(a['context_tokens'] for a in context_rows):,} "
+                            "research tokens instead of "
+                            f"{sum(a['context_tokens'] + a['context_tokens_saved'] for a in context_rows):,} "
+                            "by including only relevant snippets per question"
+                        )
+
+                timing_summary = summarize_timings(stage_timings)
+                with st.expander("Pipeline timings", expanded=False):
+                    st.table(
+                        {
+                            "Stage": list(stage_timings),
+                            "Started at (s)": [
+                                f"{t['start']:.2f}" for t in stage_timings.values()
+                            ],
+                            "Wall time (s)": [
+                                f"{t['wall']:.2f}" for t in stage_timings.values()
+                            ],
+                        }
+                    )
+                    st.caption(
+                        f"Pipelined: {timing_summary['pipelined']:.2f}s vs "
+                        f"{timing_summary['sequential']:.2f}s back to back "
+                        f"(saved {timing_summary['saved']:.2f}s on the critical path)"
+                    )
                 progress_bar.progress(100)
                 status_text.markdown("**Complete!** Your answers are ready")
 
@@ -1642,130 +1425,45 @@ def main():
                 progress_container.empty()
 
                 if answers:
-                    st.markdown(
-                        f"""
-                    <div style="text-align: center; margin: 2rem 0; padding: 2rem; background: var(--glass-bg); 
-                         backdrop-filter: var(--backdrop-blur); border-radius: var(--border-radius-large); 
-                         border: 2px solid var(--success);">
-                        <div style="font-size: 3rem; margin-bottom: 1rem;">{svg_icons['check']}</div>
-                        <h2 style="color: var(--success); margin: 0;">Your personalized interview answers are ready!</h2>
-                        <p style="color: var(--text-secondary); margin-top: 0.5rem;">
-                            Tailored specifically for {role} at {company}
-                        </p>
-                    </div>
-                    """,
-                        unsafe_allow_html=True,
-                    )
-
-                    # Enhanced JavaScript for clipboard functionality
-                    copy_js = (
-                        """
-                    function copyToClipboard(textToCopy, buttonId) {
-                        const fallbackCopy = (text) => {
-                            const textArea = document.createElement("textarea");
-                            textArea.value = text;
-                            textArea.style.top = "0";
-                            textArea.style.left = "0";
-                            textArea.style.position = "fixed";
-                            document.body.appendChild(textArea);
-                            textArea.focus();
-                            textArea.select();
-
-                            let success = false;
-                            try {
-                                success = document.execCommand('copy');
-                            } catch (err) {
-                                console.error('Fallback: Unable to copy', err);
-                            }
-
-                            document.body.removeChild(textArea);
-                            return Promise.resolve(success);
-                        };
-
-                        const button = document.getElementById(buttonId);
-                        if (!button) return;
-                        const originalText = button.innerHTML;
-                        const originalClass = button.className;
-
-                        if (!navigator.clipboard) {
-                            fallbackCopy(textToCopy).then((success) => {
-                                if (success) {
-                                    button.innerHTML = '"""
-                        + svg_icons["check"]
-                        + """ Copied!';
-                                    button.className = originalClass + ' copy-button-copied';
-                                    setTimeout(() => { 
-                                        button.innerHTML = originalText; 
-                                        button.className = originalClass;
-                                    }, 2000);
-                                } else {
-                                    alert('Failed to copy text. Please copy manually.');
-                                }
-                            });
-                            return;
-                        }
-
-                        navigator.clipboard.writeText(textToCopy).then(() => {
-                            button.innerHTML = '"""
-                        + svg_icons["check"]
-                        + """ Copied!';
-                            button.className = originalClass + ' copy-button-copied';
-                            setTimeout(() => { 
-                                button.innerHTML = originalText; 
-                                button.className = originalClass;
-                            }, 2000);
-                        }).catch(err => {
-                            console.error('Clipboard API failed: ', err);
-                            fallbackCopy(textToCopy).then((success) => {
-                                if (success) {
-                                    button.innerHTML = '"""
-                        + svg_icons["check"]
-                        + """ Copied!';
-                                    button.className = originalClass + ' copy-button-copied';
-                                    setTimeout(() => { 
-                                        button.innerHTML = originalText; 
-                                        button.className = originalClass;
-                                    }, 2000);
-                                } else {
-                                    alert('Failed to copy text. Please copy manually.');
-                                }
-                            });
-                        });
+                    spent = {
+                        "cost": run_budget.spent["run"]["cost"],
+                        "tokens": run_budget.spent["run"]["tokens"],
+                        "duration": timing_summary["pipelined"],
                     }
-                    """
-                    )
-                    st.markdown(f"<script>{copy_js}</script>", unsafe_allow_html=True)
-
-                    for i, item in enumerate(answers, start=1):
-                        # Ensure text is properly escaped for JS
-                        answer_text_json = json.dumps(item["answer"])
-                        button_id = f"copy_button_{i}"
-
-                        st.markdown(
-                            f"""<div class="answer-card">
-                                <div class="question-header">
-                                    <span>Question {i}</span>
-                                </div>
-                                <div style="color: var(--text-accent); margin-bottom: 1.5rem; font-style: italic; 
-                                     font-size: 1.1rem; line-height: 1.6; padding: 1rem; 
-                                     background: rgba(99, 102, 241, 0.1); border-radius: var(--border-radius-small); 
-                                     border-left: 4px solid var(--primary-color);">
-                                    "{item['question']}"
-                                </div>
-                                <div class="answer-text">
-                                    <strong style="color: var(--primary-light); font-size: 1.1rem;">Your Answer:</strong><br><br>
-                                    {item['answer']}
-                                </div>
-                                <button id="{button_id}" class="copy-button" onclick='copyToClipboard({answer_text_json}, "{button_id}")'>
-                                    {svg_icons['copy']} Copy Answer
-                                </button>
-                            </div>""",
-                            unsafe_allow_html=True,
+                    if regenerate is None:
+                        run_id = history.save_run(
+                            {
+                                **inputs_used,
+                                "questions": [a["question"] for a in answers],
+                                "resume_name": uploaded_resume.name,
+                                "answers": answers,
+                                "timings": stage_timings,
+                                **spent,
+                            }
                         )
-                        # Add some space after each card
-                        st.markdown("<br>", unsafe_allow_html=True)
-
+                        st.session_state.pop("results_page", None)
+                    else:
+                        # Splice the new answer into the run being edited
+                        run_id = st.session_state.results.get("run_id")
+                        record = (
+                            history.load_run(run_id, inputs_used["resume_hash"])
+                            if run_id is not None
+                            else None
+                        )
+                        if record is not None:
+                            record["answers"] = answers
+                            for key, value in spent.items():
+                                record[key] += value
+                            history.update_run(run_id, record)
+                    st.session_state.results = {
+                        "answers": answers,
+                        "role": role,
+                        "company": company,
+                        "run_id": run_id,
+                        "inputs": inputs_used,
+                    }
                 else:
+                    st.session_state.pop("results", None)
                     st.info("ℹ️ No questions were provided to generate answers for.")
 
             except Exception as e:
@@ -1773,6 +1471,9 @@ def main():
                 st.error(f"An error occurred during answer generation: {e}")
                 st.error("Please try again or check your inputs.")
 
+    history_view(st.session_state.get("prefetch_key"))
+    results_view()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,159 @@
+import asyncio
+import inspect
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+POLL_SECONDS = 0.25
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+class Stage:
+    """A named unit of work in the generate pipeline and the stages it waits on."""
+
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+def _event_loop():
+    """The event loop pipelines run on, in a daemon thread of its own."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="pipeline-loop", daemon=True
+            ).start()
+        return _loop
+
+
+async def run_pipeline_async(stages, max_workers=4, on_stage_done=None, ctx=None):
+    """Runs stages as a dependency graph, starting each one as soon as its inputs are ready.
+
+    Each stage function is called with a dict of its dependencies' results keyed
+    by stage name. Coroutine functions run on the event loop; plain functions
+    run in a pool of ``max_workers`` threads with the Streamlit context ``ctx``.
+    Returns ``(results, timings)`` where timings maps a stage name to its
+    start/end offsets and wall time in seconds. Cancelling the task cancels the
+    stages in progress; threads finish in the background and are discarded.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(
+                    f"Stage '{stage.name}' depends on unknown stage '{dep}'"
+                )
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    results = {}
+    timings = {}
+    pending = list(stages)
+    running = {}
+    origin = time.perf_counter()
+
+    def call_in_thread(stage, inputs):
+        if ctx is not None:
+            add_script_run_ctx(ctx=ctx)
+        return stage.func(inputs)
+
+    async def timed(stage, inputs):
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(stage.func):
+                return await stage.func(inputs)
+            return await loop.run_in_executor(executor, call_in_thread, stage, inputs)
+        finally:
+            end = time.perf_counter()
+            timings[stage.name] = {
+                "start": start - origin,
+                "end": end - origin,
+                "wall": end - start,
+            }
+
+    try:
+        while pending or running:
+            ready = [s for s in pending if all(d in results for d in s.deps)]
+            for stage in ready:
+                pending.remove(stage)
+                inputs = {dep: results[dep] for dep in stage.deps}
+                running[asyncio.create_task(timed(stage, inputs))] = stage
+
+            if not running:
+                names = ", ".join(s.name for s in pending)
+                raise ValueError(f"Pipeline has a dependency cycle between: {names}")
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = running.pop(task)
+                results[stage.name] = task.result()
+                if on_stage_done:
+                    on_stage_done(stage.name, results[stage.name])
+    finally:
+        for task in running:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, timings
+
+
+def run_pipeline(stages, max_workers=4, on_stage_done=None, poll=None):
+    """Runs run_pipeline_async on the pipeline event loop and waits for it.
+
+    ``on_stage_done`` and ``poll`` are called from the waiting thread, the
+    latter every POLL_SECONDS. In a Streamlit script anything ``poll`` draws
+    lets Streamlit interrupt the wait for a rerun (a button click, changed
+    inputs) or a closed session; the pipeline is then cancelled, aborting the
+    model requests in flight, and the interruption re-raised.
+    """
+    finished = queue.Queue()
+
+    def drain():
+        while not finished.empty():
+            name, result = finished.get()
+            if on_stage_done:
+                on_stage_done(name, result)
+
+    future = asyncio.run_coroutine_threadsafe(
+        run_pipeline_async(
+            stages,
+            max_workers=max_workers,
+            on_stage_done=lambda name, result: finished.put((name, result)),
+            ctx=get_script_run_ctx(),
+        ),
+        _event_loop(),
+    )
+    try:
+        while True:
+            done, _ = wait([future], timeout=POLL_SECONDS)
+            drain()
+            if done:
+                return future.result()
+            if poll:
+                poll()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def summarize_timings(timings):
+    """Compares the pipelined wall time against running the same stages back to back."""
+    if not timings:
+        return {"sequential": 0.0, "pipelined": 0.0, "saved": 0.0}
+    sequential = sum(t["wall"] for t in timings.values())
+    pipelined = max(t["end"] for t in timings.values()) - min(
+        t["start"] for t in timings.values()
+    )
+    return {
+        "sequential": sequential,
+        "pipelined": pipelined,
+        "saved": max(sequential - pipelined, 0.0),
+    }
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from utils import process_document, format_resume_text_with_llm
+
+MAX_PREFETCH_JOBS = 16
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="resume-prefetch")
+_lock = threading.Lock()
+_jobs = OrderedDict()
+
+
+def content_hash(file_bytes):
+    """Returns the hex digest used to key everything derived from a résumé upload."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class PrefetchJob:
+    """Background extraction (and optional formatting) of one uploaded résumé.
+
+    Only the most recently requested model's formatting is kept pending;
+    finished formats are kept for reuse.
+    """
+
+    def __init__(self, key, file_bytes, file_name):
+        self.key = key
+        self.file_name = file_name
+        self.cancelled = threading.Event()
+        self.extract = _executor.submit(self._extract, file_bytes, file_name)
+        self.formats = {}
+        self._format_lock = threading.Lock()
+        self._wanted = None
+
+    def _extract(self, file_bytes, file_name):
+        if self.cancelled.is_set():
+            return None
+        return process_document(file_bytes, file_name)
+
+    def _format(self, model_provider, model_name, api_keys_dict):
+        raw_text = self.extract.result()
+        if self.cancelled.is_set() or not raw_text or not raw_text.strip():
+            return None
+        # The model changed while this waited for extraction; don't pay for it
+        if self._wanted != (model_provider, model_name):
+            return None
+        return format_resume_text_with_llm(
+            raw_text, model_provider, model_name, api_keys_dict
+        )
+
+    def request_format(self, model_provider, model_name, api_keys_dict):
+        """Schedules LLM formatting for this model unless it is already queued,
+        replacing a pending format for another model."""
+        extension = os.path.splitext(self.file_name)[1].lower()
+        if extension not in [".pdf", ".docx"] or self.cancelled.is_set():
+            return
+        format_key = (model_provider, model_name)
+        with self._format_lock:
+            if self._wanted == format_key:
+                return
+            self._wanted = format_key
+            for key, future in list(self.formats.items()):
+                if key != format_key and future.cancel():
+                    del self.formats[key]
+            future = self.formats.get(format_key)
+            # A format dropped earlier because the model changed is redone
+            if future is None or (
+                future.done() and future.exception() is None and future.result() is None
+            ):
+                self.formats[format_key] = _executor.submit(
+                    self._format, model_provider, model_name, dict(api_keys_dict)
+                )
+
+    def extracted_text(self):
+        """Waits for extraction; returns None if it failed or was cancelled."""
+        try:
+            return self.extract.result()
+        except (CancelledError, Exception):
+            return None
+
+    def formatted_text(self, model_provider, model_name):
+        """Waits for formatting with this model; returns None if it was never requested."""
+        future = self.formats.get((model_provider, model_name))
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except (CancelledError, Exception):
+            return None
+
+    def cancel(self):
+        self.cancelled.set()
+        self.extract.cancel()
+        for future in self.formats.values():
+            future.cancel()
+
+
+def prefetch_resume(file_bytes, file_name, format_with=None):
+    """Starts processing an uploaded résumé in the background, keyed by content hash.
+
+    ``format_with`` is an optional ``(model_provider, model_name, api_keys_dict)``
+    tuple; when given, LLM formatting is queued right after extraction.
+    """
+    key = content_hash(file_bytes)
+    with _lock:
+        job = _jobs.get(key)
+        if job is None or job.cancelled.is_set():
+            job = PrefetchJob(key, file_bytes, file_name)
+            _jobs[key] = job
+        _jobs.move_to_end(key)
+        while len(_jobs) > MAX_PREFETCH_JOBS:
+            _, evicted = _jobs.popitem(last=False)
+            evicted.cancel()
+        if format_with:
+            job.request_format(*format_with)
+    return job
+
+
+def get_prefetch(key):
+    """Returns the live prefetch job for a content hash, if any."""
+    with _lock:
+        job = _jobs.get(key)
+    if job is None or job.cancelled.is_set():
+        return None
+    return job
+
+
+def cancel_prefetch(key):
+    """Cancels and forgets the prefetch job for a content hash."""
+    if not key:
+        return
+    with _lock:
+        job = _jobs.pop(key, None)
+    if job is not None:
+        job.cancel()
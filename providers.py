@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+import httpx
+
+PROBE_TIMEOUT = 10.0
+DEFAULT_KEY_TTL = 15 * 60
+# Network errors say nothing about the key; retry those sooner
+ERROR_TTL = 60
+
+HELP_URLS = {
+    "Google": "https://aistudio.google.com/app/apikey",
+    "OpenAI": "https://platform.openai.com/api-keys",
+    "Claude": "https://console.anthropic.com/",
+}
+
+_lock = threading.Lock()
+_results = {}
+
+
+def key_fingerprint(provider, api_key):
+    """Identifies a key in caches without keeping the key itself."""
+    return hashlib.sha256(f"{provider}\x00{api_key}".encode()).hexdigest()[:16]
+
+
+def key_ttl():
+    """Seconds a key check stays valid, from ``HIREHELPER_KEY_CHECK_TTL``."""
+    return float(os.getenv("HIREHELPER_KEY_CHECK_TTL", DEFAULT_KEY_TTL))
+
+
+def _probe_request(provider, api_key):
+    """The provider's model listing endpoint: authenticated, but free of tokens."""
+    if provider == "Google":
+        return (
+            "https://generativelanguage.googleapis.com/v1beta/models?pageSize=1000",
+            {"x-goog-api-key": api_key},
+        )
+    if provider == "OpenAI":
+        return "https://api.openai.com/v1/models", {
+            "Authorization": f"Bearer {api_key}"
+        }
+    if provider == "Claude":
+        return (
+            "https://api.anthropic.com/v1/models?limit=1000",
+            {"x-api-key": api_key, "anthropic-version": "2023-06-01"},
+        )
+    raise ValueError(f"Unsupported provider: {provider}")
+
+
+def _result(status, message, models=None):
+    return {
+        "valid": status in ("valid", "rate_limited"),
+        "status": status,
+        "message": message,
+        "models": models,
+        "checked_at": time.time(),
+    }
+
+
+def parse_model_list(provider, payload):
+    """Model ids a listing response says the key can use for generation."""
+    if provider == "Google":
+        return sorted(
+            model["name"].removeprefix("models/")
+            for model in payload.get("models", [])
+            if "generateContent" in model.get("supportedGenerationMethods", [])
+        )
+    return sorted(model["id"] for model in payload.get("data", []))
+
+
+async def _probe(client, provider, api_key):
+    try:
+        url, headers = _probe_request(provider, api_key)
+        response = await client.get(url, headers=headers)
+    except ValueError as e:
+        return _result("error", str(e))
+    except httpx.HTTPError as e:
+        return _result("error", f"Connection error: {str(e)[:100]}")
+    if response.status_code == 200:
+        try:
+            models = parse_model_list(provider, response.json())
+        except (ValueError, KeyError, TypeError, AttributeError):
+            models = None
+        return _result("valid", "API key is valid", models)
+    if response.status_code == 429:
+        return _result("rate_limited", "Rate limited (but key is likely valid)")
+    if response.status_code in (400, 401, 403):
+        # Google answers 400 "API key not valid" for malformed keys
+        return _result(
+            "invalid", f"Invalid API key (check it at {HELP_URLS[provider]})"
+        )
+    return _result("error", f"Unexpected response: HTTP {response.status_code}")
+
+
+def cached_key_status(provider, api_key):
+    """Returns the cached check of this key if it is still fresh, else None."""
+    with _lock:
+        result = _results.get(key_fingerprint(provider, api_key))
+    if result is None:
+        return None
+    ttl = key_ttl() if result["status"] != "error" else ERROR_TTL
+    return result if time.time() - result["checked_at"] < ttl else None
+
+
+async def validate_keys_async(api_keys_dict, force=False, client=None):
+    """Checks every configured key concurrently; fresh cached results are reused.
+
+    Returns ``{provider: {"valid", "status", "message", "models", "checked_at"}}``
+    where status is valid, rate_limited, invalid or error, and models lists the
+    model ids the key can use (None when the listing wasn't available). Pass an
+    ``httpx.AsyncClient`` with a stub transport to run without the network.
+    """
+    results = {}
+    pending = []
+    for provider, api_key in api_keys_dict.items():
+        if not api_key:
+            continue
+        cached = None if force else cached_key_status(provider, api_key)
+        if cached is not None:
+            results[provider] = cached
+        else:
+            pending.append((provider, api_key))
+    if not pending:
+        return results
+
+    async def run(client):
+        return await asyncio.gather(
+            *(_probe(client, provider, api_key) for provider, api_key in pending)
+        )
+
+    if client is not None:
+        probed = await run(client)
+    else:
+        async with httpx.AsyncClient(timeout=PROBE_TIMEOUT) as own_client:
+            probed = await run(own_client)
+    with _lock:
+        for (provider, api_key), result in zip(pending, probed):
+            _results[key_fingerprint(provider, api_key)] = result
+            results[provider] = result
+    return results
+
+
+def validate_keys(api_keys_dict, force=False):
+    """Synchronous wrapper around validate_keys_async for the Streamlit script."""
+    return asyncio.run(validate_keys_async(api_keys_dict, force=force))
+
+
+def available_models(provider, api_key, known):
+    """Filters ``known`` model names to those the key's cached catalogue lists.
+
+    Falls back to ``known`` while the catalogue is unknown (not checked yet,
+    rate limited or unparsable). Once it is known the result may be empty:
+    none of the known models would work with this key.
+    """
+    result = cached_key_status(provider, api_key) if api_key else None
+    if not result or result["models"] is None:
+        return list(known)
+    listed = set(result["models"])
+    return [model for model in known if model in listed]
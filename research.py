@@ -0,0 +1,532 @@
+import asyncio
+import hashlib
+import ipaddress
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from html.parser import HTMLParser
+from urllib.parse import quote_plus, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+USER_AGENT = "HireHelperResearch/0.1 (+https://github.com/tashifkhan/hirehelper)"
+PAGE_PATHS = ["/", "/about", "/about-us", "/company", "/careers", "/blog", "/news"]
+FEED_PATHS = ["/feed", "/rss", "/rss.xml", "/feed.xml", "/atom.xml", "/blog/rss.xml"]
+NEWS_FEEDS = ["https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"]
+
+MAX_CONNECTIONS = 20
+PER_HOST_CONCURRENCY = 4
+REQUEST_TIMEOUT = 10.0
+RESEARCH_DEADLINE = 25.0
+MAX_PAGE_BYTES = 2_000_000
+MAX_REDIRECTS = 5
+MAX_FEED_ITEMS = 10
+MAX_REFRESH_HISTORY = 50
+
+SKIP_TAGS = {
+    "script",
+    "style",
+    "noscript",
+    "svg",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "form",
+    "template",
+    "iframe",
+}
+BLOCK_TAGS = {
+    "p",
+    "div",
+    "section",
+    "article",
+    "main",
+    "li",
+    "br",
+    "tr",
+    "blockquote",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+}
+FEED_TYPES = {"application/rss+xml", "application/atom+xml", "application/feed+json"}
+FEED_LABELS = {"news": "Recent news", "feed": "Latest posts"}
+
+_history_lock = threading.Lock()
+_refresh_history = deque(maxlen=MAX_REFRESH_HISTORY)
+
+
+class _MainTextParser(HTMLParser):
+    """Collects visible text, preferring <main>/<article> content when present."""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title = ""
+        self.feeds = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._in_title = False
+        self._all = []
+        self._main = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and attrs.get("type") in FEED_TYPES and attrs.get("href"):
+            if "alternate" in (attrs.get("rel") or "").lower():
+                self.feeds.append(urljoin(self.base_url, attrs["href"]))
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in ("main", "article"):
+            self._main_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        if tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in ("main", "article") and self._main_depth:
+            self._main_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._append(data)
+
+    def _append(self, text):
+        self._all.append(text)
+        if self._main_depth:
+            self._main.append(text)
+
+    def text(self):
+        chunks = self._main if "".join(self._main).strip() else self._all
+        lines = (
+            re.sub(r"\s+", " ", line).strip() for line in "".join(chunks).split("\n")
+        )
+        return "\n".join(line for line in lines if line)
+
+
+def extract_main_text(html, base_url=""):
+    """Returns ``(title, text, feed_urls)`` for an HTML page."""
+    parser = _MainTextParser(base_url)
+    parser.feed(html)
+    parser.close()
+    return parser.title.strip(), parser.text(), parser.feeds
+
+
+def _strip_html(text):
+    if "<" not in (text or ""):
+        return (text or "").strip()
+    return extract_main_text(text)[1]
+
+
+def parse_feed(xml_text, limit=MAX_FEED_ITEMS):
+    """Parses RSS or Atom into ``[{"title", "link", "published", "summary"}]``."""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return []
+    items = []
+    for elem in root.iter():
+        name = elem.tag.rpartition("}")[2]
+        if name not in ("item", "entry"):
+            continue
+        fields = {}
+        for child in elem:
+            key = child.tag.rpartition("}")[2]
+            if key == "link" and child.get("href"):
+                fields.setdefault("link", child.get("href"))
+            elif child.text and key not in fields:
+                fields[key] = child.text.strip()
+        items.append(
+            {
+                "title": _strip_html(fields.get("title", "")),
+                "link": fields.get("link", ""),
+                "published": fields.get("pubDate")
+                or fields.get("published")
+                or fields.get("updated", ""),
+                "summary": _strip_html(
+                    fields.get("description") or fields.get("summary", "")
+                )[:500],
+            }
+        )
+        if len(items) >= limit:
+            break
+    return items
+
+
+def company_website(company_name):
+    """Best guess at a company's homepage from its name."""
+    slug = re.sub(r"[^a-z0-9]", "", company_name.lower())
+    return f"https://www.{slug}.com" if slug else ""
+
+
+class ResearchFetcher:
+    """Async fetcher with a pooled client, per-host limits, timeouts and robots.txt.
+
+    The website is typed in by the user and fetched from the server, so only
+    http(s) URLs on hosts that resolve to public addresses are fetched, and
+    redirects are followed one hop at a time with those checks and robots.txt
+    applied to every hop. ``allow_private`` lifts the address check, for tests
+    against a local server.
+    """
+
+    def __init__(self, client=None, per_host=PER_HOST_CONCURRENCY, allow_private=False):
+        self._own_client = client is None
+        self.client = client or httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS // 2,
+            ),
+        )
+        self.per_host = per_host
+        self.allow_private = allow_private
+        self._host_limits = {}
+        self._robots = {}
+        self._public_hosts = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._own_client:
+            await self.client.aclose()
+
+    def _limit(self, host):
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def _robots_for(self, url):
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin not in self._robots:
+            # Store the task so concurrent requests share one robots.txt fetch
+            self._robots[origin] = asyncio.ensure_future(self._load_robots(origin))
+        return await self._robots[origin]
+
+    async def _load_robots(self, origin):
+        robots = RobotFileParser()
+        try:
+            async with self._limit(urlsplit(origin).netloc):
+                response = await self.client.get(
+                    f"{origin}/robots.txt", follow_redirects=False
+                )
+        except httpx.HTTPError:
+            robots.allow_all = True
+            return robots
+        if response.status_code in (401, 403):
+            robots.disallow_all = True
+        elif response.status_code >= 300:
+            # Redirected robots.txt is treated as missing; the pages it would
+            # cover redirect too and are checked against the target's own
+            robots.allow_all = True
+        else:
+            robots.parse(response.text.splitlines())
+        return robots
+
+    async def allowed(self, url):
+        robots = await self._robots_for(url)
+        return robots.can_fetch(USER_AGENT, url)
+
+    async def _resolves_public(self, host, port):
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port)
+        except OSError:
+            return False
+        for info in infos:
+            address = ipaddress.ip_address(info[4][0].split("%")[0])
+            if address.version == 6 and address.ipv4_mapped:
+                address = address.ipv4_mapped
+            if not address.is_global:
+                return False
+        return bool(infos)
+
+    async def public(self, url):
+        """Whether ``url`` is http(s) on a host with only public addresses, so
+        not loopback, private, link-local or otherwise reserved."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return False
+        if self.allow_private:
+            return True
+        host = parts.hostname
+        if host not in self._public_hosts:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            self._public_hosts[host] = asyncio.ensure_future(
+                self._resolves_public(host, port)
+            )
+        return await self._public_hosts[host]
+
+    async def fetch(self, url, headers=None):
+        """Fetches ``url`` and returns ``{"url", "status", "headers", "text"}``.
+
+        ``headers`` carries conditional validators; a 304 comes back with an
+        empty text. URLs, including redirect targets, that are not public get
+        status "blocked", robots-blocked ones status "robots", and non-200
+        answers their status code, all without a body. Returns None when the
+        request fails, redirects more than MAX_REDIRECTS times or the body
+        exceeds MAX_PAGE_BYTES.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            if not await self.public(url):
+                return {"url": url, "status": "blocked", "headers": {}, "text": ""}
+            if not await self.allowed(url):
+                return {"url": url, "status": "robots", "headers": {}, "text": ""}
+            try:
+                async with self._limit(urlsplit(url).netloc):
+                    async with self.client.stream(
+                        "GET", url, headers=headers, follow_redirects=False
+                    ) as response:
+                        if response.has_redirect_location:
+                            url = urljoin(url, response.headers["location"])
+                            continue
+                        result = {
+                            "url": str(response.url),
+                            "status": response.status_code,
+                            "headers": response.headers,
+                            "text": "",
+                        }
+                        if response.status_code != 200:
+                            return result
+                        body = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            body.extend(chunk)
+                            if len(body) > MAX_PAGE_BYTES:
+                                return None
+                        encoding = response.charset_encoding or "utf-8"
+                        result["text"] = body.decode(encoding, errors="replace")
+                        return result
+            except (httpx.HTTPError, LookupError):
+                return None
+        return None
+
+
+def _page_document(url, response):
+    if "html" not in response["headers"].get("content-type", ""):
+        return None
+    title, text, feeds = extract_main_text(response["text"], response["url"])
+    if not text:
+        return None
+    return {
+        "url": response["url"],
+        "kind": "page",
+        "title": title or url,
+        "text": text,
+        "feeds": feeds,
+    }
+
+
+def _feed_document(url, response, kind):
+    items = parse_feed(response["text"])
+    if not items:
+        return None
+    text = "\n".join(
+        " — ".join(p for p in (item["title"], item["published"], item["summary"]) if p)
+        for item in items
+    )
+    return {"url": url, "kind": kind, "title": url, "text": text, "items": items}
+
+
+def _new_refresh_stats():
+    return {
+        "requests": 0,
+        "fetched": 0,
+        "not_modified": 0,
+        "changed": 0,
+        "unchanged": 0,
+        "failed": 0,
+        "timed_out": 0,
+    }
+
+
+async def _gather_until(coros, deadline, stats):
+    """Runs ``coros`` concurrently until the loop time ``deadline``; those still
+    running then are cancelled and give None, so finished results are kept."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    if not tasks:
+        return []
+    timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    stats["timed_out"] += len(pending)
+    return [task.result() if task in done else None for task in tasks]
+
+
+async def _fetch_document(fetcher, url, kind, sources, stats):
+    """Fetches one source conditionally and re-extracts it only when it changed.
+
+    ``sources`` stores, per URL, the ETag/Last-Modified validators, a hash of
+    the raw body and the extracted document from the previous refresh.
+    """
+    entry = sources.get(url) if sources is not None else None
+    previous = entry[0] if entry else None
+    headers = {}
+    if previous and previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous and previous.get("last_modified"):
+        headers["If-Modified-Since"] = previous["last_modified"]
+
+    stats["requests"] += 1
+    response = await fetcher.fetch(url, headers=headers or None)
+    if response is None:
+        # Transient failure: keep serving what we had
+        stats["failed"] += 1
+        return dict(previous["document"]) if previous and previous["document"] else None
+    if response["status"] == 304 and previous:
+        stats["not_modified"] += 1
+        return dict(previous["document"]) if previous["document"] else None
+    if response["status"] != 200:
+        if sources is not None and previous:
+            sources.delete(url)
+        return None
+
+    stats["fetched"] += 1
+    content_hash = hashlib.sha256(response["text"].encode()).hexdigest()
+    if previous and previous["hash"] == content_hash:
+        stats["unchanged"] += 1
+        document = previous["document"]
+    else:
+        stats["changed"] += 1
+        if kind == "page":
+            document = _page_document(url, response)
+        else:
+            document = _feed_document(url, response, kind)
+    if sources is not None:
+        sources.set(
+            url,
+            {
+                "etag": response["headers"].get("etag"),
+                "last_modified": response["headers"].get("last-modified"),
+                "hash": content_hash,
+                "document": document,
+            },
+            time.time(),
+        )
+    return dict(document) if document else None
+
+
+async def research_company_async(
+    company_name, website=None, fetcher=None, news_feeds=NEWS_FEEDS, sources=None
+):
+    """Fetches a company's public pages and feeds and extracts their main text.
+
+    Pass a ``sources`` store (``get``/``set``/``delete``, as in research_cache)
+    to make refreshes conditional and incremental; the returned
+    ``refresh_stats`` count requests, 304s and changed sources for the cycle.
+    Sources still loading after RESEARCH_DEADLINE seconds are given up on;
+    the documents fetched by then are returned.
+    """
+    website = (website or company_website(company_name)).strip()
+    if website and "://" not in website:
+        website = f"https://{website}"
+    if website:
+        # Page paths are appended to the site itself, never to a query or fragment
+        parts = urlsplit(website)
+        website = urlunsplit(
+            (parts.scheme, parts.netloc, parts.path.rstrip("/"), "", "")
+        )
+    stats = _new_refresh_stats()
+
+    async def run(fetcher):
+        deadline = asyncio.get_running_loop().time() + RESEARCH_DEADLINE
+        page_urls = [website + path for path in PAGE_PATHS] if website else []
+        pages = await _gather_until(
+            (_fetch_document(fetcher, u, "page", sources, stats) for u in page_urls),
+            deadline,
+            stats,
+        )
+        documents = []
+        seen_urls = set()
+        for page in pages:
+            if page and page["url"] not in seen_urls:
+                seen_urls.add(page["url"])
+                documents.append(page)
+
+        feed_urls = [f for page in documents for f in page.pop("feeds", [])]
+        if website:
+            feed_urls += [website + path for path in FEED_PATHS]
+        feed_urls = list(dict.fromkeys(feed_urls))
+        news_urls = [
+            template.format(query=quote_plus(company_name)) for template in news_feeds
+        ]
+        feeds = await _gather_until(
+            [_fetch_document(fetcher, u, "feed", sources, stats) for u in feed_urls]
+            + [_fetch_document(fetcher, u, "news", sources, stats) for u in news_urls],
+            deadline,
+            stats,
+        )
+        seen_texts = set()
+        for feed in feeds:
+            if feed and feed["text"] not in seen_texts:
+                seen_texts.add(feed["text"])
+                documents.append(feed)
+        return documents
+
+    started = time.time()
+    if fetcher is not None:
+        documents = await run(fetcher)
+    else:
+        async with ResearchFetcher() as own_fetcher:
+            documents = await run(own_fetcher)
+    with _history_lock:
+        _refresh_history.append(
+            {
+                "company": company_name,
+                "started": started,
+                "duration": time.time() - started,
+                **stats,
+            }
+        )
+    return {
+        "company": company_name,
+        "website": website,
+        "documents": documents,
+        "fetched_at": started,
+        "refresh_stats": stats,
+    }
+
+
+def refresh_history():
+    """Returns the fetch/304/changed counts of recent refresh cycles, oldest first."""
+    with _history_lock:
+        return list(_refresh_history)
+
+
+def research_company(company_name, website=None, news_feeds=NEWS_FEEDS, sources=None):
+    """Synchronous wrapper around research_company_async for the Streamlit script."""
+    return asyncio.run(
+        research_company_async(
+            company_name, website=website, news_feeds=news_feeds, sources=sources
+        )
+    )
+
+
+def format_research(documents, max_chars_per_document=1500):
+    """Renders research documents as Markdown for display, cut to a preview each."""
+    sections = []
+    for doc in documents:
+        label = FEED_LABELS.get(doc["kind"], doc["title"])
+        text = doc["text"]
+        if len(text) > max_chars_per_document:
+            text = text[:max_chars_per_document].rsplit(" ", 1)[0] + " …"
+        sections.append(f"**{label}** ({doc['url']})\n\n{text}")
+    return "\n\n".join(sections)
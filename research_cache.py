@@ -0,0 +1,252 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import data_dir
+
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_STALE_TTL = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 200
+# Each company has a few dozen pages and feeds
+DEFAULT_MAX_SOURCES = 5000
+
+COMPANY_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "ltd",
+    "limited",
+    "llc",
+    "plc",
+    "corp",
+    "corporation",
+    "co",
+    "company",
+    "gmbh",
+    "ag",
+    "sa",
+    "pvt",
+    "private",
+}
+
+
+def normalize_company(name):
+    """Normalises a company name so "Stripe, Inc." and "stripe" share a cache entry."""
+    words = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    if words and words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+class MemoryBackend:
+    """In-process LRU store of ``key -> (value, stored_at)``."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteBackend:
+    """SQLite store shared by every process using the same data directory."""
+
+    def __init__(
+        self, path=None, max_entries=DEFAULT_MAX_ENTRIES, table="research_cache"
+    ):
+        self.path = path or os.path.join(data_dir(), "research_cache.sqlite3")
+        self.max_entries = max_entries
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), stored_at, time.time()),
+            )
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+
+class ResearchCache:
+    """TTL cache with stale-while-revalidate and single-flight loading.
+
+    Entries younger than ``ttl`` are served as is. Entries up to ``stale_ttl``
+    older than that are served immediately while one background refresh runs.
+    Anything older is loaded synchronously; concurrent callers for the same key
+    wait on the same load instead of starting their own.
+    """
+
+    def __init__(self, backend, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._refresher = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="research-refresh"
+        )
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _load(self, key, loader):
+        """Runs ``loader`` once per key at a time and stores the result."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        self._count("refreshes")
+        try:
+            value = loader()
+            self.backend.set(key, value, time.time())
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._inflight:
+                return
+        future = self._refresher.submit(self._load, key, loader)
+        # A failed refresh keeps serving the stale value until it expires
+        future.add_done_callback(lambda f: f.exception())
+
+    def get(self, key, loader):
+        """Returns the cached value for ``key``, calling ``loader()`` when needed."""
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self._count("hits")
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader)
+                return value
+        self._count("misses")
+        return self._load(key, loader)
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+
+_cache = None
+_sources = None
+_cache_lock = threading.Lock()
+
+
+def _backend_kind():
+    kind = os.getenv("HIREHELPER_RESEARCH_CACHE", "memory").lower()
+    if kind not in ("memory", "sqlite"):
+        raise ValueError(f"Unknown research cache backend: {kind}")
+    return kind
+
+
+def get_research_cache():
+    """Returns the process-wide research cache, configured from the environment.
+
+    ``HIREHELPER_RESEARCH_CACHE`` picks ``memory`` (default) or ``sqlite``;
+    ``HIREHELPER_RESEARCH_TTL``, ``HIREHELPER_RESEARCH_STALE_TTL`` (seconds) and
+    ``HIREHELPER_RESEARCH_CACHE_SIZE`` tune it.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_entries = int(
+                os.getenv("HIREHELPER_RESEARCH_CACHE_SIZE", DEFAULT_MAX_ENTRIES)
+            )
+            if _backend_kind() == "sqlite":
+                backend = SQLiteBackend(max_entries=max_entries)
+            else:
+                backend = MemoryBackend(max_entries=max_entries)
+            _cache = ResearchCache(
+                backend,
+                ttl=float(os.getenv("HIREHELPER_RESEARCH_TTL", DEFAULT_TTL)),
+                stale_ttl=float(
+                    os.getenv("HIREHELPER_RESEARCH_STALE_TTL", DEFAULT_STALE_TTL)
+                ),
+            )
+        return _cache
+
+
+def get_source_store():
+    """Returns the per-source store used for conditional research refreshes.
+
+    It keeps each URL's ETag, Last-Modified, content hash and extracted document
+    in the same kind of backend as the research cache.
+    """
+    global _sources
+    with _cache_lock:
+        if _sources is None:
+            if _backend_kind() == "sqlite":
+                _sources = SQLiteBackend(
+                    max_entries=DEFAULT_MAX_SOURCES, table="research_sources"
+                )
+            else:
+                _sources = MemoryBackend(max_entries=DEFAULT_MAX_SOURCES)
+        return _sources
@@ -0,0 +1,144 @@
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+
+from company_brief import documents_hash
+from resume_index import count_tokens, terms
+
+SNIPPET_TOKENS = 60
+DEFAULT_LIMIT = 6
+MAX_CACHED_INDEXES = 32
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def split_snippets(documents, max_tokens=SNIPPET_TOKENS):
+    """Cuts research documents into short snippets: one per feed item, or a few
+    sentences of page text."""
+    snippets = []
+    for doc in documents:
+        if doc["kind"] in ("news", "feed"):
+            snippets.extend(
+                line.strip() for line in doc["text"].splitlines() if line.strip()
+            )
+            continue
+        current = []
+        for line in doc["text"].splitlines():
+            for sentence in SENTENCE_RE.split(line.strip()):
+                if not sentence:
+                    continue
+                if (
+                    current
+                    and count_tokens(" ".join(current + [sentence])) > max_tokens
+                ):
+                    snippets.append(" ".join(current))
+                    current = []
+                current.append(sentence)
+        if current:
+            snippets.append(" ".join(current))
+    return list(dict.fromkeys(snippets))
+
+
+class _FTS5Search:
+    def __init__(self, snippets):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE snippets USING fts5(text, tokenize='porter unicode61')"
+        )
+        self._conn.executemany(
+            "INSERT INTO snippets (rowid, text) VALUES (?, ?)", enumerate(snippets)
+        )
+
+    def search(self, terms, limit):
+        query = " OR ".join(f'"{term}"' for term in terms)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid FROM snippets WHERE snippets MATCH ? "
+                "ORDER BY bm25(snippets) LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class _BM25Search:
+    """Pure-Python BM25 for SQLite builds without FTS5."""
+
+    def __init__(self, snippets, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs = [Counter(terms(snippet)) for snippet in snippets]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = (sum(self._lengths) / len(self._docs)) if self._docs else 0
+        document_frequency = Counter(term for doc in self._docs for term in doc)
+        total = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def search(self, terms, limit):
+        scores = []
+        for i, doc in enumerate(self._docs):
+            score = 0.0
+            for term in terms:
+                tf = doc.get(term)
+                if not tf:
+                    continue
+                norm = 1 - self.b + self.b * self._lengths[i] / (self._avg_length or 1)
+                score += self._idf[term] * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+            if score > 0:
+                scores.append((-score, i))
+        return [i for _, i in sorted(scores)[:limit]]
+
+
+class ResearchIndex:
+    """Full-text index over research snippets (SQLite FTS5, or BM25 in memory)."""
+
+    def __init__(self, documents):
+        self.snippets = split_snippets(documents)
+        try:
+            self._search = _FTS5Search(self.snippets)
+            self.engine = "fts5"
+        except sqlite3.OperationalError:
+            self._search = _BM25Search(self.snippets)
+            self.engine = "bm25"
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Returns the snippets most relevant to ``query``, best first."""
+        terms = list(dict.fromkeys(terms(query)))
+        if not terms or not self.snippets:
+            return []
+        return [self.snippets[i] for i in self._search.search(terms, limit)]
+
+    def top_snippets(self, query, budget, limit=DEFAULT_LIMIT):
+        """Returns the best snippets for ``query`` that fit in ``budget`` tokens."""
+        kept = []
+        used = 0
+        for snippet in self.search(query, limit):
+            tokens = count_tokens(snippet) + 1
+            if used + tokens <= budget:
+                kept.append(snippet)
+                used += tokens
+        return kept
+
+
+def get_research_index(documents):
+    """Returns the cached index for these research documents, building it on first use."""
+    key = documents_hash(documents)
+    with _lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = ResearchIndex(documents or ())
+    with _lock:
+        _cache[key] = index
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
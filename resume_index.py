@@ -0,0 +1,273 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+MAX_CACHED_INDEXES = 64
+HIGHLIGHT_LIMIT = 4
+
+SECTION_KEYWORDS = {
+    "summary",
+    "profile",
+    "professional summary",
+    "objective",
+    "about me",
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment",
+    "employment history",
+    "work history",
+    "education",
+    "skills",
+    "technical skills",
+    "core competencies",
+    "projects",
+    "personal projects",
+    "certifications",
+    "certificates",
+    "awards",
+    "achievements",
+    "honors",
+    "publications",
+    "languages",
+    "interests",
+    "volunteering",
+    "volunteer experience",
+    "leadership",
+    "activities",
+    "references",
+}
+
+# Words that mark an all-caps line as a section heading, e.g. "RELEVANT EXPERIENCE";
+# other all-caps lines (employers, acronyms, names) are content
+SECTION_WORDS = {
+    word
+    for keyword in SECTION_KEYWORDS
+    for word in keyword.split()
+    if word not in {"about", "me", "work", "professional", "personal", "core"}
+}
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{DATE})\s*(?:-|–|—|to)\s*(?P<end>{DATE}|present|current|now|date)",
+    re.IGNORECASE,
+)
+METRIC_RE = re.compile(
+    r"(?:[$€£]\s?\d[\d,.]*\s?(?:[kmb]|million|billion)?"
+    r"|\d[\d,.]*\s?(?:%|x\b|\+|k\b|m\b|million|billion)"
+    r"|\b\d{2,}[\d,.]*\b)",
+    re.IGNORECASE,
+)
+HEADING_RE = re.compile(r"^\s*#{1,6}\s+(?P<title>.+?)\s*#*\s*$")
+SKILL_SPLIT_RE = re.compile(r"[,;|•·]|\s/\s")
+BULLET_RE = re.compile(r"^\s*(?:[-*•·▪●◦]|\d+[.)])\s*")
+
+# Words too common in interview questions to say what one is about
+STOPWORDS = {
+    "about",
+    "and",
+    "are",
+    "can",
+    "did",
+    "does",
+    "for",
+    "from",
+    "have",
+    "how",
+    "into",
+    "tell",
+    "that",
+    "the",
+    "their",
+    "this",
+    "was",
+    "were",
+    "what",
+    "when",
+    "where",
+    "which",
+    "who",
+    "why",
+    "will",
+    "with",
+    "would",
+    "you",
+    "your",
+}
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def count_tokens(text):
+    """Approximates the token count of a piece of text (about 4 characters per token)."""
+    if not text:
+        return 0
+    return max(1, round(len(text) / 4))
+
+
+def terms(text):
+    """The words of ``text`` that say what it is about, lowercased."""
+    return [
+        word
+        for word in re.findall(r"\w+", text.lower())
+        if len(word) > 2 and word not in STOPWORDS
+    ]
+
+
+def _heading_title(line):
+    """Returns the section title, as written, if the line looks like a résumé heading."""
+    match = HEADING_RE.match(line)
+    if match:
+        return match.group("title").strip("*_ ").strip()
+    stripped = line.strip().strip("*_").strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    if stripped.lower() in SECTION_KEYWORDS:
+        return stripped
+    words = re.findall(r"[a-z]+", stripped.lower())
+    if (
+        stripped.isupper()
+        and len(words) <= 4
+        and any(word in SECTION_WORDS for word in words)
+    ):
+        return stripped
+    return None
+
+
+def _split_sections(text):
+    """Splits text into ``(title, lines)``; every heading is kept, even with an
+    empty body, and the lines before the first heading are the "Header"."""
+    sections = []
+    title = None
+    lines = []
+    for line in text.splitlines():
+        heading = _heading_title(line)
+        if heading:
+            if title is not None or any(l.strip() for l in lines):
+                sections.append((title or "Header", lines))
+            title = heading
+            lines = []
+        else:
+            lines.append(line)
+    if title is not None or any(l.strip() for l in lines):
+        sections.append((title or "Header", lines))
+    return sections
+
+
+def _extract_roles(lines):
+    roles = []
+    for i, line in enumerate(lines):
+        match = DATE_RANGE_RE.search(line)
+        if not match:
+            continue
+        title = (line[: match.start()] + line[match.end() :]).strip(" |,-–—()*_\t")
+        title = BULLET_RE.sub("", title).strip()
+        if not title and i > 0:
+            title = BULLET_RE.sub("", lines[i - 1]).strip(" |,-–—*_\t")
+        roles.append(
+            {
+                "title": title,
+                "start": match.group("start"),
+                "end": match.group("end"),
+            }
+        )
+    return roles
+
+
+def _extract_skills(lines):
+    skills = set()
+    for line in lines:
+        line = BULLET_RE.sub("", line)
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for skill in SKILL_SPLIT_RE.split(line):
+            skill = skill.strip(" .*_\t")
+            if skill and len(skill) <= 40 and len(skill.split()) <= 4:
+                skills.add(skill)
+    return skills
+
+
+def _extract_metrics(lines):
+    metrics = []
+    for line in lines:
+        if DATE_RANGE_RE.search(line):
+            line = DATE_RANGE_RE.sub("", line)
+        values = [
+            m.group(0).strip()
+            for m in METRIC_RE.finditer(line)
+            if not re.fullmatch(r"(?:19|20)\d{2}", m.group(0).strip())
+        ]
+        if values:
+            metrics.append(
+                {"values": values, "context": BULLET_RE.sub("", line).strip()}
+            )
+    return metrics
+
+
+def build_resume_index(text):
+    """Parses résumé text into its roles, skills, metrics and token count.
+
+    The index is for estimates and for picking the facts relevant to each
+    question (relevant_highlights); prompts still carry the résumé itself.
+    """
+    roles = []
+    skills = set()
+    metrics = []
+    for title, lines in _split_sections(text or ""):
+        lowered = title.lower()
+        if any(word in lowered for word in ("experience", "employment", "history")):
+            roles.extend(_extract_roles(lines))
+        if any(word in lowered for word in ("skill", "competenc", "technolog")):
+            skills.update(_extract_skills(lines))
+        if title != "Header":
+            metrics.extend(_extract_metrics(lines))
+
+    return {
+        "roles": roles,
+        "skills": sorted(skills, key=str.lower),
+        "metrics": metrics,
+        "total_tokens": count_tokens(text),
+    }
+
+
+def get_resume_index(text):
+    """Returns the cached index for this résumé text, building it on first use."""
+    key = hashlib.sha256((text or "").encode()).hexdigest()
+    with _lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = build_resume_index(text)
+    with _lock:
+        _cache[key] = index
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
+
+
+def relevant_highlights(index, question, limit=HIGHLIGHT_LIMIT):
+    """Returns up to ``limit`` lines of the résumé's measurable results and
+    roles that share words with ``question``, best first, then a line of the
+    skills it mentions. Empty when nothing matches."""
+    wanted = set(terms(question))
+    if not wanted:
+        return []
+    candidates = [metric["context"] for metric in index["metrics"]] + [
+        f"{role['title']} ({role['start']} – {role['end']})"
+        for role in index["roles"]
+        if role["title"]
+    ]
+    scored = []
+    for position, line in enumerate(candidates):
+        score = len(wanted.intersection(terms(line)))
+        if score:
+            scored.append((-score, position, line))
+    highlights = [line for _, _, line in sorted(scored)[:limit]]
+    skills = [skill for skill in index["skills"] if wanted.intersection(terms(skill))]
+    if skills:
+        highlights.append("Skills: " + ", ".join(skills))
+    return highlights
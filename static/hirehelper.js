@@ -0,0 +1,61 @@
+// Runs in the Streamlit page (loaded by index.html). One delegated listener
+// handles every "Copy Answer" button, including ones rendered by later reruns.
+(function () {
+  const COPIED = '<span class="hh-icon hh-icon-check" aria-hidden="true"></span> Copied!';
+
+  function fallbackCopy(text) {
+    const textArea = document.createElement("textarea");
+    textArea.value = text;
+    textArea.style.top = "0";
+    textArea.style.left = "0";
+    textArea.style.position = "fixed";
+    document.body.appendChild(textArea);
+    textArea.focus();
+    textArea.select();
+
+    let success = false;
+    try {
+      success = document.execCommand("copy");
+    } catch (err) {
+      console.error("Fallback: Unable to copy", err);
+    }
+    document.body.removeChild(textArea);
+    return Promise.resolve(success);
+  }
+
+  function copyText(text) {
+    if (!navigator.clipboard) {
+      return fallbackCopy(text);
+    }
+    return navigator.clipboard
+      .writeText(text)
+      .then(() => true)
+      .catch((err) => {
+        console.error("Clipboard API failed: ", err);
+        return fallbackCopy(text);
+      });
+  }
+
+  document.addEventListener("click", (event) => {
+    const button = event.target.closest(".copy-button");
+    if (!button) return;
+    const card = button.closest(".answer-card");
+    const body = card && card.querySelector(".answer-body");
+    if (!body) return;
+
+    copyText(body.innerText.trim()).then((success) => {
+      if (!success) {
+        alert("Failed to copy text. Please copy manually.");
+        return;
+      }
+      const originalText = button.innerHTML;
+      const originalClass = button.className;
+      button.innerHTML = COPIED;
+      button.className = originalClass + " copy-button-copied";
+      setTimeout(() => {
+        button.innerHTML = originalText;
+        button.className = originalClass;
+      }, 2000);
+    });
+  });
+})();
@@ -0,0 +1,165 @@
+import os
+import sqlite3
+import threading
+import time
+
+from config import data_dir
+
+# Only the most recent calls per model feed the estimator
+DEFAULT_HISTORY = 500
+
+_lock = threading.Lock()
+_conn = None
+
+
+def enabled():
+    """Whether LLM calls are recorded, from ``HIREHELPER_TELEMETRY`` (default on)."""
+    return os.getenv("HIREHELPER_TELEMETRY", "1").lower() not in ("0", "false", "no")
+
+
+def _connection():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(
+            os.path.join(data_dir(), "telemetry.sqlite3"), check_same_thread=False
+        )
+        with _conn:
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_calls ("
+                "recorded_at REAL NOT NULL, provider TEXT NOT NULL, "
+                "model TEXT NOT NULL, kind TEXT NOT NULL, "
+                "estimated_input_tokens INTEGER NOT NULL, word_limit INTEGER, "
+                "input_tokens INTEGER, output_tokens INTEGER, "
+                "latency REAL NOT NULL, ok INTEGER NOT NULL)"
+            )
+            _conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_calls_model "
+                "ON llm_calls (provider, model, kind, recorded_at)"
+            )
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS coalesced_calls ("
+                "recorded_at REAL NOT NULL, provider TEXT NOT NULL, "
+                "model TEXT NOT NULL, kind TEXT NOT NULL)"
+            )
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "recorded_at REAL NOT NULL, provider TEXT NOT NULL, "
+                "model TEXT NOT NULL, questions INTEGER NOT NULL, "
+                "concurrency INTEGER NOT NULL, duration REAL NOT NULL)"
+            )
+    return _conn
+
+
+def record_call(
+    provider,
+    model,
+    kind,
+    estimated_input_tokens,
+    latency,
+    ok=True,
+    input_tokens=None,
+    output_tokens=None,
+    word_limit=None,
+):
+    """Stores one LLM call. Token counts are None when the provider didn't report them."""
+    if not enabled():
+        return
+    with _lock, _connection() as conn:
+        conn.execute(
+            "INSERT INTO llm_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                time.time(),
+                provider,
+                model,
+                kind,
+                estimated_input_tokens,
+                word_limit,
+                input_tokens,
+                output_tokens,
+                latency,
+                int(ok),
+            ),
+        )
+
+
+def record_coalesced(provider, model, kind):
+    """Stores a call that shared an identical request already in flight instead
+    of being sent; it isn't in ``llm_calls``, which holds the issued ones."""
+    if not enabled():
+        return
+    with _lock, _connection() as conn:
+        conn.execute(
+            "INSERT INTO coalesced_calls VALUES (?, ?, ?, ?)",
+            (time.time(), provider, model, kind),
+        )
+
+
+def coalescing_stats(since=0):
+    """Counts calls sent to providers and calls coalesced onto them since ``since``."""
+    with _lock:
+        conn = _connection()
+        issued = conn.execute(
+            "SELECT COUNT(*) FROM llm_calls WHERE recorded_at >= ?", (since,)
+        ).fetchone()[0]
+        coalesced = conn.execute(
+            "SELECT COUNT(*) FROM coalesced_calls WHERE recorded_at >= ?", (since,)
+        ).fetchone()[0]
+    return {"issued": issued, "coalesced": coalesced}
+
+
+def record_run(provider, model, questions, concurrency, duration):
+    """Stores the wall time of one generate_answers run."""
+    if not enabled():
+        return
+    with _lock, _connection() as conn:
+        conn.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+            (time.time(), provider, model, questions, concurrency, duration),
+        )
+
+
+def recent_calls(provider, model, kind="answer", limit=DEFAULT_HISTORY):
+    """Returns the latest successful calls for a model, newest first, as dicts."""
+    with _lock:
+        rows = (
+            _connection()
+            .execute(
+                "SELECT estimated_input_tokens, word_limit, input_tokens, "
+                "output_tokens, latency FROM llm_calls "
+                "WHERE provider = ? AND model = ? AND kind = ? AND ok = 1 "
+                "ORDER BY recorded_at DESC LIMIT ?",
+                (provider, model, kind, limit),
+            )
+            .fetchall()
+        )
+    keys = (
+        "estimated_input_tokens",
+        "word_limit",
+        "input_tokens",
+        "output_tokens",
+        "latency",
+    )
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def usage_since(since):
+    """Returns every call recorded after ``since`` (a timestamp) as dicts."""
+    with _lock:
+        rows = (
+            _connection()
+            .execute(
+                "SELECT provider, model, estimated_input_tokens, word_limit, "
+                "input_tokens, output_tokens FROM llm_calls WHERE recorded_at >= ?",
+                (since,),
+            )
+            .fetchall()
+        )
+    keys = (
+        "provider",
+        "model",
+        "estimated_input_tokens",
+        "word_limit",
+        "input_tokens",
+        "output_tokens",
+    )
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Keep the local stores (telemetry, history, library) out of the working tree
+os.environ.setdefault("HIREHELPER_DATA_DIR", tempfile.mkdtemp(prefix="hirehelper-"))
@@ -0,0 +1,37 @@
+"""Answer library lookups, scoped to the résumé they were made for."""
+
+import sqlite3
+
+from answer_library import AnswerLibrary
+
+
+def test_stats_count_only_this_resumes_lookups(tmp_path):
+    library = AnswerLibrary(str(tmp_path / "library.sqlite3"))
+    library.add("Why do you want to work here?", "Mission.", "SRE", "Acme", "mine")
+
+    assert library.match("Why do you want to work here?", "SRE", "Acme", "mine")[0] == (
+        "reused"
+    )
+    library.match("Describe a hard bug you fixed.", "SRE", "Acme", "theirs")
+    library.match("Describe a hard bug you fixed.", "SRE", "Acme", "theirs")
+
+    mine = library.stats("mine")
+    assert (mine["answers"], mine["lookups"], mine["reused"]) == (1, 1, 1)
+    assert mine["hit_rate"] == 1.0
+    theirs = library.stats("theirs")
+    assert (theirs["answers"], theirs["lookups"], theirs["missed"]) == (0, 2, 2)
+    assert theirs["hit_rate"] == 0.0
+
+
+def test_unscoped_lookup_counts_are_dropped(tmp_path):
+    path = str(tmp_path / "library.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE lookups (outcome TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+        )
+        conn.execute("INSERT INTO lookups VALUES ('reused', 7)")
+
+    library = AnswerLibrary(path)
+    assert library.stats("mine")["lookups"] == 0
+    library.record("missed", "mine")
+    assert library.stats("mine")["missed"] == 1
@@ -0,0 +1,257 @@
+"""Model call bookkeeping in utils: budgets, telemetry and shared requests."""
+
+import asyncio
+import threading
+import time
+
+import utils
+from budget import Budget
+
+
+class StringLLM:
+    """A completion model like GoogleGenerativeAI: a plain string, no usage."""
+
+    def __init__(self, text="formatted"):
+        self.text = text
+        self.calls = 0
+
+    def invoke(self, prompt_text):
+        self.calls += 1
+        return self.text
+
+
+def test_string_result_without_estimate_or_budget():
+    llm = StringLLM()
+    text = utils._invoke_llm(llm, "format me", "Google", "gemini-x", "format")
+    assert text == "formatted"
+    assert llm.calls == 1
+
+
+def test_string_result_settles_budget_from_estimate():
+    budget = Budget("Google", "gemini-x")
+    text = utils._invoke_llm(
+        StringLLM(),
+        "answer me",
+        "Google",
+        "gemini-x",
+        "answer",
+        budget=budget,
+        estimate=(100, 50),
+    )
+    assert text == "formatted"
+    assert budget.spent["run"]["tokens"] == 100 + utils.count_tokens("formatted")
+
+
+class GatedLLM:
+    """Holds every call until released; the first calls fail with ``errors``
+    in turn, the rest answer ``text``."""
+
+    def __init__(self, text="shared", errors=()):
+        self.text = text
+        self.errors = list(errors)
+        self.calls = 0
+        self.release = threading.Event()
+
+    def _answer(self):
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.text
+
+    def invoke(self, prompt_text):
+        self.calls += 1
+        self.release.wait(5)
+        return self._answer()
+
+    async def ainvoke(self, prompt_text):
+        self.calls += 1
+        while not self.release.is_set():
+            await asyncio.sleep(0.01)
+        return self._answer()
+
+
+class Interrupted(BaseException):
+    """Stands in for a script rerun stopping the thread that sent the call."""
+
+
+def _call(llm, prompt="same prompt"):
+    return utils._invoke_llm(llm, prompt, "Google", "gemini-x", "answer")
+
+
+def _in_flight():
+    return bool(utils._inflight)
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _run_in_thread(fn, results):
+    def run():
+        try:
+            results.append(fn())
+        except BaseException as e:
+            results.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _leader_and_waiter(llm):
+    leader_results, waiter_results = [], []
+    leader = _run_in_thread(lambda: _call(llm), leader_results)
+    _wait_for(_in_flight)
+    waiter = _run_in_thread(lambda: _call(llm), waiter_results)
+    return leader, leader_results, waiter, waiter_results
+
+
+def test_identical_sync_calls_share_one_request():
+    llm = GatedLLM()
+    leader, leader_results, waiter, waiter_results = _leader_and_waiter(llm)
+    time.sleep(0.05)
+    llm.release.set()
+    leader.join(5)
+    waiter.join(5)
+    assert leader_results == waiter_results == ["shared"]
+    assert llm.calls == 1
+    assert not utils._inflight
+
+
+def test_sync_leader_error_reaches_waiters():
+    llm = GatedLLM(errors=[ValueError("quota")])
+    leader, leader_results, waiter, waiter_results = _leader_and_waiter(llm)
+    time.sleep(0.05)
+    llm.release.set()
+    leader.join(5)
+    waiter.join(5)
+    assert isinstance(leader_results[0], ValueError)
+    assert waiter_results[0] is leader_results[0]
+    assert llm.calls == 1
+    assert not utils._inflight
+
+
+def test_sync_leader_cancel_lets_waiter_send_its_own():
+    llm = GatedLLM(errors=[Interrupted()])
+    leader, leader_results, waiter, waiter_results = _leader_and_waiter(llm)
+    time.sleep(0.05)
+    llm.release.set()
+    leader.join(5)
+    waiter.join(5)
+    assert isinstance(leader_results[0], Interrupted)
+    assert waiter_results == ["shared"]
+    assert llm.calls == 2
+    assert not utils._inflight
+
+
+def test_sync_waiter_gives_up_on_a_stuck_request(monkeypatch):
+    monkeypatch.setattr(utils, "COALESCE_WAIT_SECONDS", 0.1)
+    stuck = GatedLLM()
+    leader_results = []
+    leader = _run_in_thread(lambda: _call(stuck), leader_results)
+    _wait_for(_in_flight)
+    assert _call(StringLLM("own")) == "own"
+    # The stuck request is still registered, and clears when it lands
+    assert utils._inflight
+    stuck.release.set()
+    leader.join(5)
+    assert leader_results == ["shared"]
+    assert not utils._inflight
+
+
+def test_recording_failure_does_not_strand_waiters(monkeypatch):
+    def broken(self, text, usage):
+        raise RuntimeError("telemetry down")
+
+    monkeypatch.setattr(utils._LLMCall, "succeeded", broken)
+    llm = GatedLLM()
+    leader, leader_results, waiter, waiter_results = _leader_and_waiter(llm)
+    time.sleep(0.05)
+    llm.release.set()
+    leader.join(5)
+    waiter.join(5)
+    assert isinstance(leader_results[0], RuntimeError)
+    assert waiter_results == ["shared"]
+    assert not utils._inflight
+
+
+async def _acall(llm):
+    return await utils._ainvoke_llm(llm, "same prompt", "Google", "gemini-x", "answer")
+
+
+async def _aleader_and_waiter(llm):
+    leader = asyncio.create_task(_acall(llm))
+    while not utils._inflight:
+        await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(_acall(llm))
+    await asyncio.sleep(0.05)
+    return leader, waiter
+
+
+def test_async_leader_error_reaches_waiters():
+    async def run():
+        llm = GatedLLM(errors=[ValueError("quota")])
+        leader, waiter = await _aleader_and_waiter(llm)
+        llm.release.set()
+        results = await asyncio.gather(leader, waiter, return_exceptions=True)
+        return llm, results
+
+    llm, (leader, waiter) = asyncio.run(run())
+    assert isinstance(leader, ValueError)
+    assert waiter is leader
+    assert llm.calls == 1
+    assert not utils._inflight
+
+
+def test_async_leader_cancel_lets_waiter_send_its_own():
+    async def run():
+        llm = GatedLLM()
+        leader, waiter = await _aleader_and_waiter(llm)
+        leader.cancel()
+        await asyncio.sleep(0.05)
+        llm.release.set()
+        return llm, await waiter, leader.cancelled()
+
+    llm, text, leader_cancelled = asyncio.run(run())
+    assert text == "shared"
+    assert leader_cancelled
+    assert llm.calls == 2
+    assert not utils._inflight
+
+
+def test_async_waiter_cancel_leaves_the_shared_call_running():
+    async def run():
+        llm = GatedLLM()
+        leader, waiter = await _aleader_and_waiter(llm)
+        waiter.cancel()
+        await asyncio.sleep(0.05)
+        llm.release.set()
+        return llm, await leader, waiter.cancelled()
+
+    llm, text, waiter_cancelled = asyncio.run(run())
+    assert text == "shared"
+    assert waiter_cancelled
+    assert llm.calls == 1
+    assert not utils._inflight
+
+
+def test_formatted_resume_is_reused_per_model(monkeypatch):
+    built = []
+
+    def fake_model(model, temperature, google_api_key):
+        built.append(model)
+        return StringLLM(f"formatted by {model}")
+
+    monkeypatch.setattr(utils, "GoogleGenerativeAI", fake_model)
+    monkeypatch.setattr(utils, "_formatted_resumes", utils.MemoryBackend())
+    keys = {"Google": "g"}
+
+    first = utils.format_resume_text_with_llm("Jane Doe\nEngineer", "Google", "a", keys)
+    again = utils.format_resume_text_with_llm("Jane Doe\nEngineer", "Google", "a", keys)
+    other = utils.format_resume_text_with_llm("Jane Doe\nEngineer", "Google", "b", keys)
+
+    assert first == again == "formatted by a"
+    assert other == "formatted by b"
+    assert built == ["a", "b"]
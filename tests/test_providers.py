@@ -0,0 +1,95 @@
+"""Key checks and model catalogues against a stub transport, without the network."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import providers
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(providers, "_results", {})
+
+
+def _client(handler, requests):
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+
+def _catalogues(request):
+    host = request.url.host
+    if host == "generativelanguage.googleapis.com":
+        if request.headers["x-goog-api-key"] == "bad":
+            return httpx.Response(400, json={"error": "API key not valid"})
+        return httpx.Response(
+            200,
+            json={
+                "models": [
+                    {
+                        "name": "models/gemini-1.5-flash",
+                        "supportedGenerationMethods": ["generateContent"],
+                    },
+                    {
+                        "name": "models/text-embedding-004",
+                        "supportedGenerationMethods": ["embedContent"],
+                    },
+                ]
+            },
+        )
+    if host == "api.openai.com":
+        return httpx.Response(200, json={"data": [{"id": "gpt-5"}]})
+    if host == "api.anthropic.com":
+        return httpx.Response(429)
+    return httpx.Response(404)
+
+
+def _validate(keys, requests, force=False):
+    async def run():
+        async with _client(_catalogues, requests) as client:
+            return await providers.validate_keys_async(keys, force=force, client=client)
+
+    return asyncio.run(run())
+
+
+def test_checks_every_key_and_parses_catalogues():
+    requests = []
+    results = _validate({"Google": "g", "OpenAI": "o", "Claude": "c"}, requests)
+
+    assert len(requests) == 3
+    assert results["Google"]["status"] == "valid"
+    assert results["Google"]["models"] == ["gemini-1.5-flash"]
+    assert results["OpenAI"]["models"] == ["gpt-5"]
+    assert results["Claude"]["status"] == "rate_limited"
+    assert results["Claude"]["valid"]
+
+
+def test_invalid_key_is_reported():
+    results = _validate({"Google": "bad"}, [])
+    assert results["Google"]["status"] == "invalid"
+    assert not results["Google"]["valid"]
+
+
+def test_results_are_cached_per_key():
+    requests = []
+    _validate({"Google": "g"}, requests)
+    _validate({"Google": "g"}, requests)
+    assert len(requests) == 1
+    _validate({"Google": "g"}, requests, force=True)
+    assert len(requests) == 2
+
+
+def test_available_models_follow_the_catalogue():
+    _validate({"Google": "g", "OpenAI": "o", "Claude": "c"}, [])
+    known = ["gemini-2.0-flash-exp", "gemini-1.5-flash"]
+
+    assert providers.available_models("Google", "g", known) == ["gemini-1.5-flash"]
+    # A known catalogue listing none of them leaves nothing to offer
+    assert providers.available_models("OpenAI", "o", ["gpt-4o", "gpt-4"]) == []
+    # Without a catalogue (rate limited, or not checked yet) all are offered
+    assert providers.available_models("Claude", "c", ["claude-x"]) == ["claude-x"]
+    assert providers.available_models("Google", "unchecked", known) == known
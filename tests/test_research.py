@@ -0,0 +1,212 @@
+"""End-to-end tests of the research engine against a local fixture HTTP server."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import research
+from research_cache import MemoryBackend
+
+HOME = """<html><head><title>Acme Corp</title>
+<link rel="alternate" type="application/rss+xml" href="/feed"></head>
+<body><nav>Menu Login</nav>
+<main><p>Acme builds rockets for small satellite operators.</p></main>
+<footer>Copyright</footer></body></html>"""
+ABOUT = """<html><head><title>About Acme</title></head>
+<body><article><p>Our mission is reliable access to space.</p></article></body></html>"""
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>Acme blog</title>
+<item><title>Acme launches Falcon Mini</title><link>http://x/1</link>
+<pubDate>Mon, 05 Oct 2026 10:00:00 GMT</pubDate><description>First flight.</description></item>
+<item><title>Acme opens Berlin office</title><link>http://x/2</link></item>
+</channel></rss>"""
+NEWS = """<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">
+<entry><title>Acme raises Series B</title><link href="http://news/1"/>
+<updated>2026-10-01</updated></entry></feed>"""
+ROBOTS = "User-agent: *\nDisallow: /careers\n"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        path = self.path.split("?")[0]
+        if path == server.slow_path:
+            time.sleep(server.slow_seconds)
+        if path == "/robots.txt":
+            return self._send(200, "text/plain", ROBOTS)
+        if path == "/":
+            if self.headers.get("If-None-Match") == '"home-v1"':
+                return self._send(304, "text/html", "")
+            return self._send(200, "text/html", HOME, etag='"home-v1"')
+        if path in ("/about", server.slow_path):
+            return self._send(200, "text/html; charset=utf-8", ABOUT)
+        if path in server.redirects:
+            self.send_response(302)
+            self.send_header("Location", server.redirects[path])
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+        if path == "/careers":
+            return self._send(200, "text/html", "<main>Jobs at Acme are great.</main>")
+        if path == "/feed":
+            return self._send(200, "application/rss+xml", FEED)
+        if path == "/news":
+            return self._send(200, "application/atom+xml", NEWS)
+        return self._send(404, "text/plain", "not found")
+
+    def _send(self, status, content_type, body, etag=None):
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    httpd.slow_path = None
+    httpd.slow_seconds = 0
+    httpd.redirects = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _research(server, sources=None, website=None):
+    async def run():
+        # The fixture server is on loopback, which research refuses by default
+        async with research.ResearchFetcher(allow_private=True) as fetcher:
+            return await research.research_company_async(
+                "Acme",
+                website=website or server.base,
+                fetcher=fetcher,
+                news_feeds=[server.base + "/news?q={query}"],
+                sources=sources,
+            )
+
+    return asyncio.run(run())
+
+
+def _fetch(url):
+    async def run():
+        async with research.ResearchFetcher(allow_private=True) as fetcher:
+            return await fetcher.fetch(url)
+
+    return asyncio.run(run())
+
+
+def _paths(server):
+    return [path.split("?")[0] for path, _ in server.requests]
+
+
+def test_fetches_pages_and_feeds_and_respects_robots(server):
+    result = _research(server)
+    by_kind = {}
+    for doc in result["documents"]:
+        by_kind.setdefault(doc["kind"], []).append(doc)
+
+    texts = [doc["text"] for doc in by_kind["page"]]
+    assert "Acme builds rockets for small satellite operators." in texts
+    assert "Our mission is reliable access to space." in texts
+    assert not any("Menu" in text or "Copyright" in text for text in texts)
+    assert [item["title"] for item in by_kind["feed"][0]["items"]] == [
+        "Acme launches Falcon Mini",
+        "Acme opens Berlin office",
+    ]
+    assert by_kind["news"][0]["items"][0]["title"] == "Acme raises Series B"
+
+    assert "/careers" not in _paths(server)
+    assert _paths(server).count("/robots.txt") == 1
+    assert not any("Jobs at Acme" in doc["text"] for doc in result["documents"])
+
+
+def test_refresh_revalidates_with_etag_and_keeps_document(server):
+    sources = MemoryBackend()
+    first = _research(server, sources)
+    server.requests.clear()
+    second = _research(server, sources)
+
+    home_headers = [headers for path, headers in server.requests if path == "/"]
+    assert home_headers[0].get("If-None-Match") == '"home-v1"'
+    assert second["refresh_stats"]["not_modified"] >= 1
+    assert [doc["text"] for doc in second["documents"]] == [
+        doc["text"] for doc in first["documents"]
+    ]
+
+
+def test_deadline_keeps_documents_already_fetched(server, monkeypatch):
+    server.slow_path = "/company"
+    server.slow_seconds = 2
+    monkeypatch.setattr(research, "RESEARCH_DEADLINE", 0.5)
+    result = _research(server)
+
+    texts = [doc["text"] for doc in result["documents"]]
+    assert "Acme builds rockets for small satellite operators." in texts
+    assert result["refresh_stats"]["timed_out"] >= 1
+
+
+def test_refuses_websites_on_private_addresses(server):
+    # A "website" pointing back at the server itself, as a user could type it
+    result = asyncio.run(
+        research.research_company_async(
+            "Acme", website=server.base + "/admin#", news_feeds=[]
+        )
+    )
+    assert result["documents"] == []
+    assert server.requests == []
+    assert _fetch("file:///etc/passwd")["status"] == "blocked"
+
+
+def test_website_query_and_fragment_are_dropped(server):
+    _research(server, website=server.base + "/?x=1#top")
+    assert "/about" in _paths(server)
+    assert not any("#" in path or "x=1" in path for path, _ in server.requests)
+
+
+def test_redirects_are_checked_hop_by_hop(server):
+    server.redirects = {"/old-about": "/about", "/jobs": "/careers"}
+
+    moved = _fetch(server.base + "/old-about")
+    assert moved["status"] == 200
+    assert moved["url"] == server.base + "/about"
+    # robots.txt disallows the redirect target
+    assert _fetch(server.base + "/jobs")["status"] == "robots"
+    assert "/careers" not in _paths(server)
+
+
+class FixtureOnlyFetcher(research.ResearchFetcher):
+    """Treats the fixture server as a public host, and nothing else on loopback."""
+
+    def __init__(self, port):
+        super().__init__()
+        self.port = port
+
+    async def _resolves_public(self, host, port):
+        return port == self.port or await super()._resolves_public(host, port)
+
+
+def test_redirects_to_private_addresses_are_refused(server):
+    server.redirects = {"/out": "http://localhost:1/admin"}
+
+    async def run():
+        async with FixtureOnlyFetcher(server.server_address[1]) as fetcher:
+            return await fetcher.fetch(server.base + "/out")
+
+    assert asyncio.run(run())["status"] == "blocked"
+    assert "/out" in _paths(server)
@@ -0,0 +1,49 @@
+"""The résumé index and the facts it picks out for each question."""
+
+from resume_index import build_resume_index, relevant_highlights
+
+RESUME = """Jane Doe
+jane@example.com | 555 0100
+
+## Experience
+Engineering Manager, Acme | Jan 2021 - Present
+- Grew the platform team from 4 to 12 engineers
+- Cut cloud costs by 30% by rightsizing clusters
+Backend Engineer, Initech | 2017 - 2020
+- Reduced checkout latency by 45% with caching
+
+SKILLS
+Python, Kubernetes, PostgreSQL; Team leadership
+"""
+
+
+def test_index_holds_roles_skills_and_metrics():
+    index = build_resume_index(RESUME)
+
+    assert [role["title"] for role in index["roles"]] == [
+        "Engineering Manager, Acme",
+        "Backend Engineer, Initech",
+    ]
+    assert index["roles"][0]["end"] == "Present"
+    assert index["skills"] == ["Kubernetes", "PostgreSQL", "Python", "Team leadership"]
+    contexts = [metric["context"] for metric in index["metrics"]]
+    assert "Cut cloud costs by 30% by rightsizing clusters" in contexts
+    # Contact details in the header aren't results
+    assert not any("555" in context for context in contexts)
+
+
+def test_highlights_follow_the_question():
+    index = build_resume_index(RESUME)
+
+    costs = relevant_highlights(index, "How have you reduced cloud costs?")
+    assert costs[0] == "Cut cloud costs by 30% by rightsizing clusters"
+
+    team = relevant_highlights(index, "Tell me about growing a team.")
+    assert team[0] == "Grew the platform team from 4 to 12 engineers"
+    assert team[-1] == "Skills: Team leadership"
+
+
+def test_no_highlights_for_unrelated_questions():
+    index = build_resume_index(RESUME)
+    assert relevant_highlights(index, "Why do you want this job?") == []
+    assert relevant_highlights(build_resume_index(""), "Cloud costs?") == []
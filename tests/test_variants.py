@@ -0,0 +1,23 @@
+"""Splitting one model answer into its ``### Variant k`` sections."""
+
+from utils import split_variants
+
+
+def test_splits_on_variant_headings():
+    text = "### Variant 1\nFirst answer.\n\n### Variant 2:\nSecond answer."
+    assert split_variants(text, 2) == ["First answer.", "Second answer."]
+
+
+def test_drops_preamble_before_the_first_heading():
+    text = "Here are two versions:\n### Variant 1\nA\n### Variant 2\nB"
+    assert split_variants(text, 2) == ["A", "B"]
+
+
+def test_keeps_at_most_the_requested_variants():
+    text = "## Variant 1\nA\n## Variant 2\nB\n## Variant 3\nC"
+    assert split_variants(text, 2) == ["A", "B"]
+
+
+def test_text_without_headings_is_one_variant():
+    assert split_variants("  Just one answer.\n", 3) == ["Just one answer."]
+    assert split_variants("Kept as is", 1) == ["Kept as is"]
@@ -0,0 +1,44 @@
+"""Warm-up jobs: who shares them, and what they do without a résumé."""
+
+import warmup
+
+
+class EmptyPrefetch:
+    """A prefetch job whose extraction found no text."""
+
+    key = "resume-hash"
+    file_name = "resume.pdf"
+
+    def extracted_text(self):
+        return ""
+
+
+INPUTS = dict(
+    role="SRE",
+    company="Acme",
+    company_website="",
+    company_info="",
+    word_limit=100,
+    model_provider="Google",
+    model_name="gemini-x",
+)
+
+
+def _warm_up(session_id, api_key):
+    return warmup.warm_up(
+        EmptyPrefetch(), session_id, api_keys_dict={"Google": api_key}, **INPUTS
+    )
+
+
+def test_jobs_are_per_session_and_api_key():
+    first = _warm_up("session-a", "key-1")
+    assert _warm_up("session-a", "key-1") is first
+    assert _warm_up("session-b", "key-1").key != first.key
+    assert _warm_up("session-a", "key-2").key != first.key
+
+
+def test_missing_resume_is_reported():
+    job = _warm_up("session-c", "key-1")
+    job.future.result(timeout=5)
+    assert job.resume == "missing"
+    assert job.done == 0
@@ -1,17 +1,337 @@
+import asyncio
+import hashlib
 import os
-import io
 import json
-from langchain_google_genai import GoogleGenerativeAI
+import re
+import threading
+import time
+from concurrent.futures import Future
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from PyPDF2 import PdfReader
-from docx import Document
+from langchain_core.prompt_values import StringPromptValue
 import streamlit as st
 
+from answer_cache import answer_key, get_answer_cache
+from company_brief import get_company_brief, token_budget
+from budget import Budget, BudgetExceeded
+from estimator import (
+    DEFAULT_CONCURRENCY,
+    cheapest_model,
+    estimate_run,
+    model_profile,
+)
+from extraction import extract_docx_text, extract_pdf_text
+from research import research_company, format_research
+from research_cache import (
+    MemoryBackend,
+    get_research_cache,
+    get_source_store,
+    normalize_company,
+)
+from research_index import get_research_index
+from resume_index import count_tokens, get_resume_index, relevant_highlights
+import telemetry
 
-def generate_answers(
+# Providers that return several candidates for one prompt; the rest are asked
+# for all variants in a single answer, split on VARIANT_HEADING
+NATIVE_VARIANTS = ("Google", "OpenAI")
+MAX_VARIANTS = 3
+VARIANT_HEADING = re.compile(r"^\s*#+\s*Variant\s+\d+\s*:?\s*$", re.M | re.I)
+
+# Formatted résumés by extracted text and model. Answers are cached by their
+# full prompt, so they can only be reused if the résumé is formatted the same
+# way every time, with or without a prefetch job.
+_formatted_resumes = MemoryBackend(max_entries=64)
+
+
+class _LLMCall:
+    """Budget reservation and telemetry around one model call.
+
+    With a ``budget`` the call's ``(input_tokens, output_tokens)`` estimate is
+    reserved first, which raises BudgetExceeded instead of calling the model
+    when a cap would break; the reservation is settled with reported usage.
+    """
+
+    def __init__(
+        self, prompt_text, provider, model_name, kind, word_limit, budget, estimate
+    ):
+        self.prompt_text = prompt_text
+        self.provider = provider
+        self.model_name = model_name
+        self.kind = kind
+        self.word_limit = word_limit
+        self.budget = budget
+        self.estimate = estimate
+        self.reservation = (
+            budget.reserve(*estimate, model=model_name) if budget is not None else None
+        )
+        self.started = time.perf_counter()
+
+    def _record(self, **usage):
+        telemetry.record_call(
+            self.provider,
+            self.model_name,
+            self.kind,
+            count_tokens(self.prompt_text),
+            time.perf_counter() - self.started,
+            word_limit=self.word_limit,
+            **usage,
+        )
+
+    def _settle(self, input_tokens, output_tokens):
+        self.budget.settle(
+            self.reservation, input_tokens, output_tokens, model=self.model_name
+        )
+
+    def failed(self):
+        self._record(ok=False)
+        if self.reservation is not None:
+            self._settle(0, 0)
+
+    def cancelled(self):
+        # Not a failure of the model, so the estimator doesn't learn from it
+        if self.reservation is not None:
+            self._settle(0, 0)
+
+    def succeeded(self, text, usage):
+        usage = usage or {}
+        self._record(
+            input_tokens=usage.get("input_tokens"),
+            output_tokens=usage.get("output_tokens"),
+        )
+        # Only budgeted calls have an estimate to fall back on
+        if self.reservation is not None:
+            self._settle(
+                usage.get("input_tokens") or self.estimate[0],
+                usage.get("output_tokens")
+                or count_tokens("\n".join(text) if isinstance(text, list) else text),
+            )
+        return text
+
+
+def _response_text(response):
+    """Text and usage of an invoke() result; only chat models report usage."""
+    return getattr(response, "content", response), getattr(
+        response, "usage_metadata", None
+    )
+
+
+def _candidate_texts(result):
+    """Texts and usage of an LLMResult holding several candidates for one prompt."""
+    generations = result.generations[0]
+    # Every candidate carries the usage of the whole request
+    first = generations[0]
+    usage = getattr(getattr(first, "message", None), "usage_metadata", None) or (
+        first.generation_info or {}
+    ).get("usage_metadata")
+    return [generation.text for generation in generations], usage
+
+
+class _LeaderCancelled(Exception):
+    """The shared call was cancelled by the caller that sent it; waiters retry."""
+
+
+# Single flight: identical requests in flight share one upstream call. A caller
+# that has waited COALESCE_WAIT_SECONDS on one gives up and sends its own.
+COALESCE_WAIT_SECONDS = 180
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _flight_key(provider, model_name, kind, n, prompt_text):
+    return hashlib.sha256(
+        f"{provider}\x00{model_name}\x00{kind}\x00{n}\x00{prompt_text}".encode()
+    ).hexdigest()
+
+
+def _join_or_send(key, start_call):
+    """Returns ``(shared, call)``: the in-flight future for ``key`` and None to
+    wait on it, or a new future and ``start_call()`` to send the request."""
+    with _inflight_lock:
+        shared = _inflight.get(key)
+        if shared is not None:
+            return shared, None
+        # Reserves budget; raising here registers nothing
+        call = start_call()
+        shared = _inflight[key] = Future()
+        return shared, call
+
+
+def _land(key, shared, result=None, error=None):
+    with _inflight_lock:
+        # A caller that gave up waiting sends outside the slot; leave the
+        # request it gave up on registered
+        if _inflight.get(key) is shared:
+            del _inflight[key]
+    if error is not None:
+        shared.set_exception(error)
+    else:
+        shared.set_result(result)
+
+
+def _shared_result(text):
+    return list(text) if isinstance(text, list) else text
+
+
+def _invoke_llm(
+    llm,
+    prompt_text,
+    provider,
+    model_name,
+    kind,
+    word_limit=None,
+    budget=None,
+    estimate=None,
+    n=1,
+):
+    """Calls the model once and records token usage and latency for the estimator.
+
+    Spend is checked against ``budget`` as described in _LLMCall. With ``n``
+    above 1 the model (built with ``n`` set) returns that many candidates for
+    the one prompt, and a list of their texts is returned. A byte-identical
+    request already in flight, from any session, is joined instead of sent
+    again; joining costs nothing and is recorded as coalesced.
+    """
+    key = _flight_key(provider, model_name, kind, n, prompt_text)
+
+    def start_call():
+        return _LLMCall(
+            prompt_text, provider, model_name, kind, word_limit, budget, estimate
+        )
+
+    while True:
+        shared, call = _join_or_send(key, start_call)
+        if call is not None:
+            break
+        try:
+            text = shared.result(timeout=COALESCE_WAIT_SECONDS)
+        except _LeaderCancelled:
+            continue
+        except TimeoutError:
+            if shared.done():
+                raise
+            shared, call = Future(), start_call()
+            break
+        telemetry.record_coalesced(provider, model_name, kind)
+        return _shared_result(text)
+    try:
+        if n > 1:
+            text, usage = _candidate_texts(
+                llm.generate_prompt([StringPromptValue(text=prompt_text)])
+            )
+        else:
+            text, usage = _response_text(llm.invoke(prompt_text))
+    except Exception as e:
+        # Waiters are released first; recording can't be allowed to strand them
+        _land(key, shared, error=e)
+        call.failed()
+        raise
+    except BaseException:
+        _land(key, shared, error=_LeaderCancelled())
+        call.cancelled()
+        raise
+    _land(key, shared, result=text)
+    call.succeeded(text, usage)
+    return _shared_result(text)
+
+
+async def _ainvoke_llm(
+    llm,
+    prompt_text,
+    provider,
+    model_name,
+    kind,
+    word_limit=None,
+    budget=None,
+    estimate=None,
+    n=1,
+):
+    """Async version of _invoke_llm. Cancelling the awaiting task aborts the
+    request to the provider and releases its budget reservation; callers that
+    joined it send their own. Telemetry is written from a worker thread, so
+    the SQLite commits don't hold up the shared event loop."""
+    key = _flight_key(provider, model_name, kind, n, prompt_text)
+
+    def start_call():
+        return _LLMCall(
+            prompt_text, provider, model_name, kind, word_limit, budget, estimate
+        )
+
+    while True:
+        shared, call = _join_or_send(key, start_call)
+        if call is not None:
+            break
+        try:
+            # Shielded: a waiter being cancelled mustn't cancel the shared call
+            text = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(shared)), COALESCE_WAIT_SECONDS
+            )
+        except _LeaderCancelled:
+            continue
+        except TimeoutError:
+            if shared.done():
+                raise
+            shared, call = Future(), start_call()
+            break
+        await asyncio.to_thread(telemetry.record_coalesced, provider, model_name, kind)
+        return _shared_result(text)
+    try:
+        if n > 1:
+            text, usage = _candidate_texts(
+                await llm.agenerate_prompt([StringPromptValue(text=prompt_text)])
+            )
+        else:
+            text, usage = _response_text(await llm.ainvoke(prompt_text))
+    except asyncio.CancelledError:
+        _land(key, shared, error=_LeaderCancelled())
+        call.cancelled()
+        raise
+    except Exception as e:
+        # Waiters are released first; recording can't be allowed to strand them
+        _land(key, shared, error=e)
+        await asyncio.to_thread(call.failed)
+        raise
+    _land(key, shared, result=text)
+    await asyncio.to_thread(call.succeeded, text, usage)
+    return _shared_result(text)
+
+
+def _adapter_llm(model_provider, model_name, api_keys_dict):
+    """The model used to adapt saved answers; keys were checked by the caller."""
+    if model_provider == "Google":
+        return ChatGoogleGenerativeAI(
+            model=model_name,
+            temperature=0.3,
+            google_api_key=api_keys_dict["Google"],
+        )
+    if model_provider == "OpenAI":
+        return ChatOpenAI(
+            model_name=model_name,
+            temperature=0.3,
+            openai_api_key=api_keys_dict["OpenAI"],
+        )
+    return ChatAnthropic(
+        model=model_name,
+        temperature=0.3,
+        anthropic_api_key=api_keys_dict["Claude"],
+    )
+
+
+def split_variants(text, variants):
+    """Splits an answer written as ``### Variant k`` sections into their texts;
+    text without those headings is a single variant. Anything the model wrote
+    before the first heading is not a variant and is dropped."""
+    if variants <= 1:
+        return [text]
+    # The first part is whatever precedes the first heading
+    parts = VARIANT_HEADING.split(text)[1:]
+    parts = [part.strip() for part in parts if part.strip()]
+    return parts[:variants] if parts else [text.strip()]
+
+
+async def generate_answers_async(
     resume_text,
     role,
     company,
@@ -21,21 +341,67 @@ def generate_answers(
     model_name,
     api_keys_dict,
     user_company_knowledge="",
-    company_research="",
+    company_research=(),
+    max_concurrency=DEFAULT_CONCURRENCY,
+    budget=None,
+    reuse=True,
+    variants=1,
+    library=None,
+    resume_hash=None,
+    on_answer=None,
 ):
-    """Generates answers to interview questions based on the resume and inputs."""
+    """Generates answers to interview questions based on the resume and inputs.
+
+    ``company_research`` is the list of research documents from
+    get_company_research; each prompt gets a brief of them, or the snippets
+    most relevant to its question. Each prompt also points out the résumé's
+    results, roles and skills that share words with its question.
+
+    Up to ``max_concurrency`` questions are sent to the model at once; answers
+    come back in question order. Spend caps (``budget``, or the caps from the
+    environment) are checked against estimates before anything is sent and
+    against reported usage as answers come in. Questions that would break a
+    cap are returned with ``"skipped": True`` and the reason as their answer.
+
+    Answers are cached by a hash of the model and the question's full prompt,
+    so asking again only calls the model for new or changed questions; those
+    reused are marked ``"reused": True``. Pass ``reuse=False`` to regenerate.
+
+    With ``variants`` above 1 each answer also has ``"variants"``, that many
+    alternative phrasings from one request per question: Google and OpenAI
+    return several candidates natively, other models are asked for all of
+    them in one answer. ``"answer"`` is the first.
+
+    With an answer ``library`` (see answer_library.py) and the ``resume_hash``
+    of the uploaded résumé, questions not in the cache are looked up among the
+    answers saved for that résumé first: a near-identical question saved for
+    the same role and company reuses its answer, and a similar one is adapted
+    by the provider's cheapest model instead of answered from scratch. Such
+    answers have ``"library"`` set to ``"reused"`` or ``"adapted"``. Like the
+    cache, the library is skipped when ``reuse`` is False.
+
+    ``on_answer(index, answer)`` is called as each answer is ready, so callers
+    keep the answers that arrived if the run is cancelled. Cancelling aborts
+    the requests in flight.
+    """
     if not questions_list:
         return []
 
+    resume_prompt_text = resume_text.strip()
+    variants = max(1, min(int(variants), MAX_VARIANTS))
+    native_variants = variants if model_provider in NATIVE_VARIANTS else 1
+
     llm = None
     try:
         if model_provider == "Google":
             if not api_keys_dict.get("Google"):
                 raise ValueError("Google API Key not provided.")
-            llm = GoogleGenerativeAI(
+            # The chat model has a native async client, so cancelling aborts it
+            llm = ChatGoogleGenerativeAI(
                 model=model_name,
                 temperature=0.3,
                 google_api_key=api_keys_dict["Google"],
+                n=native_variants,
             )
         elif model_provider == "OpenAI":
             if not api_keys_dict.get("OpenAI"):
@@ -44,6 +410,7 @@ def generate_answers(
                 model_name=model_name,
                 temperature=0.3,
                 openai_api_key=api_keys_dict["OpenAI"],
+                n=native_variants,
             )
         elif model_provider == "Claude":
             if not api_keys_dict.get("Claude"):
@@ -92,14 +459,34 @@ def generate_answers(
             {"question": q, "answer": f"Error: {error_msg}"} for q in questions_list
         ]
 
-    # Build context about the company
-    company_context = ""
-    if user_company_knowledge.strip():
-        company_context += f"\n\nAdditional information about {company}:\n{user_company_knowledge.strip()}"
-    if company_research.strip():
-        company_context += (
-            f"\n\nResearch findings about {company}:\n{company_research.strip()}"
-        )
+    # Build context about the company, compacted once into a bounded brief
+    # Generation runs on an event loop shared by every session, so anything
+    # that builds indexes or reads SQLite runs in a worker thread
+    company_research = list(company_research or ())
+    user_company_knowledge = user_company_knowledge.strip()
+    company_brief, notes_brief, research_index = await asyncio.to_thread(
+        _company_context, company, company_research, user_company_knowledge
+    )
+    # What used to be sent with every question: the research preview and notes
+    full_context_tokens = count_tokens(format_research(company_research)) + (
+        count_tokens(user_company_knowledge)
+    )
+
+    def context_for(question):
+        """The user's notes plus the research snippets relevant to this question,
+        or the general brief when nothing matches."""
+        brief = company_brief
+        if research_index is not None:
+            snippets = research_index.top_snippets(
+                question, token_budget() - count_tokens(notes_brief)
+            )
+            if snippets:
+                brief = "\n".join(
+                    [notes_brief] * bool(notes_brief)
+                    + ["Relevant research:"]
+                    + [f"- {snippet}" for snippet in snippets]
+                )
+        return f"\n\nWhat we know about {company}:\n{brief}" if brief else ""
 
     template = """
     You are an expert interview coach and career advisor.
@@ -107,7 +494,7 @@ def generate_answers(
     Below is the candidate’s résumé (Markdown):
     ```
     {resume}
-    ```
+    ```{resume_highlights}
 
     They are applying for the role of **{role}** at **{company}**{company_context}.
 
@@ -123,7 +510,7 @@ def generate_answers(
     • Include metrics or outcomes whenever possible  
     • Tie back to the company’s mission, values or culture  
     3. Maintain a professional, confident tone.
-    4. If no {company_context} is provided, skip references to company culture.
+    4. If no {company_context} is provided, skip references to company culture.{variant_instructions}
 
     Answer:
     """
@@ -131,33 +518,258 @@ def generate_answers(
     prompt = PromptTemplate(
         input_variables=[
             "resume",
+            "resume_highlights",
             "role",
             "company",
             "company_context",
             "question",
             "word_limit",
+            "variant_instructions",
         ],
         template=template,
     )
-    chain = LLMChain(llm=llm, prompt=prompt)
 
-    results = []
-    for q in questions_list:
+    budget = budget or await asyncio.to_thread(Budget, model_provider, model_name)
+    profile = await asyncio.to_thread(model_profile, model_provider, model_name)
+    variant_instructions = ""
+    if variants > native_variants:
+        variant_instructions = (
+            f"\n    5. Write {variants} distinct versions of the answer that differ "
+            "in opening and emphasis. Put a line with only `### Variant k` "
+            f"(k = 1 to {variants}) before each version."
+        )
+
+    resume_index = await asyncio.to_thread(get_resume_index, resume_prompt_text)
+
+    def highlights_for(question):
+        """The résumé's results, roles and skills that bear on this question."""
+        highlights = relevant_highlights(resume_index, question)
+        if not highlights:
+            return ""
+        return "\n\n    Most relevant to this question:\n" + "\n".join(
+            f"    - {line}" for line in highlights
+        )
+
+    def build_call(q):
+        company_context = context_for(q)
+        prompt_text = prompt.format(
+            resume=resume_prompt_text,
+            resume_highlights=highlights_for(q),
+            role=role,
+            company=company,
+            company_context=company_context,
+            question=q,
+            word_limit=word_limit,
+            variant_instructions=variant_instructions,
+        )
+        estimate = (
+            int(count_tokens(prompt_text) * profile["input_ratio"]),
+            int(word_limit * variants * profile["output_tokens_per_word"]),
+        )
+        return (
+            q,
+            count_tokens(company_context),
+            prompt_text,
+            estimate,
+            answer_key(model_provider, model_name, prompt_text, native_variants),
+        )
+
+    # Research snippets and résumé highlights are searched per question
+    calls = await asyncio.to_thread(lambda: [build_call(q) for q in questions_list])
+
+    def skipped(q, reason):
+        return {
+            "question": q,
+            "answer": f"Skipped: answering this question would exceed {reason}.",
+            "skipped": True,
+        }
+
+    async def answer_question(call):
+        q, context_tokens, prompt_text, estimate, key = call
         try:
-            answer = chain.run(
-                resume=resume_text,
-                role=role,
-                company=company,
-                company_context=company_context,
-                question=q,
-                word_limit=word_limit,
+            answer = await _ainvoke_llm(
+                llm,
+                prompt_text,
+                model_provider,
+                model_name,
+                "answer",
+                # The estimator learns output length per requested word
+                word_limit=word_limit * variants,
+                budget=budget,
+                estimate=estimate,
+                n=native_variants,
             )
-            results.append({"question": q, "answer": answer})
+            texts = answer if native_variants > 1 else split_variants(answer, variants)
+            result = {
+                "question": q,
+                "answer": texts[0],
+                "context_tokens": context_tokens,
+                "context_tokens_saved": max(full_context_tokens - context_tokens, 0),
+            }
+            if variants > 1:
+                result["variants"] = texts
+            cache.set(key, result, time.time())
+            return result
+        except BudgetExceeded as e:
+            return skipped(q, e)
         except Exception as e:
-            results.append({"question": q, "answer": f"Error generating answer: {e}"})
+            return {"question": q, "answer": f"Error generating answer: {e}"}
+
+    adapt_prompt = PromptTemplate(
+        input_variables=[
+            "saved_question",
+            "saved_answer",
+            "role",
+            "company",
+            "question",
+            "word_limit",
+        ],
+        template="""
+    You are an expert interview coach. The candidate answered a similar interview question before.
+
+    Earlier question:
+    {saved_question}
+
+    Earlier answer:
+    {saved_answer}
+
+    Adapt that answer to the question below for the role of **{role}** at **{company}**.
+    Keep the candidate's facts, achievements and metrics; change only what the new
+    question, role or company call for, and stay within {word_limit} words.
+
+    Question:
+    {question}
+
+    Answer:
+    """,
+    )
+    adapter_model = cheapest_model(model_provider) or model_name
+
+    async def adapt(call, entry):
+        q, *_, key = call
+        prompt_text = adapt_prompt.format(
+            saved_question=entry["question"],
+            saved_answer=entry["answer"],
+            role=role,
+            company=company,
+            question=q,
+            word_limit=word_limit,
+        )
+        adapter = _adapter_llm(model_provider, adapter_model, api_keys_dict)
+        try:
+            answer = await _ainvoke_llm(
+                adapter,
+                prompt_text,
+                model_provider,
+                adapter_model,
+                "adapt",
+                word_limit=word_limit,
+                budget=budget,
+                estimate=(
+                    count_tokens(prompt_text),
+                    int(word_limit * adapter_profile["output_tokens_per_word"]),
+                ),
+            )
+        except BudgetExceeded as e:
+            return skipped(q, e)
+        except Exception:
+            # Answer from scratch when the adaptation fails
+            return await answer_question(call)
+        result = {
+            "question": q,
+            "answer": answer,
+            "library": "adapted",
+            "library_id": entry["id"],
+        }
+        cache.set(key, result, time.time())
+        return result
+
+    cache = get_answer_cache()
+    results = [None] * len(calls)
+    pending = []
+    for i, (*_, key) in enumerate(calls):
+        cached = cache.get(key) if reuse else None
+        if cached is not None:
+            results[i] = {**cached[0], "reused": True}
+        else:
+            pending.append(i)
+
+    # Saved answers stand in for model calls; variants need fresh phrasings
+    adaptations = []
+    if library is not None and resume_hash and reuse and variants == 1:
+        outcomes = await asyncio.to_thread(
+            lambda: [
+                library.match(calls[i][0], role, company, resume_hash) for i in pending
+            ]
+        )
+        remaining = []
+        for i, (outcome, entry) in zip(pending, outcomes):
+            if outcome == "reused":
+                results[i] = {
+                    "question": calls[i][0],
+                    "answer": entry["answer"],
+                    "library": "reused",
+                    "library_id": entry["id"],
+                }
+            elif outcome == "adapted":
+                adaptations.append((i, entry))
+            else:
+                remaining.append(i)
+        pending = remaining
+    if adaptations:
+        adapter_profile = await asyncio.to_thread(
+            model_profile, model_provider, adapter_model
+        )
+
+    # Pre-flight: only dispatch the questions whose estimates fit every cap
+    allowed, reason = budget.preflight([calls[i][3] for i in pending])
+    for i in pending[allowed:]:
+        results[i] = skipped(calls[i][0], reason)
+    for i, result in enumerate(results):
+        if result is not None and on_answer:
+            on_answer(i, result)
+
+    jobs = [(i, answer_question, (calls[i],)) for i in pending[:allowed]]
+    jobs += [(i, adapt, (calls[i], entry)) for i, entry in adaptations]
+    if jobs:
+        started = time.perf_counter()
+        concurrency = max(1, min(int(max_concurrency), len(jobs)))
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run(i, job, args):
+            async with slots:
+                results[i] = await job(*args)
+            if on_answer:
+                on_answer(i, results[i])
+
+        await asyncio.gather(*(run(i, job, args) for i, job, args in jobs))
+        await asyncio.to_thread(
+            telemetry.record_run,
+            model_provider,
+            model_name,
+            len(jobs),
+            concurrency,
+            time.perf_counter() - started,
+        )
     return results
 
 
+def _company_context(company, documents, notes):
+    """The company brief, a brief of the user's notes alone, and the research
+    index (None without research)."""
+    return (
+        get_company_brief(company, documents, notes),
+        get_company_brief(company, (), notes),
+        get_research_index(documents) if documents else None,
+    )
+
+
+def generate_answers(*args, **kwargs):
+    """Synchronous wrapper around generate_answers_async, for threads without a
+    running event loop."""
+    return asyncio.run(generate_answers_async(*args, **kwargs))
+
+
 def process_document(file_bytes, file_name):
     """Extracts text from uploaded TXT, MD, PDF, or DOCX file."""
     file_extension = os.path.splitext(file_name)[1].lower()
@@ -166,13 +778,9 @@ def process_document(file_bytes, file_name):
         if file_extension == ".txt" or file_extension == ".md":
             raw_text = file_bytes.decode()
         elif file_extension == ".pdf":
-            pdf_reader = PdfReader(io.BytesIO(file_bytes))
-            for page in pdf_reader.pages:
-                raw_text += page.extract_text() or ""
+            raw_text = extract_pdf_text(file_bytes)
         elif file_extension == ".docx":
-            doc = Document(io.BytesIO(file_bytes))
-            for para in doc.paragraphs:
-                raw_text += para.text + "\n"
+            raw_text = extract_docx_text(file_bytes)
         else:
             st.error(
                 f"Unsupported file type: {file_extension}. Please upload TXT, MD, PDF, or DOCX."
@@ -185,9 +793,20 @@ def process_document(file_bytes, file_name):
 
 
 def format_resume_text_with_llm(raw_text, model_provider, model_name, api_keys_dict):
-    """Formats the extracted resume text using an LLM."""
+    """Formats the extracted resume text using an LLM.
+
+    Successful results are kept per (extracted text, provider, model), so a
+    résumé is only formatted once per model; on errors the raw text is returned
+    and nothing is kept.
+    """
     if not raw_text.strip():
         return ""
+    format_key = "\x00".join(
+        (hashlib.sha256(raw_text.encode()).hexdigest(), model_provider, model_name)
+    )
+    cached = _formatted_resumes.get(format_key)
+    if cached is not None:
+        return cached[0]
     llm = None
     try:
         if model_provider == "Google":
@@ -240,9 +859,17 @@ def format_resume_text_with_llm(raw_text, model_provider, model_name, api_keys_d
             input_variables=["raw_resume_text"],
             template=template,
         )
-        chain = LLMChain(llm=llm, prompt=prompt)
-        formatted_text = chain.run(raw_resume_text=raw_text)
-        return formatted_text.strip()
+        formatted_text = _invoke_llm(
+            llm,
+            prompt.format(raw_resume_text=raw_text),
+            model_provider,
+            model_name,
+            "format",
+        )
+        formatted_text = formatted_text.strip()
+        if formatted_text:
+            _formatted_resumes.set(format_key, formatted_text, time.time())
+        return formatted_text
 
     except ValueError as ve:
         error_msg = str(ve)
@@ -271,59 +898,41 @@ def format_resume_text_with_llm(raw_text, model_provider, model_name, api_keys_d
         return raw_text  # Return original text on other errors
 
 
-def estimate_cost(provider, model_name, resume_length, num_questions, word_limit):
-    """Estimate the cost of using different providers."""
-
-    # Rough token estimates (1 token ≈ 0.75 words)
-    resume_tokens = resume_length // 4 * 5  # Resume tokens (input)
-    question_tokens = num_questions * 50  # Question tokens (input)
-    answer_tokens = num_questions * word_limit * 1.3  # Answer tokens (output)
-
-    total_input_tokens = resume_tokens + question_tokens
-    total_output_tokens = answer_tokens
-
-    # Pricing per 1M tokens (approximate, as of 2025)
-    pricing = {
-        "Google": {
-            "gemini-2.0-flash-exp": {"input": 0.075, "output": 0.30},
-            "gemini-1.5-pro-latest": {"input": 3.50, "output": 10.50},
-            "gemini-1.5-pro": {"input": 3.50, "output": 10.50},
-            "gemini-1.5-flash": {"input": 0.075, "output": 0.30},
-            "gemini-1.5-flash-8b": {"input": 0.0375, "output": 0.15},
-        },
-        "OpenAI": {
-            "gpt-4o": {"input": 2.50, "output": 10.00},
-            "gpt-4o-mini": {"input": 0.15, "output": 0.60},
-            "gpt-4-turbo": {"input": 10.00, "output": 30.00},
-            "gpt-4": {"input": 30.00, "output": 60.00},
-            "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
-        },
-        "Claude": {
-            "claude-3-5-sonnet-20241022": {"input": 3.00, "output": 15.00},
-            "claude-3-5-haiku-20241022": {"input": 0.25, "output": 1.25},
-            "claude-3-opus-20240229": {"input": 15.00, "output": 75.00},
-            "claude-3-sonnet-20240229": {"input": 3.00, "output": 15.00},
-            "claude-3-haiku-20240307": {"input": 0.25, "output": 1.25},
-        },
-    }
-
-    if provider not in pricing or model_name not in pricing[provider]:
-        return "Cost estimation not available"
+def estimate_cost(
+    provider,
+    model_name,
+    resume_length,
+    num_questions,
+    word_limit,
+    resume_tokens=None,
+):
+    """Estimate the cost of using different providers.
 
-    model_pricing = pricing[provider][model_name]
+    Pass ``resume_tokens`` from the résumé index when the real résumé is known;
+    otherwise the token count is guessed from ``resume_length``. See
+    ``estimator.estimate_run`` for the duration and the learned ratios.
+    """
+    if resume_tokens is None:
+        resume_tokens = resume_length // 4
+    estimate = estimate_run(
+        provider, model_name, resume_tokens, [""] * num_questions, word_limit
+    )
+    return format_cost(estimate["cost"])
 
-    input_cost = (total_input_tokens / 1000000) * model_pricing["input"]
-    output_cost = (total_output_tokens / 1000000) * model_pricing["output"]
-    total_cost = input_cost + output_cost
 
-    if total_cost < 0.01:
+def format_cost(cost):
+    if cost is None:
+        return "Cost estimation not available"
+    if cost < 0.01:
         return "< $0.01"
-    else:
-        return f"~${total_cost:.3f}"
+    return f"~${cost:.3f}"
 
 
 def test_api_key(provider, api_key, model_name):
-    """Test if an API key is valid by making a small test request."""
+    """Test if an API key can use ``model_name`` by making a small test request.
+
+    This spends a few tokens; providers.validate_keys checks the key alone for free.
+    """
     if not api_key:
         return False, "No API key provided"
 
@@ -335,6 +944,7 @@ def test_api_key(provider, api_key, model_name):
                 model=model_name,
                 temperature=0.1,
                 google_api_key=api_key,
+                max_output_tokens=10,
             )
         elif provider == "OpenAI":
             llm = ChatOpenAI(
@@ -369,12 +979,32 @@ def test_api_key(provider, api_key, model_name):
             return False, f"Connection error: {str(e)[:100]}"
 
 
-def get_company_research(company_name: str, api_keys_dict: dict) -> str:
-    """Gets basic company research information."""
-    # This is a placeholder function for company research
-    # In a real implementation, this would scrape company websites,
-    # news articles, or use APIs to gather company information
-    return f"Research about {company_name}: This is a placeholder for company research functionality."
+def get_company_research(
+    company_name: str, api_keys_dict: dict, website: str = "", on_error=None
+) -> list:
+    """Fetches public pages, feeds and news about a company.
+
+    Returns the research documents (``kind``, ``url``, ``title``, ``text``),
+    shared through the research cache; format_research renders them for
+    display. Returns [] when nothing was found or the research failed;
+    failures are passed to ``on_error(message)`` so they are shown, not sent
+    to the model.
+    """
+    key = normalize_company(company_name)
+    if website:
+        key += "|" + website.lower().split("://")[-1].strip("/")
+    try:
+        research = get_research_cache().get(
+            key,
+            lambda: research_company(
+                company_name, website=website or None, sources=get_source_store()
+            ),
+        )
+    except Exception as e:
+        if on_error is not None:
+            on_error(f"Company research for {company_name} failed: {e}")
+        return []
+    return research["documents"]
 
 
 # Model descriptions for UI
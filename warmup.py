@@ -0,0 +1,201 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from budget import Budget, caps_from_env
+from utils import generate_answers, get_company_research
+
+COMMON_QUESTIONS = (
+    "Tell me about yourself.",
+    "Why do you want to work here?",
+    "Why are you interested in this role?",
+    "What are your greatest strengths?",
+    "What is your greatest weakness?",
+    "Tell me about a challenge you faced and how you overcame it.",
+    "Describe a time you worked on a team to achieve a goal.",
+    "Tell me about a time you showed leadership.",
+    "Describe a conflict at work and how you resolved it.",
+    "Tell me about a mistake you made and what you learned from it.",
+    "What is your proudest professional achievement?",
+    "Where do you see yourself in five years?",
+    "Why should we hire you?",
+    "Why are you leaving your current job?",
+    "Do you have any questions for us?",
+)
+DEFAULT_MAX_COST = 0.05
+DEFAULT_MAX_TOKENS = 40_000
+MAX_WARMUP_JOBS = 8
+
+# One worker, one question at a time: warm-up never competes with a real run
+# for more than a single connection
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-warmup")
+_lock = threading.Lock()
+_jobs = OrderedDict()
+
+
+def _normalize(question):
+    return " ".join(re.findall(r"\w+", question.lower()))
+
+
+_CANONICAL = {_normalize(question): question for question in COMMON_QUESTIONS}
+
+
+def canonical_question(question):
+    """Returns the warmed-up wording of a common question typed with different
+    case or punctuation, so it hits the answer cache; other questions as is."""
+    return _CANONICAL.get(_normalize(question), question)
+
+
+def warmup_caps():
+    """The spend caps for warm-up: the configured caps, with the per-run caps
+    lowered to ``HIREHELPER_WARMUP_MAX_COST`` and ``HIREHELPER_WARMUP_MAX_TOKENS``."""
+    caps = caps_from_env()
+    limits = {
+        "cost": float(os.getenv("HIREHELPER_WARMUP_MAX_COST", DEFAULT_MAX_COST)),
+        "tokens": int(os.getenv("HIREHELPER_WARMUP_MAX_TOKENS", DEFAULT_MAX_TOKENS)),
+    }
+    for kind, limit in limits.items():
+        cap = caps["run"][kind]
+        caps["run"][kind] = limit if cap is None else min(cap, limit)
+    return caps
+
+
+class WarmupJob:
+    """Answers COMMON_QUESTIONS in the background into the answer cache.
+
+    ``done`` counts the common questions whose answers are ready; ``stopped_by``
+    is the skip message when a spend cap ended the warm-up early. ``resume``
+    is "preparing" until the résumé text is known, then "ready", or "missing"
+    when it couldn't be extracted or formatted and nothing is warmed up.
+    """
+
+    def __init__(self, key, prefetch_job, inputs, session=None, spent=None):
+        self.key = key
+        self.cancelled = threading.Event()
+        self.done = 0
+        self.stopped_by = None
+        self.resume = "preparing"
+        self.budget = Budget(
+            inputs["model_provider"],
+            inputs["model_name"],
+            caps=warmup_caps(),
+            session=session,
+        )
+        if spent is not None:
+            # A restarted job doesn't get a fresh allowance
+            self.budget.spent["run"] = spent
+        self.future = _executor.submit(self._run, prefetch_job, inputs)
+
+    def _resume_text(self, prefetch_job, inputs):
+        raw_text = prefetch_job.extracted_text()
+        if not raw_text or not raw_text.strip():
+            return None
+        extension = os.path.splitext(prefetch_job.file_name)[1].lower()
+        if extension not in [".pdf", ".docx"]:
+            return raw_text
+        # Generation formats the résumé first; the prompts only match what is
+        # warmed up if this uses the same formatting, so ask for it even when
+        # formatting on upload is off
+        prefetch_job.request_format(
+            inputs["model_provider"], inputs["model_name"], inputs["api_keys_dict"]
+        )
+        formatted_text = prefetch_job.formatted_text(
+            inputs["model_provider"], inputs["model_name"]
+        )
+        # A failed format falls back to the raw text, which a real run redoes
+        if formatted_text == raw_text:
+            return None
+        return formatted_text
+
+    def _run(self, prefetch_job, inputs):
+        resume_text = self._resume_text(prefetch_job, inputs)
+        if self.cancelled.is_set():
+            return
+        if not resume_text:
+            self.resume = "missing"
+            return
+        self.resume = "ready"
+        research = []
+        if inputs["company"].strip():
+            research = get_company_research(
+                inputs["company"],
+                inputs["api_keys_dict"],
+                website=inputs["company_website"].strip(),
+            )
+        for question in COMMON_QUESTIONS:
+            if self.cancelled.is_set():
+                return
+            answer = generate_answers(
+                resume_text,
+                inputs["role"],
+                inputs["company"],
+                [question],
+                inputs["word_limit"],
+                inputs["model_provider"],
+                inputs["model_name"],
+                inputs["api_keys_dict"],
+                inputs["company_info"],
+                research,
+                max_concurrency=1,
+                budget=self.budget,
+            )[0]
+            if answer.get("skipped"):
+                self.stopped_by = answer["answer"]
+                return
+            # Errors aren't cached; only count answers a real run can reuse
+            if "context_tokens" in answer:
+                self.done += 1
+
+    def cancel(self):
+        self.cancelled.set()
+        self.future.cancel()
+
+
+def warm_up(prefetch_job, session_id, session=None, **inputs):
+    """Starts pre-generating answers to COMMON_QUESTIONS for these inputs.
+
+    ``inputs`` are the arguments a real run passes on: role, company,
+    company_website, company_info, word_limit, model_provider, model_name and
+    api_keys_dict. A job is started once per session, résumé and inputs,
+    including the API keys, and again after it was cancelled; questions
+    already answered come from the cache. ``session`` is that session's spend
+    dict, so warm-up counts towards its per-session caps.
+    """
+    fingerprint = repr(
+        sorted(
+            (k, sorted(v.items()) if k == "api_keys_dict" else v)
+            for k, v in inputs.items()
+        )
+    )
+    key = hashlib.sha256(
+        f"{session_id}\x00{prefetch_job.key}\x00{fingerprint}".encode()
+    ).hexdigest()
+    with _lock:
+        job = _jobs.get(key)
+        if job is None or job.cancelled.is_set():
+            job = WarmupJob(
+                key,
+                prefetch_job,
+                dict(inputs),
+                session=session,
+                spent=job.budget.spent["run"] if job is not None else None,
+            )
+            _jobs[key] = job
+        _jobs.move_to_end(key)
+        while len(_jobs) > MAX_WARMUP_JOBS:
+            _jobs.popitem(last=False)[1].cancel()
+    return job
+
+
+def cancel_warmup(key):
+    """Stops a warm-up job after its current question, e.g. when the inputs
+    change or the user's own run starts."""
+    if not key:
+        return
+    with _lock:
+        job = _jobs.get(key)
+    if job is not None:
+        job.cancel()